@@ -0,0 +1,458 @@
+"""
+Backfill.py
+
+DESC:
+    Runs multi fills for many patients at once. Built for charts kept on network
+    shares, where listing, reading and writing files is slow compared to parsing and
+    rendering. File I/O runs on a bounded thread pool with a concurrency limit per
+    share, parsing and rendering run on a process pool, and asyncio queues between
+    the stages keep both busy without letting either run far ahead.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    Run from the src directory:
+        python Backfill.py JOBS [--cpu-workers N] [--io-workers N]
+                                [--share-limit PREFIX=N ...] [--default-share-limit N]
+                                [--closures FILE] [--no-verify] [--log-json FILE]
+                                [--journal FILE] [--resume] [--seed N]
+                                [--dry-run [table|json]] [--output FILE]
+                                [--clinics FILE] [--clinic NAME]
+    JOBS is a JSON list with one entry per patient chart directory:
+        [{"directory": "//server/charts/John_Doe/", "dates": ["2026-01-09", ...],
+          "final_ratings": {"neck": 2, "lower back": 1}, "seed": 1}, ...]
+    Each job is handled like a MULTI FILL, starting from the latest SD note in its
+    directory. 'seed' is optional. A job can give a visit schedule in place of
+    'dates', i.e. "schedule": "Mon/Wed/Fri from 1/5/2026 to 3/27/2026", closures in
+    --closures are skipped, see Schedule.py.
+
+    Every run is recorded in a journal, JOBS.journal unless --journal is given, see
+    RunJournal.py. Jobs without a 'seed' get one drawn from the run seed (--seed, or
+    a random one), and each job's doc_ids are reserved when its previous note is
+    staged in. If a run dies partway through, run it again with --resume: finished
+    jobs and notes already on the share are skipped, and the rest are rendered from
+    the same previous notes with the same seeds, so the result is the same as an
+    uninterrupted run. Without --resume an existing journal is an error, delete it to
+    start over.
+
+    --dry-run prints the plan of every job instead, the notes it would write with
+    their dates, ratings and pain/health, see FillPlan.py. Previous notes are parsed
+    straight from the shares and nothing is rendered, staged or journaled. Pass the
+    same --seed to the real run to get the same plan. Log records go to stdout too,
+    use --output to save a plan that has to be read by another program.
+
+    Every job goes through 3 stages:
+    - stage in (I/O): find the previous note on the share and copy it to a local
+      staging directory. The signatures of the chart's notes are loaded from the
+      share's index, see main.load_chart_similarity().
+    - render (CPU): parse it and generate every note for the job in the staging
+      directory, each note is generated from the one before it and parsed back
+      before it is kept, --no-verify skips that. New notes are checked for near
+      duplicates against the whole chart on the share.
+    - stage out (I/O): copy the new notes back to the share.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Jobs are independent, two jobs must not point at the same directory.
+    - Shares are matched by path prefix, directories that match no configured prefix
+      all share the default limit.
+
+DEPENDENCIES:
+    - argparse
+    - array
+    - asyncio
+    - concurrent.futures
+    - dataclasses
+    - datetime
+    - json
+    - os
+    - random
+    - shutil
+    - tempfile
+    - Complaints
+    - FillPlan
+    - Logger
+    - NoteIndex
+    - NoteSimilarity
+    - ClinicProfile
+    - main
+    - RunJournal
+    - Schedule
+"""
+
+import argparse, asyncio, json, os, random, shutil, tempfile, time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date
+
+import main
+import Logger
+from ClinicProfile import ClinicProfile
+from Complaints import intern_complaint
+from FillPlan import FillPlan, PLAN_FORMATS, format_plans
+from NoteIndex import NoteIndex
+from NoteSimilarity import SimilarityIndex
+from Logger import log, job_context, count
+from RunJournal import RunJournal, DONE, get_doc_id
+from Schedule import ScheduleRule, Scheduler, load_closures
+
+DEFAULT_IO_WORKERS = 8
+DEFAULT_SHARE_LIMIT = 4 # max concurrent file operations against one share
+
+@dataclass(frozen=True, slots=True)
+class BackfillJob:
+    directory: str
+    dates: tuple[date, ...]
+    final_ratings: tuple[tuple[str, int], ...] # (complaint name, final rating)
+    seed: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BackfillResult:
+    directory: str
+    written: tuple[str, ...]
+    error: str | None = None
+
+
+def render_job(staging_dir: str, dates: tuple[date, ...], final_ratings: tuple[tuple[str, int], ...], seed: int | None,
+               verify: bool = True, similarity: SimilarityIndex | None = None) -> list[str]:
+    # CPU stage, runs in a worker process against the local staging copy
+    # similarity is the chart on the share, see load_share_similarity(), the staging copy only has the previous note
+    final = seed_job(staging_dir, final_ratings, seed)
+    return main.run_multi_fill(list(dates), final, staging_dir, verify=verify, similarity=similarity)
+
+
+def count_job(func, *args) -> tuple:
+    # runs func in a worker process, returns its result with the counters it bumped there
+    # counters are per process, the parent adds them to its own with Logger.merge_counters()
+    before = Logger.get_counters()
+    result = func(*args)
+    return result, {name: value - before.get(name, 0) for name, value in Logger.get_counters().items()}
+
+
+def plan_job(directory: str, dates: tuple[date, ...], final_ratings: tuple[tuple[str, int], ...], seed: int | None) -> FillPlan:
+    # --dry-run, same random state as render_job() so the plan matches what it would write
+    try:
+        final = seed_job(directory, final_ratings, seed)
+        return main.plan_multi_fill(list(dates), final, directory)
+    except Exception as e:
+        return FillPlan(directory, None, error=str(e))
+
+
+def seed_job(directory: str, final_ratings: tuple[tuple[str, int], ...], seed: int | None) -> array:
+    # parses the previous note in directory and returns the final ratings aligned with it
+    # forked workers start with the same random state, reseed so jobs don't share sentences
+    random.seed(seed)
+    main.clear_globals()
+    main.retrieve_info_from_SD(main.find_previous_note(directory), directory)
+    if not main.patient:
+        raise ValueError("Patient is None")
+
+    targets = {intern_complaint(name): rating for name, rating in final_ratings}
+    return main.build_final_ratings(main.patient.ratings, targets)
+
+
+def copy_in(directory: str, staging_dir: str, filename: str | None = None) -> str:
+    # I/O stage, copies the previous note of directory into staging_dir and returns its filename
+    # - filename is the previous note a resumed job was reserved against, the latest note otherwise
+    if filename is None:
+        with os.scandir(directory) as entries:
+            filenames = [entry.name for entry in entries if entry.is_file()]
+
+        filename = main.get_previous_note(filenames)
+        if not filename:
+            raise ValueError("SOAP document does not exist in directory. Must be '.rtf' and have 'SD' in filename")
+    shutil.copyfile(os.path.join(directory, filename), os.path.join(staging_dir, filename))
+    return filename
+
+
+def load_share_similarity(directory: str, previous_note: str) -> SimilarityIndex:
+    # I/O stage, signatures of the chart's notes on the share, cached in the share's index
+    # notes after previous_note are left out, on a resume they are this job's own and are rendered again
+    index = NoteIndex(os.path.join(directory, main.INDEX_FILENAME))
+    try:
+        similarity = main.load_chart_similarity(directory, index)
+    finally:
+        index.close()
+
+    previous = get_doc_id(previous_note)
+    for filename in os.listdir(directory):
+        if not filename.endswith('.rtf') or 'SD' not in filename:
+            continue
+        try:
+            newer = get_doc_id(filename) > previous
+        except ValueError: # not numbered, can't be one of this job's notes
+            continue
+        if newer:
+            similarity.remove(os.path.join(directory, filename))
+    return similarity
+
+
+def copy_out(staging_dir: str, directory: str, filename: str) -> None:
+    # write under a temp name first so a failed copy never leaves half a note on the share
+    target = os.path.join(directory, filename)
+    partial = f"{target}.part"
+    shutil.copyfile(os.path.join(staging_dir, filename), partial)
+    os.replace(partial, target)
+
+
+class Backfill:
+    def __init__(self, cpu_workers: int | None = None, io_workers: int = DEFAULT_IO_WORKERS,
+                 share_limits: dict[str, int] | None = None, default_share_limit: int = DEFAULT_SHARE_LIMIT,
+                 verify: bool = True, clinic: ClinicProfile | None = None, clinics: dict[str, ClinicProfile] | None = None):
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.share_limits = share_limits or {}
+        self.default_share_limit = default_share_limit
+        self.verify = verify
+        # workers are handed the profiles when they start, spawned processes don't see main's globals
+        self.clinic = clinic or main.clinic
+        self.clinics = clinics or main.clinics
+
+    def get_share(self, directory: str) -> str:
+        # longest configured prefix, '' for the default share
+        matches = [prefix for prefix in self.share_limits if directory.startswith(prefix)]
+        return max(matches, key=len) if matches else ""
+
+    async def run(self, jobs: list[BackfillJob], journal: RunJournal | None = None) -> list[BackfillResult]:
+        # returns one result per job, in the same order, a failed job does not stop the others
+        # - with a journal, jobs are indexed as planned in it and progress is recorded as it happens
+        self._loop = asyncio.get_running_loop()
+        self._journal = journal
+        self._results: list[BackfillResult | None] = [None] * len(jobs)
+        self._limits = {prefix: asyncio.Semaphore(limit) for prefix, limit in self.share_limits.items()}
+        self._limits[""] = asyncio.Semaphore(self.default_share_limit)
+
+        pending = asyncio.Queue()
+        for item in enumerate(jobs):
+            pending.put_nowait(item)
+
+        # bounded, stage in waits once every CPU worker has a job queued up
+        staged = asyncio.Queue(maxsize=self.cpu_workers)
+        rendered = asyncio.Queue(maxsize=self.cpu_workers)
+
+        with ThreadPoolExecutor(max_workers=self.io_workers) as io_pool, \
+             self._get_cpu_pool() as cpu_pool, \
+             tempfile.TemporaryDirectory() as staging_root:
+            self._io_pool = io_pool
+            self._cpu_pool = cpu_pool
+            self._staging_root = staging_root
+
+            stage_in = [asyncio.create_task(self._stage_in_worker(pending, staged)) for _ in range(self.io_workers)]
+            render = [asyncio.create_task(self._render_worker(staged, rendered)) for _ in range(self.cpu_workers)]
+            stage_out = [asyncio.create_task(self._stage_out_worker(rendered)) for _ in range(self.io_workers)]
+
+            await asyncio.gather(*stage_in)
+            for _ in render:
+                await staged.put(None)
+            await asyncio.gather(*render)
+            for _ in stage_out:
+                await rendered.put(None)
+            await asyncio.gather(*stage_out)
+
+        return self._results
+
+    def plan(self, jobs: list[BackfillJob]) -> list[FillPlan]:
+        # --dry-run, one plan per job in the same order, nothing is written
+        with self._get_cpu_pool() as cpu_pool:
+            return list(cpu_pool.map(plan_job, *zip(*((job.directory, job.dates, job.final_ratings, job.seed) for job in jobs))))
+
+    def _get_cpu_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.cpu_workers, initializer=main.set_clinic, initargs=(self.clinic, self.clinics))
+
+    async def _run_io(self, directory: str, func, *args):
+        async with self._limits[self.get_share(directory)]:
+            return await self._loop.run_in_executor(self._io_pool, func, *args)
+
+    def _fail(self, idx: int, job: BackfillJob, e: Exception) -> None:
+        count("failures")
+        log.error("%s: %s", job.directory, e, extra={"fields": {"directory": job.directory}})
+        self._results[idx] = BackfillResult(job.directory, (), str(e))
+        if self._journal:
+            self._journal.fail(idx, str(e))
+
+    async def _stage_in_worker(self, pending: asyncio.Queue, staged: asyncio.Queue) -> None:
+        while not pending.empty():
+            idx, job = pending.get_nowait()
+            if self._journal and self._journal.get_status(idx) == DONE:
+                self._results[idx] = BackfillResult(job.directory, tuple(self._journal.get_written(idx)))
+                continue
+
+            # a resumed job starts from the note it was reserved against, not from its own notes already on the share
+            reservation = self._journal.get_reservation(idx) if self._journal else None
+            staging_dir = os.path.join(self._staging_root, str(idx))
+            # any error fails only this job, a worker that dies would leave the queues waiting on it
+            try:
+                os.mkdir(staging_dir)
+                filename = await self._run_io(job.directory, copy_in, job.directory, staging_dir,
+                                              reservation[0] if reservation else None)
+                if self._journal and not reservation:
+                    self._journal.reserve(idx, filename, get_doc_id(filename) + 1)
+                similarity = await self._run_io(job.directory, load_share_similarity, job.directory, filename)
+            except Exception as e:
+                self._fail(idx, job, e)
+                continue
+            await staged.put((idx, job, staging_dir, similarity))
+
+    async def _render_worker(self, staged: asyncio.Queue, rendered: asyncio.Queue) -> None:
+        while (item := await staged.get()) is not None:
+            idx, job, staging_dir, similarity = item
+            with job_context(patient=os.path.basename(os.path.normpath(job.directory))):
+                try:
+                    written, counters = await self._loop.run_in_executor(
+                        self._cpu_pool, count_job, render_job, staging_dir, job.dates, job.final_ratings, job.seed, self.verify, similarity)
+                except Exception as e:
+                    self._fail(idx, job, e)
+                    continue
+            del counters["notes_written"] # only staged, stage out counts the notes that reach the share
+            Logger.merge_counters(counters)
+            await rendered.put((idx, job, staging_dir, written))
+
+    async def _stage_out_worker(self, rendered: asyncio.Queue) -> None:
+        while (item := await rendered.get()) is not None:
+            idx, job, staging_dir, written = item
+            try:
+                already_written = set(self._journal.get_written(idx)) if self._journal else set()
+                # notes of one job go out in order, the share never has a gap in the numbering
+                for filename in written:
+                    if filename in already_written:
+                        continue
+                    await self._run_io(job.directory, copy_out, staging_dir, job.directory, filename)
+                    count("notes_written")
+                    if self._journal:
+                        self._journal.mark_written(idx, filename)
+            except Exception as e:
+                self._fail(idx, job, e)
+                continue
+            if self._journal:
+                self._journal.finish(idx)
+            log.info("%s: wrote %d note(s)", job.directory, len(written), extra={"fields": {"directory": job.directory, "written": written}})
+            self._results[idx] = BackfillResult(job.directory, tuple(written))
+
+
+def load_jobs(path: str, scheduler: Scheduler | None = None) -> list[BackfillJob]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_jobs(json.load(f), scheduler)
+
+
+def parse_jobs(entries: list[dict], scheduler: Scheduler | None = None) -> list[BackfillJob]:
+    # every schedule in the batch is expanded in one go
+    scheduler = scheduler or Scheduler()
+    rules = [ScheduleRule.parse(entry["schedule"]) for entry in entries if "dates" not in entry]
+    schedules = iter(scheduler.expand_many(rules))
+
+    jobs = []
+    for entry in entries:
+        if "dates" in entry:
+            dates = tuple(date.fromisoformat(day) for day in entry["dates"])
+        else:
+            dates = tuple(date.fromordinal(visit.get_ordinal()) for visit in next(schedules))
+        jobs.append(BackfillJob(
+            directory=entry["directory"],
+            dates=dates,
+            final_ratings=tuple((name, int(rating)) for name, rating in entry["final_ratings"].items()),
+            seed=entry.get("seed"),
+        ))
+    return jobs
+
+
+def get_entry(job: BackfillJob) -> dict:
+    # inverse of parse_jobs(), schedules come back as their dates
+    return {
+        "directory": job.directory,
+        "dates": [day.isoformat() for day in job.dates],
+        "final_ratings": dict(job.final_ratings),
+        "seed": job.seed,
+    }
+
+
+def assign_seeds(jobs: list[BackfillJob], seed: int) -> list[BackfillJob]:
+    # jobs without a seed get one from the run seed, so every job renders the same way on a resume
+    rng = random.Random(seed)
+    return [job if job.seed is not None else replace(job, seed=rng.randrange(2**32)) for job in jobs]
+
+
+def parse_share_limit(value: str) -> tuple[str, int]:
+    prefix, sep, limit = value.rpartition("=")
+    if not sep or not prefix or not limit.isdigit() or int(limit) < 1:
+        raise argparse.ArgumentTypeError(f"expected PREFIX=N, got '{value}'")
+    return prefix, int(limit)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Run AutoSOAP multi fills for many patients at once.")
+    parser.add_argument("jobs", help="JSON file with one job per patient chart directory")
+    parser.add_argument("--cpu-workers", type=int, help="parse/render processes, defaults to the no. CPUs")
+    parser.add_argument("--io-workers", type=int, default=DEFAULT_IO_WORKERS, help="threads for file I/O")
+    parser.add_argument("--share-limit", type=parse_share_limit, action="append", default=[], metavar="PREFIX=N",
+                        help="max concurrent file operations for directories starting with PREFIX, can be repeated")
+    parser.add_argument("--default-share-limit", type=int, default=DEFAULT_SHARE_LIMIT,
+                        help="max concurrent file operations for every other directory")
+    parser.add_argument("--closures", metavar="FILE", help="clinic closures to skip in job schedules")
+    parser.add_argument("--no-verify", action="store_true", help="skip parsing each note back before it is kept")
+    parser.add_argument("--log-json", metavar="FILE", help="also write every log record as a JSON line to FILE")
+    parser.add_argument("--journal", metavar="FILE", help="run journal, defaults to JOBS.journal")
+    parser.add_argument("--resume", action="store_true", help="finish the run recorded in the journal")
+    parser.add_argument("--seed", type=int, help="run seed for jobs without a 'seed', random by default")
+    parser.add_argument("--dry-run", nargs="?", const="table", choices=PLAN_FORMATS, metavar="FORMAT",
+                        help=f"only print the notes every job would write, as {' or '.join(PLAN_FORMATS)} (default table)")
+    parser.add_argument("--output", metavar="FILE", help="with --dry-run, write the plan to FILE instead of printing it")
+    parser.add_argument("--clinics", metavar="FILE", help="clinic profiles, see ClinicProfile.py")
+    parser.add_argument("--clinic", metavar="NAME", help="profile new notes are written with, defaults to the config's default")
+    args = parser.parse_args()
+
+    Logger.setup(args.log_json)
+    try:
+        main.load_clinic(args.clinics, args.clinic)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    backfill = Backfill(args.cpu_workers, args.io_workers, dict(args.share_limit), args.default_share_limit,
+                        not args.no_verify)
+    if args.dry_run:
+        if args.resume:
+            parser.error("--dry-run can not be combined with --resume")
+        seed = args.seed if args.seed is not None else random.randrange(2**32)
+        jobs = assign_seeds(load_jobs(args.jobs, Scheduler(load_closures(args.closures) if args.closures else frozenset())), seed)
+        started = time.perf_counter()
+        plans = backfill.plan(jobs)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(format_plans(plans, args.dry_run))
+                f.write("\n")
+        else:
+            print(format_plans(plans, args.dry_run))
+        log.info("Planned %d note(s) for %d job(s) in %.2fs, run seed %d.",
+                 sum(len(plan.notes) for plan in plans), len(plans), time.perf_counter() - started, seed)
+        return
+
+    journal = RunJournal(args.journal or f"{args.jobs}.journal")
+    if args.resume:
+        if not journal.is_planned():
+            parser.error(f"{journal.path} does not hold a run to resume")
+        # the journal has the planned jobs, JOBS and --closures are not read again
+        jobs = parse_jobs(journal.get_entries())
+        log.info("Resuming %s: %s", journal.path, ", ".join(f"{n} {status}" for status, n in sorted(journal.get_counts().items())))
+    else:
+        if journal.is_planned():
+            parser.error(f"{journal.path} already holds a run, pass --resume to finish it or delete it to start over")
+        seed = args.seed if args.seed is not None else random.randrange(2**32)
+        jobs = assign_seeds(load_jobs(args.jobs, Scheduler(load_closures(args.closures) if args.closures else frozenset())), seed)
+        journal.plan(seed, [get_entry(job) for job in jobs])
+
+    started = time.perf_counter()
+    with job_context():
+        results = asyncio.run(backfill.run(jobs, journal))
+        failed = sum(result.error is not None for result in results)
+        log.info("Back-filled %d of %d job(s), %d failed.", len(results) - failed, len(results), failed)
+        Logger.log_counters(started)
+    journal.close()
+
+
+if __name__ == "__main__":
+    main_cli()
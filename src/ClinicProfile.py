@@ -0,0 +1,114 @@
+"""
+ClinicProfile.py
+
+DESC:
+    Clinic and provider profiles: the practice name, address, phone and doctor
+    printed at the top of every note, loaded from a config file so several
+    locations and doctors can share one install. Each profile's header blocks and
+    the parser that finds the patient header under its doctor line are built once
+    and cached, so the no. profiles adds nothing per note.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - load_clinics(path) reads a JSON config and returns the profiles by key with
+      the key of the default one:
+        {"default": "lynnwood",
+         "clinics": {"lynnwood": {"name": "Back to Wellness", "street": "4629 168th St SW Ste B",
+                                  "address": "Lynnwood, WA 98037", "phone": "425-741-0600",
+                                  "doctor": "Sungjun Jung"}, ...}}
+      'default' is optional, the first clinic is used without it.
+    - get_header_blocks(profile) returns the profile's header as NoteDocument
+      blocks, get_patient_pattern(profile) the compiled regex for the patient
+      name, street, address and birthday that follow its doctor line.
+    - DEFAULT_CLINIC is used when there is no config.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - A note is matched to a profile by its doctor line only.
+
+DEPENDENCIES:
+    - dataclasses
+    - functools
+    - json
+    - re
+    - NoteDocument
+"""
+
+import json, re
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+from NoteDocument import Role
+
+@dataclass(frozen=True, slots=True)
+class ClinicProfile:
+    key: str
+    name: str
+    street: str
+    address: str
+    phone: str
+    doctor: str
+
+    def get_doctor_line(self) -> str:
+        return f"Doctor: {self.doctor}"
+
+
+DEFAULT_CLINIC = ClinicProfile(
+    key="default",
+    name="Back to Wellness",
+    street="4629 168th St SW Ste B",
+    address="Lynnwood, WA 98037",
+    phone="425-741-0600",
+    doctor="Sungjun Jung",
+)
+
+PROFILE_FIELDS = [field.name for field in fields(ClinicProfile) if field.name != "key"]
+
+def load_clinics(path: str) -> tuple[dict[str, ClinicProfile], str]:
+    # returns (key -> profile, key of the default profile)
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}")
+
+    clinics = {}
+    for key, entry in config.get("clinics", {}).items():
+        missing = [name for name in PROFILE_FIELDS if not entry.get(name)]
+        if missing:
+            raise ValueError(f"{path}: clinic '{key}' is missing {', '.join(missing)}")
+        clinics[key] = ClinicProfile(key, *(str(entry[name]).strip() for name in PROFILE_FIELDS))
+    if not clinics:
+        raise ValueError(f"{path}: no clinics found")
+
+    default = config.get("default", next(iter(clinics)))
+    if default not in clinics:
+        raise ValueError(f"{path}: default clinic '{default}' is not one of {', '.join(clinics)}")
+    return clinics, default
+
+
+@lru_cache(maxsize=None)
+def get_header_blocks(profile: ClinicProfile) -> tuple[tuple[Role, str], ...]:
+    # the same for every note of a clinic, built once
+    lines = (profile.name, profile.street, profile.address, profile.phone, profile.get_doctor_line())
+    return tuple((Role.CLINIC, line) for line in lines)
+
+
+@lru_cache(maxsize=None)
+def get_patient_pattern(profile: ClinicProfile) -> re.Pattern:
+    # runs against the note's plain text with whitespace collapsed, the patient header follows the doctor line
+    doctor = r"\s*".join(re.escape(word) for word in profile.get_doctor_line().split())
+    return re.compile(
+        rf"{doctor}\s+"                                        # anchor
+        r"(?P<name>.*?)\s+"                                    # match name until we see numbers
+        r"(?P<street>\d+[\s\w]+?)\s+"                          # ignore
+        r"(?P<address>.+?)\s+"                                 # ignore
+        r"Date\s+of\s+Birth:\s+(?P<dob>\d{1,2}/\d{1,2}/\d{4})", # match strictly the date format
+        re.IGNORECASE
+    )
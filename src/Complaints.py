@@ -0,0 +1,82 @@
+"""
+Complaints.py
+
+DESC:
+    A process-wide registry of complaint names. Each complaint is normalised and
+    interned once at parse time and given a small integer ID, so the rest of the
+    pipeline (ratings, trajectories, assessment bucketing) can work on int arrays
+    instead of comparing strings.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Use intern_complaint() to get the ID for a name (registering it if new) and
+      get_complaint_name() to go from an ID back to the canonical name.
+    - The overall pain and health ratings are always registered first, use
+      PAIN_ID, HEALTH_ID and is_overall_rating() instead of string checks.
+
+PLANNED:
+    - Add synonyms so different wordings of the same complaint share an ID
+      (i.e. 'low back' and 'lower back').
+
+LIMITATIONS:
+    IDs are only stable within a single process, never persist them. Store the
+    canonical name instead.
+
+DEPENDENCIES:
+    - None
+"""
+
+PAIN = "pain"
+HEALTH = "health"
+
+_complaint_names: list[str] = []
+_complaint_ids: dict[str, int] = {}
+
+def normalize_complaint(name: str) -> str:
+    # 'Upper  Back,' -> 'upper back'
+    name = " ".join(name.split()).strip(" ,.;:")
+    return name.lower()
+
+
+def intern_complaint(name: str) -> int:
+    # fast path, most lookups are names that are already canonical
+    complaint_id = _complaint_ids.get(name)
+    if complaint_id is not None:
+        return complaint_id
+
+    canonical = normalize_complaint(name)
+    complaint_id = _complaint_ids.get(canonical)
+    if complaint_id is None:
+        complaint_id = len(_complaint_names)
+        _complaint_names.append(canonical)
+        _complaint_ids[canonical] = complaint_id
+
+    # remember the raw spelling too so it skips normalising next time
+    _complaint_ids[name] = complaint_id
+    return complaint_id
+
+
+def get_complaint_name(complaint_id: int) -> str:
+    return _complaint_names[complaint_id]
+
+
+def get_complaint_names(complaint_ids) -> list[str]:
+    return [_complaint_names[complaint_id] for complaint_id in complaint_ids]
+
+
+def is_overall_rating(complaint_id: int) -> bool:
+    # overall pain and health are stored alongside complaints but are not complaints
+    return complaint_id == PAIN_ID or complaint_id == HEALTH_ID
+
+
+def get_complaint_count() -> int:
+    return len(_complaint_names)
+
+
+# reserved, always the first two IDs
+PAIN_ID = intern_complaint(PAIN)
+HEALTH_ID = intern_complaint(HEALTH)
@@ -2,11 +2,12 @@
 Date.py
 
 DESC:
-    A simple class to store month, day, and year values as ints.
+    A simple class to store a date as a single ordinal int, month, day, and year
+    values are derived from it.
 
 Author: David J. Kim,
 Created: 01-16-2026,
-Modified: 01-16-2026,
+Modified: 10-19-2026,
 Version: 1.0.0
 
 USAGE:
@@ -14,16 +15,17 @@ USAGE:
     using getter and setter methods.
     
 PLANNED:
-    - Add module to verify dates more thoroughly. Only checks if month, day, and year
-    values are within bounds instead of checking whether they exist or not.
+    - ...
     
 LIMITATIONS:
-    Date verification is extremely simple. Some bad dates can still pass through.
+    A bad date is stored as UNSET, every getter then returns UNSET.
 
 DEPENDENCIES:
+    - datetime
     - enum
 """
 
+from datetime import date
 from enum import Enum
 
 UNSET = -1 # default int value for unset variables
@@ -61,16 +63,35 @@ months = {
 }
 
 class Date:
+    # stored as a single proleptic Gregorian ordinal (1 -> January 1, year 1),
+    # month, day and year are derived from it when asked for
+    __slots__ = ("_ordinal",)
+    
     def __init__(self, month: int, day: int, year: int):
         if (self._is_bad_date(month, day, year)):
             # set variables to default
-            self.month = UNSET
-            self.day = UNSET
-            self.year = UNSET
-            return        
-        self.month = month
-        self.day = day
-        self.year = year        
+            self._ordinal = UNSET
+            return
+        self._ordinal = date(year, month, day).toordinal()
+        
+    @classmethod
+    def from_ordinal(cls, ordinal: int) -> "Date":
+        new_date = cls.__new__(cls)
+        new_date._ordinal = ordinal
+        return new_date
+    
+    # read-only views, use the setters to change the date
+    @property
+    def month(self) -> int:
+        return self._to_date().month if self._ordinal != UNSET else UNSET
+    
+    @property
+    def day(self) -> int:
+        return self._to_date().day if self._ordinal != UNSET else UNSET
+    
+    @property
+    def year(self) -> int:
+        return self._to_date().year if self._ordinal != UNSET else UNSET
         
     def get_date_standard(self) -> str:
         return f"{self.month}/{self.day}/{self.year}"
@@ -87,37 +108,41 @@ class Date:
     def get_year(self) -> int:
         return self.year
     
+    def get_ordinal(self) -> int:
+        return self._ordinal
+    
     def set_month(self, month: int) -> bool:
-        # check validity
-        if (self._is_bad_date(month, self.day, self.year)):
-            return False # fail state
-        self.month = month
-        return True
+        return self.set_date(month, self.day, self.year)
 
     def set_day(self, day: int) -> bool:
-        if (self._is_bad_date(self.month, day, self.year)):
-            return False
-        self.day = day
-        return True
+        return self.set_date(self.month, day, self.year)
         
     def set_year(self, year: int) -> bool:
-        if (self._is_bad_date(self.month, self.day, year)):
-            return False
-        self.year = year
-        return True
+        return self.set_date(self.month, self.day, year)
     
     def set_date(self, month, day, year) -> bool:
+        # check validity
         if (self._is_bad_date(month, day, year)):
-            return False
-        self.month = month
-        self.day = day
-        self.year = year
+            return False # fail state
+        self._ordinal = date(year, month, day).toordinal()
         return True       
 
+    def _to_date(self) -> date:
+        return date.fromordinal(self._ordinal)
+
     # returns true if incorrect, false otherwise
     # private method, no public use
     def _is_bad_date(self, month: int, day: int, year: int) -> bool:
-        return (month < _Month.JANUARY.value or
+        if (month < _Month.JANUARY.value or
                 month > _Month.DECEMBER.value or
                 day < 0 or day > 31 or year < 0 or
-                (day > 29 and month is _Month.FEBRUARY.value))
+                (day > 29 and month is _Month.FEBRUARY.value)):
+            return True
+        
+        # anything that passes the bounds check but can't be stored as an ordinal
+        # (day 0, year 0, April 31, etc.) is also a bad date
+        try:
+            date(year, month, day)
+        except ValueError:
+            return True
+        return False
@@ -0,0 +1,89 @@
+"""
+FillPlan.py
+
+DESC:
+    The plan of a multi fill, every note it would write with its filename, visit
+    date, per-complaint ratings and overall pain and health, and the table and JSON
+    output used to preview it. A plan comes from parsing and trajectory generation
+    only, nothing is rendered or written.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - main.plan_multi_fill() returns the FillPlan of one chart directory, see
+      Backfill.py --dry-run for a whole batch.
+    - format_plans(plans, fmt) returns the plans as a table or JSON, fmt is one of
+      PLAN_FORMATS. A plan that could not be made has error set and no notes.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Ratings are previewed exactly, the sentences of each note are only chosen
+      when it is rendered.
+
+DEPENDENCIES:
+    - dataclasses
+    - json
+"""
+
+import json
+from dataclasses import dataclass, asdict
+
+PLAN_FORMATS = ["table", "json"]
+
+@dataclass(frozen=True, slots=True)
+class PlannedNote:
+    filename: str
+    date: str # YYYY-MM-DD
+    ratings: dict[str, int] # complaint name -> rating, pain and health left out
+    pain: int
+    health: int
+
+
+@dataclass(frozen=True, slots=True)
+class FillPlan:
+    directory: str
+    previous_note: str | None
+    notes: tuple[PlannedNote, ...] = ()
+    error: str | None = None
+
+
+def format_table(plans: list[FillPlan]) -> str:
+    # one block per chart directory, one row per note
+    lines = []
+    for plan in plans:
+        if lines:
+            lines.append("")
+        if plan.error:
+            lines.append(f"{plan.directory}: {plan.error}")
+            continue
+        lines.append(f"{plan.directory} (from {plan.previous_note}, {len(plan.notes)} note(s))")
+        if not plan.notes:
+            continue
+
+        complaints = list(plan.notes[0].ratings)
+        header = ["file", "date", *complaints, "pain", "health"]
+        rows = [[note.filename, note.date, *(str(note.ratings[name]) for name in complaints), str(note.pain), str(note.health)]
+                for note in plan.notes]
+        widths = [max(len(row[idx]) for row in (header, *rows)) for idx in range(len(header))]
+        for row in (header, *rows):
+            # names and dates line up left, ratings right
+            cells = [cell.ljust(width) if idx < 2 else cell.rjust(width) for idx, (cell, width) in enumerate(zip(row, widths))]
+            lines.append("  " + "  ".join(cells).rstrip())
+    return "\n".join(lines)
+
+
+def format_json(plans: list[FillPlan]) -> str:
+    return json.dumps([asdict(plan) for plan in plans], indent=2)
+
+
+def format_plans(plans: list[FillPlan], fmt: str = "table") -> str:
+    if fmt == "table":
+        return format_table(plans)
+    if fmt == "json":
+        return format_json(plans)
+    raise ValueError(f"'{fmt}' is not a valid plan format, expected one of {', '.join(PLAN_FORMATS)}")
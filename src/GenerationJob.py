@@ -0,0 +1,168 @@
+"""
+GenerationJob.py
+
+DESC:
+    Runs a multi fill (parse, plan, render and write) on a worker thread so the
+    caller stays responsive, i.e. a Tk window keeps redrawing while notes are
+    written. Progress is published as events on a thread-safe queue and the job can
+    be cancelled between notes.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - job = GenerationJob(main.run_multi_fill, dates, final_ratings), then start().
+      Extra args are passed through, the job adds progress and cancel.
+    - From Tk, call job.poll_with(root, on_event), it drains the queue every
+      POLL_INTERVAL_MS with after() and calls on_event on the Tk thread. From a
+      console, job.wait(on_event) blocks until the job ends.
+    - Every event has the notes done out of the total, the last file written and an
+      ETA. The last event has state DONE, CANCELLED or FAILED.
+    - cancel() stops the job before the next note, the note being written is
+      finished first.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - main keeps the patient being filled in module globals, run one job at a time
+      per process.
+    - Rendering holds the GIL, a Tk window stays responsive but other Python work
+      slows down while a job runs.
+
+DEPENDENCIES:
+    - contextvars
+    - dataclasses
+    - enum
+    - queue
+    - threading
+    - time
+    - Logger
+"""
+
+import contextvars, queue, threading, time
+from dataclasses import dataclass
+from enum import Enum
+
+from Logger import log
+
+POLL_INTERVAL_MS = 100
+
+class JobState(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+FINAL_STATES = (JobState.DONE, JobState.CANCELLED, JobState.FAILED)
+
+@dataclass(frozen=True, slots=True)
+class ProgressEvent:
+    state: JobState
+    done: int
+    total: int
+    current_file: str | None = None # last note written
+    eta: float | None = None # seconds left, None until the first note is written
+    written: tuple[str, ...] = ()
+    error: str | None = None
+
+    def is_final(self) -> bool:
+        return self.state in FINAL_STATES
+
+
+class GenerationJob:
+    def __init__(self, run, *args, **kwargs):
+        # run is called as run(*args, **kwargs, progress=..., cancel=...) and returns the filenames written
+        self._run = run
+        self._args = args
+        self._kwargs = kwargs
+        self._events: queue.Queue[ProgressEvent] = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+        self._written: list[str] = []
+        self._total = 0
+        self.state = JobState.PENDING
+        self.last_event: ProgressEvent | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise ValueError("GenerationJob has already been started")
+        self.state = JobState.RUNNING
+        self._started = time.perf_counter()
+        # copy the context so records from the worker keep the caller's job ID
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._work,), name="GenerationJob", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def is_finished(self) -> bool:
+        return self.last_event is not None and self.last_event.is_final()
+
+    def get_events(self) -> list[ProgressEvent]:
+        # every event published since the last call, never blocks
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+        if events:
+            self.last_event = events[-1]
+        return events
+
+    def wait(self, on_event=None) -> ProgressEvent:
+        # blocks until the job ends and returns the last event, the short timeout keeps Ctrl+C working
+        while not self.is_finished():
+            try:
+                event = self._events.get(timeout=POLL_INTERVAL_MS / 1000)
+            except queue.Empty:
+                continue
+            self.last_event = event
+            if on_event:
+                on_event(event)
+        return self.last_event
+
+    def poll_with(self, widget, on_event, interval_ms: int = POLL_INTERVAL_MS) -> None:
+        # Tk side, widget is any Tk widget, on_event always runs on the Tk thread
+        def poll():
+            for event in self.get_events():
+                on_event(event)
+            if not self.is_finished():
+                widget.after(interval_ms, poll)
+        widget.after(interval_ms, poll)
+
+    def _work(self) -> None:
+        try:
+            written = self._run(*self._args, **self._kwargs, progress=self._on_progress, cancel=self._cancel)
+        except Exception as e:
+            if not isinstance(e, (ValueError, OSError)):
+                log.exception("Generation job failed")
+            self._publish(JobState.FAILED, error=str(e))
+            return
+        self._written = list(written)
+        cancelled = self._cancel.is_set() and len(self._written) < self._total
+        self._publish(JobState.CANCELLED if cancelled else JobState.DONE)
+
+    def _on_progress(self, done: int, total: int, filename: str | None) -> None:
+        # filename is None before the first note and after a step that wrote none
+        if filename:
+            self._written.append(filename)
+        elif not self._total:
+            self._started = time.perf_counter() # parsing and planning are done, time the notes only
+        self._total = total
+        self._publish(JobState.RUNNING, filename)
+
+    def _publish(self, state: JobState, current_file: str | None = None, error: str | None = None) -> None:
+        self.state = state
+        done = len(self._written)
+        eta = 0.0 if state in FINAL_STATES else None
+        if state is JobState.RUNNING and done:
+            eta = (time.perf_counter() - self._started) / done * (self._total - done)
+        self._events.put(ProgressEvent(state, done, self._total, current_file, eta, tuple(self._written), error))
@@ -0,0 +1,168 @@
+"""
+KeywordMatcher.py
+
+DESC:
+    A multi-keyword matcher (Aho-Corasick automaton) used to find every anchor
+    phrase in a document with a single linear pass, no matter how many phrases
+    are being searched for.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Instantiate with a list of phrases, then call find_matches() to get the
+      (start, end, phrase_index) of every whole-word hit or find_sentence_spans()
+      to get the (start, end) offsets of every sentence containing a hit.
+    - Offsets index into the original string, slice it only when the text is
+      actually needed.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Case-insensitive matching lowers one character at a time, characters whose
+      lowercase form is more than one character long will never match.
+    - A sentence is anything between two periods, same as the regex it replaces.
+      The last sentence is ignored if it is not closed by a period.
+
+DEPENDENCIES:
+    - collections
+"""
+
+from collections import deque
+
+class KeywordMatcher:
+    def __init__(self, phrases: list[str], ignore_case: bool = True):
+        if not phrases:
+            raise ValueError("KeywordMatcher needs at least one phrase")
+
+        self.phrases = list(phrases)
+        self.ignore_case = ignore_case
+
+        # trie stored as parallel lists, idx 0 is the root
+        # - goto: char -> next state
+        # - fail: longest proper suffix that is also a state
+        # - output: indices of phrases ending at this state
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+
+        for phrase_idx, phrase in enumerate(self.phrases):
+            if ignore_case:
+                phrase = phrase.lower()
+            state = 0
+            for ch in phrase:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(phrase_idx)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        # breadth first so a state's failure link is always resolved before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                child_fail = self._goto[fallback].get(ch, 0)
+                self._fail[child] = child_fail if child_fail != child else 0
+
+                # inherit matches from the suffix state
+                self._output[child].extend(self._output[self._fail[child]])
+
+    def find_matches(self, content: str) -> list[tuple[int, int, int]]:
+        # returns (start, end, phrase_index) for every whole-word hit
+        matches = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        phrases = self.phrases
+        ignore_case = self.ignore_case
+
+        state = 0
+        for i, ch in enumerate(content):
+            if ignore_case:
+                ch = ch.lower()
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for phrase_idx in output[state]:
+                end = i + 1
+                start = end - len(phrases[phrase_idx])
+                if _is_word_boundary(content, start) and _is_word_boundary(content, end):
+                    matches.append((start, end, phrase_idx))
+
+        return matches
+
+    def find_sentence_spans(self, content: str) -> list[tuple[int, int]]:
+        # returns (start, end) for each sentence holding at least one phrase, stripped of
+        # surrounding whitespace and including the closing period
+        spans = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        phrases = self.phrases
+        ignore_case = self.ignore_case
+
+        sentence_start = 0
+        sentence_has_match = False
+        state = 0
+        for i, ch in enumerate(content):
+            if ch == ".":
+                if sentence_has_match:
+                    spans.append(_strip_span(content, sentence_start, i + 1))
+                sentence_start = i + 1
+                sentence_has_match = False
+                state = 0 # phrases never span a period
+                continue
+
+            if sentence_has_match:
+                continue # only need to find the end of this sentence now
+
+            if ignore_case:
+                ch = ch.lower()
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for phrase_idx in output[state]:
+                end = i + 1
+                start = end - len(phrases[phrase_idx])
+                if _is_word_boundary(content, start) and _is_word_boundary(content, end):
+                    sentence_has_match = True
+                    break
+
+        return spans
+
+
+# returns true if there is a regex-style word boundary (\b) at idx
+def _is_word_boundary(content: str, idx: int) -> bool:
+    before = idx > 0 and _is_word_char(content[idx - 1])
+    after = idx < len(content) and _is_word_char(content[idx])
+    return before != after
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _strip_span(content: str, start: int, end: int) -> tuple[int, int]:
+    while start < end and content[start].isspace():
+        start += 1
+    while end > start and content[end - 1].isspace():
+        end -= 1
+    return start, end
@@ -0,0 +1,166 @@
+"""
+Logger.py
+
+DESC:
+    Structured logging for AutoSOAP. Wraps the standard logging module with the
+    same '[INFO]: ' style prefixes used by the CLI, an optional JSON-lines output for
+    batch runs, a per-job correlation ID and run counters.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Log through 'log' with %-style args, i.e. log.debug("name -> %s", name). Args
+      are only formatted if the level is enabled, so disabled debug lines are cheap.
+    - Call setup() once at startup. Use set_debug() to toggle debug messages.
+    - Wrap a unit of work in 'with job_context(job_id, patient):' to tag every record
+      logged inside it. IDs are generated if not given.
+    - Use count() to bump a run counter (notes_parsed, notes_written, cache_hits,
+      failures) and get_counters() to read them.
+    - Counters are per process, a worker returns get_counters() with its result and
+      the parent adds them to its own with merge_counters().
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    Records logged from worker processes are not sent back to the parent process,
+    neither are counters unless merged.
+
+DEPENDENCIES:
+    - collections
+    - contextlib
+    - contextvars
+    - json
+    - logging
+    - sys
+    - threading
+    - time
+    - uuid
+"""
+
+import json, logging, sys, threading, time, uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LEVEL_PREFIXES = {
+    logging.DEBUG: "[DEBUG]: ",
+    logging.INFO: "[INFO]: ",
+    logging.WARNING: "[WARNING]: ",
+    logging.ERROR: "[ERROR]: ",
+    logging.CRITICAL: "[ERROR]: ",
+}
+
+# counters every run reports, others can be added with count()
+COUNTER_NAMES = ["notes_parsed", "notes_written", "cache_hits", "failures"]
+
+log = logging.getLogger("autosoap")
+
+_job_id: ContextVar[str | None] = ContextVar("job_id", default=None)
+_patient: ContextVar[str | None] = ContextVar("patient", default=None)
+
+_counters = Counter({name: 0 for name in COUNTER_NAMES})
+_counters_lock = threading.Lock()
+
+class _ContextFilter(logging.Filter):
+    # stamps the correlation IDs onto every record
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.job_id = _job_id.get()
+        record.patient = _patient.get()
+        return True
+
+
+class _PrefixFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return f"{LEVEL_PREFIXES.get(record.levelno, '')}{record.getMessage()}"
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    # extra fields passed with extra={"fields": {...}} are merged into the record
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "msg": record.getMessage(),
+            "job_id": getattr(record, "job_id", None),
+            "patient": getattr(record, "patient", None),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup(json_path: str | None = None, debug: bool = False) -> None:
+    # console output goes to stdout like the old print calls, JSON lines go to json_path
+    log.handlers.clear()
+    log.filters.clear()
+    log.propagate = False
+    log.addFilter(_ContextFilter())
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(_PrefixFormatter())
+    log.addHandler(console)
+
+    if json_path:
+        json_handler = logging.FileHandler(json_path, encoding='utf-8')
+        json_handler.setFormatter(_JsonLinesFormatter())
+        log.addHandler(json_handler)
+
+    set_debug(debug)
+
+
+def set_debug(enabled: bool) -> None:
+    log.setLevel(logging.DEBUG if enabled else logging.INFO)
+
+
+@contextmanager
+def job_context(job_id: str | None = None, patient: str | None = None):
+    job_token = _job_id.set(job_id or uuid.uuid4().hex[:12])
+    patient_token = _patient.set(patient)
+    try:
+        yield _job_id.get()
+    finally:
+        _patient.reset(patient_token)
+        _job_id.reset(job_token)
+
+
+def set_patient(patient: str | None) -> None:
+    # tag the rest of the current job once the patient is known
+    _patient.set(patient)
+
+
+def count(name: str, amount: int = 1) -> None:
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def get_counters() -> dict[str, int]:
+    with _counters_lock:
+        return dict(_counters)
+
+
+def merge_counters(counters: dict[str, int]) -> None:
+    # adds counters from another process, i.e. a worker's get_counters()
+    with _counters_lock:
+        _counters.update(counters)
+
+
+def reset_counters() -> None:
+    with _counters_lock:
+        _counters.clear()
+        _counters.update({name: 0 for name in COUNTER_NAMES})
+
+
+def log_counters(started: float | None = None) -> None:
+    # one summary record per run
+    fields = {"event": "run_summary", "counters": get_counters()}
+    if started is not None:
+        fields["elapsed_s"] = round(time.perf_counter() - started, 6)
+    log.info("Run summary: %s", ", ".join(f"{name}={value}" for name, value in fields["counters"].items()),
+             extra={"fields": fields})
@@ -6,12 +6,17 @@ DESC:
 
 Author: David J. Kim,
 Created: 01-23-2026,
-Modified: 01-23-2026,
+Modified: 10-19-2026,
 Version: 1.0.0
 
 USAGE:
     - Instantiate with a dict. Can retrieve list of complaints and ratings using
       a getter method.
+    - get_paragraph() generates a section the first time it is asked for and caches
+      it, sections can be asked for in any order. Values shared between sections
+      are worked out once, see NODE_DEPENDENCIES.
+    - regenerate() drops the cached sections so they are written again with new
+      sentences, the ratings stay the same.
     
 PLANNED:
     - ...
@@ -20,13 +25,25 @@ LIMITATIONS:
     ...
 
 DEPENDENCIES:
+    - array
+    - Complaints
     - Patient
+    - Ratings
+    - SentencePicker
+    - SpinalLevels
+    - TextFormat
 """
 
 import random
 import re
+from array import array
 from enum import Enum
+from Complaints import PAIN_ID, HEALTH_ID, get_complaint_name, get_complaint_names, is_overall_rating
 from Patient import Patient
+from Ratings import Ratings
+from SentencePicker import SentencePicker
+from SpinalLevels import CERVICAL, THORACIC, LUMBAR, format_levels, get_level_region
+from TextFormat import format_list
 
 RATING_CEILING = 10
 
@@ -36,32 +53,65 @@ class Sections(Enum):
     ASSESSMENT = 2
     PLAN = 3
     
-target_ratings: dict[str, int] = {}
-overall_assessment = ""
-improving_complaints = []
-unchanged_complaints = []
-worsening_complaints = []
+# dependency graph of a note, sections and the intermediate values they share
+# - complaint_trends -> (improving, unchanged, worsening) complaint IDs, see Complaints.py
+# - overall_assessment -> i.e. 'has mildly improved'
+NODE_DEPENDENCIES = {
+    "complaint_trends": (),
+    "overall_assessment": (),
+    Sections.SUBJECTIVE.name: ("complaint_trends",),
+    Sections.OBJECTIVE.name: (),
+    Sections.ASSESSMENT.name: ("overall_assessment", "complaint_trends"),
+    Sections.PLAN.name: (),
+}
+
+NODE_BUILDERS = {
+    "complaint_trends": "_build_complaint_trends",
+    "overall_assessment": "_build_overall_assessment",
+    Sections.SUBJECTIVE.name: "_build_subjective",
+    Sections.OBJECTIVE.name: "_build_objective",
+    Sections.ASSESSMENT.name: "_build_assessment",
+    Sections.PLAN.name: "_build_plan",
+}
+
+SECTION_NODES = {section.value: section.name for section in Sections}
+
+AFFECTED_AREAS_SPLIT = re.compile(r"\s+of the\s+|\s+in the\s+", re.IGNORECASE)
+
+def get_affected_areas(sentence: str) -> str:
+    # 'Hypertonicity is palpable in the rhomboids' -> 'rhomboids'
+    return AFFECTED_AREAS_SPLIT.split(sentence)[-1]
 
 # start at 1, idx 0 is storing the prev note ratings
 note_counter = 1
 
+# shared by every Note so a patient's recent phrasing is remembered across notes
+default_picker = SentencePicker()
+
+def reset_note_counter() -> None:
+    # call before starting a new set of trajectories
+    global note_counter
+    note_counter = 1
+    
+
 class Note:
-    def __init__(self, patient: Patient, sorted_sentences: dict[str, list], complaint_ratings=None):
-        global target_ratings, overall_assessment, improving_complaints, unchanged_complaints, worsening_complaints, note_counter
+    def __init__(self, patient: Patient, sorted_sentences: dict[str, list], complaint_ratings=None,
+                 picker: SentencePicker | None = None):
+        global note_counter
         self.patient = patient
-        
-        # reset global variables
-        overall_assessment = ""
-        improving_complaints.clear()
-        unchanged_complaints.clear()
-        worsening_complaints.clear()
+        self._resolved = {} # node -> value, see NODE_DEPENDENCIES
+        self.picker = picker or default_picker
+        self.picker.begin_note(patient.get_full_name())
         
         # are ratings already generated?
         if not complaint_ratings: # no, do manual
-            target_ratings = self.get_target_ratings() # get the target rating for this note obj manually
+            self.target_ratings = self.get_target_ratings() # get the target rating for this note obj manually
         else: # yes, map the ratings out
-            for i, (complaint, rating) in enumerate(patient.get_ratings().items()):
-                target_ratings[complaint] = complaint_ratings[i][note_counter]
+            # complaint_ratings holds one trajectory per complaint, in the same order as the patient's ratings
+            self.target_ratings = Ratings.from_arrays(
+                patient.ratings.get_complaint_ids(),
+                array('b', [trajectory[note_counter] for trajectory in complaint_ratings])
+            )
             note_counter+=1 # increment to next set of ratings for next note
         
         self.sorted_sentences = sorted_sentences
@@ -292,247 +342,251 @@ class Note:
     #     return
     
     def _get_complaint_list(self) -> str:
-        global target_ratings
-        counter = 1    
-        complaint_sentence = ""
-        
         # check null
-        if not target_ratings:
+        if not self.target_ratings:
             raise ValueError("Target ratings is None")
         
-        for complaint, rating in target_ratings.items():
-            if complaint != "pain" and complaint != "health":
-                complaint_sentence += f"{complaint} as a {rating}"
-                
-                # add comma, period or 'and' at the end
-                if counter < len(target_ratings) - 3:
-                    complaint_sentence += ", "
-                elif counter == len(target_ratings) - 3:
-                    complaint_sentence += " and "
-                elif counter == len(target_ratings) - 2:
-                    complaint_sentence += "."
-                
-                counter+=1
-                
-        return complaint_sentence
-
-
-    def _convert_list_to_plain(self, input_list: list, has_period: bool) -> str:
-        sentence = ""
-        counter = 1    
-        
-        # check null
-        if not input_list:
-            raise ValueError("input_list is None")
-        
-        for element in input_list:
-            sentence += f"{element}"
-            
-            # add comma, period or 'and' at the end
-            if counter < len(input_list) - 1:
-                sentence += ", "
-            elif counter == len(input_list) - 1:
-                sentence += " and "
-            elif (counter == len(input_list) and has_period):
-                sentence += "."
-            
-            counter+=1
-                
-        return sentence        
+        complaints = [f"{get_complaint_name(complaint_id)} as a {rating}"
+                      for complaint_id, rating in zip(self.target_ratings.get_complaint_ids(), self.target_ratings.get_values())
+                      if not is_overall_rating(complaint_id)]
+        if not complaints:
+            return ""
+        return format_list(complaints, has_period=True)
         
     
-    def get_target_ratings(self) -> dict[str, int]:
-        ratings_copy = self.patient.get_ratings().copy()
+    def get_target_ratings(self) -> Ratings:
+        complaint_ids = array('H', self.patient.ratings.get_complaint_ids())
+        values = array('b', self.patient.ratings.get_values())
         total_pain = 0
-        for complaint, rating in ratings_copy.items():
+        for i, complaint_id in enumerate(complaint_ids):
             getting_input = True
-            if complaint != "pain" and complaint != "health":
+            if not is_overall_rating(complaint_id):
                 while getting_input:
-                    user_input = input(f"Please enter a target rating for {complaint}, starting at {rating}: ")
+                    user_input = input(f"Please enter a target rating for {get_complaint_name(complaint_id)}, starting at {values[i]}: ")
                     if not re.fullmatch(r'[0-9]', user_input):
                         print("Invalid input, please enter a number in the range 0-9. Try again.")
                     else:
-                        ratings_copy[complaint] = int(user_input)
+                        values[i] = int(user_input)
                         
                         # higher pain ratings contribute more to the overall pain value
                         # can tweak this so that age/gender affects perceived pain values
                         bonus_pain_value = 0
-                        if int(user_input) > 4 and len(ratings_copy) > 4:
-                            bonus_pain_value += (len(ratings_copy)-4)
+                        if int(user_input) > 4 and len(complaint_ids) > 4:
+                            bonus_pain_value += (len(complaint_ids)-4)
                         
                         total_pain += int(user_input) + bonus_pain_value # add up pain
                         getting_input = False
                 
         # calculate pain and health and
-        avg_pain = min(round(total_pain / (len(ratings_copy)-2)) + random.randint(0, 1), 10)
-        health = max((RATING_CEILING - avg_pain) + random.randint(-1, 1), 0)
+        avg_pain = min(round(total_pain / (len(complaint_ids)-2)) + random.randint(0, 1), 10)
+        health = min(max((RATING_CEILING - avg_pain) + random.randint(-1, 1), 0), RATING_CEILING)
         
-        ratings_copy["pain"] = avg_pain
-        ratings_copy["health"] = health
+        for complaint_id, value in ((PAIN_ID, avg_pain), (HEALTH_ID, health)):
+            if complaint_id in complaint_ids:
+                values[complaint_ids.index(complaint_id)] = value
+            else:
+                complaint_ids.append(complaint_id)
+                values.append(value)
         
-        return ratings_copy
+        return Ratings.from_arrays(complaint_ids, values)
+    
+    
+    def regenerate(self) -> None:
+        # drop every generated section, they are written again with new sentences on next request
+        self._resolved.clear()
+    
+    
+    def _choose(self, bank_name: str) -> str:
+        # bank_name is the attribute holding the sentence bank, i.e. 'plan_sentences'
+        return self.picker.choose(bank_name, getattr(self, bank_name))
     
     
     def get_paragraph(self, section: int) -> str:
-        global target_ratings, improving_complaints, unchanged_complaints, worsening_complaints
-        
-        # check for null
-        if not target_ratings:
-            raise ValueError("target_ratings is None")
-        
-        paragraph = ""
-        if section == Sections.SUBJECTIVE.value:
-            # append intro sentences
-            paragraph += self.subjective_intro[random.randint(0, len(self.subjective_intro)-1)]
-            paragraph += self.subjective_pain_intro[random.randint(0, len(self.subjective_pain_intro)-1)]
-            
-            # append overall pain rating from patient
-            paragraph += self.subjective_overall_pain[random.randint(0, len(self.subjective_overall_pain)-1)]
-            paragraph += f"{target_ratings['pain']}."
-            
-            # append health rating from patient
-            paragraph += self.subjective_health[random.randint(0, len(self.subjective_health)-1)]
-            paragraph += f"{target_ratings['health']}."
-            
-            # add improving, unchanged, worsening complaint sentence(s)
-            # make lists to sort complaints based on whether it is improving/unchanged/worsening
-            # compare starting and target ratings
-            # - if difference is negative (starting < target), it is worsening
-            # - if difference is equal (starting == target), it is unchanged
-            # - if difference is positive (starting > target), it is improving
-            for complaint, start_rating in self.patient.get_ratings().items():
-                if complaint != "pain" and complaint != "health": 
-                    target_rating = target_ratings[complaint] # get target rating
-                    
-                    # compare and sort
-                    if start_rating > target_rating:
-                        improving_complaints.append(complaint)
-                    elif start_rating == target_rating:
-                        unchanged_complaints.append(complaint)
-                    else:
-                        worsening_complaints.append(complaint)
-        
-            if improving_complaints:
-                paragraph += self.subjective_assessment_improving[random.randint(0, len(self.subjective_assessment_improving)-1)]
-                paragraph += self._convert_list_to_plain(improving_complaints, has_period=True)            
-            
-            if unchanged_complaints:
-                paragraph += self.subjective_assessment_unchanged[random.randint(0, len(self.subjective_assessment_unchanged)-1)]
-                paragraph += self._convert_list_to_plain(unchanged_complaints, has_period=True)            
-            
-            if worsening_complaints:
-                paragraph += self.subjective_assessment_worsening[random.randint(0, len(self.subjective_assessment_worsening)-1)]
-                paragraph += self._convert_list_to_plain(worsening_complaints, has_period=True)
-            
-            # append ratings from patient
-            paragraph += self.subjective_ratings[random.randint(0, len(self.subjective_ratings)-1)]
-            paragraph += self._get_complaint_list()
-            
-            return paragraph
+        # sections are generated on first request and cached, so they can be asked for in any order
+        if section not in SECTION_NODES:
+            raise ValueError(f"'{section}' is not a valid section id")
+        return self._resolve(SECTION_NODES[section])
+    
+    
+    def _resolve(self, node: str):
+        # evaluate whatever the node depends on first, then the node itself, each at most once
+        if node not in self._resolved:
+            if not self.target_ratings:
+                raise ValueError("target_ratings is None")
+            for dependency in NODE_DEPENDENCIES[node]:
+                self._resolve(dependency)
+            self._resolved[node] = getattr(self, NODE_BUILDERS[node])()
+        return self._resolved[node]
+    
+    
+    def _build_complaint_trends(self) -> tuple[list[int], list[int], list[int]]:
+        improving_complaints = []
+        unchanged_complaints = []
+        worsening_complaints = []
+        
+        # make lists to sort complaints based on whether it is improving/unchanged/worsening
+        # compare starting and target ratings
+        # - if difference is negative (starting < target), it is worsening
+        # - if difference is equal (starting == target), it is unchanged
+        # - if difference is positive (starting > target), it is improving
+        # target ratings are built from the patient's ratings, so both arrays line up
+        for complaint_id, start_rating, target_rating in zip(self.patient.ratings.get_complaint_ids(),
+                                                             self.patient.ratings.get_values(),
+                                                             self.target_ratings.get_values()):
+            if not is_overall_rating(complaint_id):
+                # compare and sort
+                if start_rating > target_rating:
+                    improving_complaints.append(complaint_id)
+                elif start_rating == target_rating:
+                    unchanged_complaints.append(complaint_id)
+                else:
+                    worsening_complaints.append(complaint_id)
+        
+        return improving_complaints, unchanged_complaints, worsening_complaints
+    
+    
+    def _build_overall_assessment(self) -> str:
+        overall_assessment = ""
+        start_rating = self.patient.ratings.get_rating(HEALTH_ID)
+        target_rating = self.target_ratings.get_rating(HEALTH_ID) # get target rating
+        
+        if abs(start_rating - target_rating) > 1:
+            overall_assessment += "has moderately "
+        elif abs(start_rating - target_rating) == 1:
+            overall_assessment += "has mildly "
+        
+        # compare ratings
+        if start_rating > target_rating: # getting worse
+            overall_assessment += "worsened"
+        elif start_rating == target_rating: # unchanged
+            overall_assessment += "is unchanged"
+        else: # getting better
+            overall_assessment += "improved"
+        
+        return overall_assessment
+    
+    
+    def _build_subjective(self) -> str:
+        fragments = []
+        # append intro sentences
+        fragments.append(self._choose("subjective_intro"))
+        fragments.append(self._choose("subjective_pain_intro"))
+        
+        # append overall pain rating from patient
+        fragments.append(self._choose("subjective_overall_pain"))
+        fragments.append(f"{self.target_ratings.get_rating(PAIN_ID)}.")
+        
+        # append health rating from patient
+        fragments.append(self._choose("subjective_health"))
+        fragments.append(f"{self.target_ratings.get_rating(HEALTH_ID)}.")
+        
+        # add improving, unchanged, worsening complaint sentence(s)
+        improving_complaints, unchanged_complaints, worsening_complaints = self._resolved["complaint_trends"]
+        if improving_complaints:
+            fragments.append(self._choose("subjective_assessment_improving"))
+            fragments.append(format_list(get_complaint_names(improving_complaints), has_period=True))            
+        
+        if unchanged_complaints:
+            fragments.append(self._choose("subjective_assessment_unchanged"))
+            fragments.append(format_list(get_complaint_names(unchanged_complaints), has_period=True))            
+        
+        if worsening_complaints:
+            fragments.append(self._choose("subjective_assessment_worsening"))
+            fragments.append(format_list(get_complaint_names(worsening_complaints), has_period=True))
+        
+        # append ratings from patient
+        fragments.append(self._choose("subjective_ratings"))
+        fragments.append(self._get_complaint_list())
+        
+        return "".join(fragments)
+    
+    
+    def _build_objective(self) -> str:
+        fragments = []
+        # index 0 -> tone, 1 -> trigger, 2 -> rom, 3 -> pain
         
-        elif section == Sections.OBJECTIVE.value:
-            # index 0 -> tone, 1 -> trigger, 2 -> rom, 3 -> pain
+        # cervical region
+        if self.sorted_sentences["sorted_cervical"][0]:
             
-            # cervical region
-            if self.sorted_sentences["sorted_cervical"][0]:
-                
-                # starting sentence
-                paragraph += self.objective_tender_cervical[random.randint(0, len(self.objective_tender_cervical)-1)]
-                paragraph += self._convert_list_to_plain(self.sorted_sentences["tender_cervical"], has_period=True)                
-                paragraph += self.objective_tone_cervical[random.randint(0, len(self.objective_tone_cervical)-1)]
-                
-                # extract the list of affected areas, then append
-                parts = re.split(r"\s+of the\s+|\s+in the\s+", self.sorted_sentences["sorted_cervical"][0], flags=re.IGNORECASE)
-                affected_areas = parts[len(parts) - 1]
-                paragraph += f"{affected_areas}."
-                
-            if self.sorted_sentences["sorted_cervical"][1]:
-                paragraph += self.objective_trigger_cervical[random.randint(0, len(self.objective_trigger_cervical)-1)]
-                parts = re.split(r"\s+of the\s+|\s+in the\s+", self.sorted_sentences["sorted_cervical"][1], flags=re.IGNORECASE)
-                affected_areas = parts[len(parts) - 1]
-                paragraph += f"{affected_areas}."
-            if self.sorted_sentences["sorted_cervical"][2]:
-                paragraph += self.objective_rom_cervical[random.randint(0, len(self.objective_rom_cervical)-1)]
-            if self.sorted_sentences["sorted_cervical"][3]:
-                paragraph += self.objective_test_pain[random.randint(0, len(self.objective_test_pain)-1)]    
-                
-            # thoracic region
-            if self.sorted_sentences["sorted_thoracic"][0]:
-                paragraph += self.objective_tender_thoracic[random.randint(0, len(self.objective_tender_thoracic)-1)]
-                paragraph += self._convert_list_to_plain(self.sorted_sentences["tender_thoracic"], has_period=True)                
-                paragraph += self.objective_tone_thoracic[random.randint(0, len(self.objective_tone_thoracic)-1)]
-                parts = re.split(r"\s+of the\s+|\s+in the\s+", self.sorted_sentences["sorted_thoracic"][0], flags=re.IGNORECASE)
-                affected_areas = parts[len(parts) - 1]
-                paragraph += f"{affected_areas}."
-            if self.sorted_sentences["sorted_thoracic"][1]:
-                paragraph += self.objective_trigger_thoracic[random.randint(0, len(self.objective_trigger_thoracic)-1)]
-                parts = re.split(r"\s+of the\s+|\s+in the\s+", self.sorted_sentences["sorted_thoracic"][1], flags=re.IGNORECASE)
-                affected_areas = parts[len(parts) - 1]
-                paragraph += f"{affected_areas}."
-            if self.sorted_sentences["sorted_thoracic"][2]:
-                paragraph += self.objective_rom_thoracic[random.randint(0, len(self.objective_rom_thoracic)-1)]
-            if self.sorted_sentences["sorted_thoracic"][3]:
-                paragraph += self.objective_test_pain[random.randint(0, len(self.objective_test_pain)-1)]
-            
-            # lumbar region
-            if self.sorted_sentences["sorted_lumbar"][0]:
-                paragraph += self.objective_tender_lumbar[random.randint(0, len(self.objective_tender_lumbar)-1)]
-                paragraph += self._convert_list_to_plain(self.sorted_sentences["tender_lumbar"], has_period=True)                     
-                paragraph += self.objective_tone_lumbar[random.randint(0, len(self.objective_tone_lumbar)-1)]
-                parts = re.split(r"\s+of the\s+|\s+in the\s+", self.sorted_sentences["sorted_lumbar"][0], flags=re.IGNORECASE)
-                affected_areas = parts[len(parts) - 1]
-                paragraph += f"{affected_areas}."
-            if self.sorted_sentences["sorted_lumbar"][1]:
-                paragraph += self.objective_trigger_lumbar[random.randint(0, len(self.objective_trigger_lumbar)-1)]
-                parts = re.split(r"\s+of the\s+|\s+in the\s+", self.sorted_sentences["sorted_lumbar"][1], flags=re.IGNORECASE)
-                affected_areas = parts[len(parts) - 1]
-                paragraph += f"{affected_areas}."
-            if self.sorted_sentences["sorted_lumbar"][2]:
-                paragraph += self.objective_rom_lumbar[random.randint(0, len(self.objective_rom_lumbar)-1)]
-            if self.sorted_sentences["sorted_lumbar"][3]:
-                paragraph += self.objective_test_pain[random.randint(0, len(self.objective_test_pain)-1)]                
-            
-            return paragraph
-        
-        elif section == Sections.ASSESSMENT.value:
-            global overall_assessment
-            start_rating = self.patient.get_ratings()["health"]
-            target_rating = target_ratings["health"] # get target rating
+            # starting sentence
+            fragments.append(self._choose("objective_tender_cervical"))
+            fragments.append(self._format_tender(CERVICAL, "cervical"))                
+            fragments.append(self._choose("objective_tone_cervical"))
             
-            if abs(start_rating - target_rating) > 1:
-                overall_assessment += "has moderately "
-            elif abs(start_rating - target_rating) == 1:
-                overall_assessment += "has mildly "
+            # extract the list of affected areas, then append
+            fragments.append(get_affected_areas(self.sorted_sentences["sorted_cervical"][0]) + ".")
             
-            # compare ratings
-            if start_rating > target_rating: # getting worse
-                overall_assessment += "worsened"
-            elif start_rating == target_rating: # unchanged
-                overall_assessment += "is unchanged"
-            else: # getting better
-                overall_assessment += "improved"
-                
-            # this is messy, definitely rework this later
-            self.assessment_status = [
-                f"The patient's overall status {overall_assessment} since the last visit.",
-                f"Overall assessment of the patient's condition {overall_assessment} since the last visit.",
-                f"Overall, the patient's condition {overall_assessment} since the last visit.",
-                f"The patient's overall condition {overall_assessment} since the last visit.",
-                f"The patient's condition {overall_assessment} since their last visit."
-            ] 
-                        
-            paragraph += self.assessment_status[random.randint(0, len(self.assessment_status)-1)]
-            if improving_complaints:
-                paragraph += f"{self.assessment_starter[random.randint(0, len(self.assessment_starter)-1)]}{self._convert_list_to_plain(improving_complaints, has_period=False)} is determined to have improved."
-            if unchanged_complaints:
-                paragraph += f"{self.assessment_starter[random.randint(0, len(self.assessment_starter)-1)]}{self._convert_list_to_plain(unchanged_complaints, has_period=False)} is determined to be unchanged."
-            if worsening_complaints:
-                paragraph += f"{self.assessment_starter[random.randint(0, len(self.assessment_starter)-1)]}{self._convert_list_to_plain(worsening_complaints, has_period=False)} is determined to have worsened."
+        if self.sorted_sentences["sorted_cervical"][1]:
+            fragments.append(self._choose("objective_trigger_cervical"))
+            fragments.append(get_affected_areas(self.sorted_sentences["sorted_cervical"][1]) + ".")
+        if self.sorted_sentences["sorted_cervical"][2]:
+            fragments.append(self._choose("objective_rom_cervical"))
+        if self.sorted_sentences["sorted_cervical"][3]:
+            fragments.append(self._choose("objective_test_pain"))    
             
-            return paragraph
-        
-        elif section == Sections.PLAN.value:
-            paragraph += self.plan_sentences[random.randint(0, len(self.plan_sentences)-1)]
-            return paragraph
-        
-        raise ValueError(f"'{section}' is not a valid section id")
\ No newline at end of file
+        # thoracic region
+        if self.sorted_sentences["sorted_thoracic"][0]:
+            fragments.append(self._choose("objective_tender_thoracic"))
+            fragments.append(self._format_tender(THORACIC, "thoracic"))                
+            fragments.append(self._choose("objective_tone_thoracic"))
+            fragments.append(get_affected_areas(self.sorted_sentences["sorted_thoracic"][0]) + ".")
+        if self.sorted_sentences["sorted_thoracic"][1]:
+            fragments.append(self._choose("objective_trigger_thoracic"))
+            fragments.append(get_affected_areas(self.sorted_sentences["sorted_thoracic"][1]) + ".")
+        if self.sorted_sentences["sorted_thoracic"][2]:
+            fragments.append(self._choose("objective_rom_thoracic"))
+        if self.sorted_sentences["sorted_thoracic"][3]:
+            fragments.append(self._choose("objective_test_pain"))
+        
+        # lumbar region
+        if self.sorted_sentences["sorted_lumbar"][0]:
+            fragments.append(self._choose("objective_tender_lumbar"))
+            fragments.append(self._format_tender(LUMBAR, "lumbar"))                     
+            fragments.append(self._choose("objective_tone_lumbar"))
+            fragments.append(get_affected_areas(self.sorted_sentences["sorted_lumbar"][0]) + ".")
+        if self.sorted_sentences["sorted_lumbar"][1]:
+            fragments.append(self._choose("objective_trigger_lumbar"))
+            fragments.append(get_affected_areas(self.sorted_sentences["sorted_lumbar"][1]) + ".")
+        if self.sorted_sentences["sorted_lumbar"][2]:
+            fragments.append(self._choose("objective_rom_lumbar"))
+        if self.sorted_sentences["sorted_lumbar"][3]:
+            fragments.append(self._choose("objective_test_pain"))                
+        
+        return "".join(fragments)
+    
+    
+    def _format_tender(self, region_mask: int, region: str) -> str:
+        # a region's tender levels, levels without a bit (i.e. 'C8') are listed by name after them
+        unknown = tuple(level for level in self.sorted_sentences.get("unknown_levels", ()) if get_level_region(level) == region)
+        return format_levels(self.sorted_sentences["tender_levels"] & region_mask, True, unknown)
+    
+    
+    def _build_assessment(self) -> str:
+        fragments = []
+        overall_assessment = self._resolved["overall_assessment"]
+        improving_complaints, unchanged_complaints, worsening_complaints = self._resolved["complaint_trends"]
+        
+        # this is messy, definitely rework this later
+        self.assessment_status = [
+            f"The patient's overall status {overall_assessment} since the last visit.",
+            f"Overall assessment of the patient's condition {overall_assessment} since the last visit.",
+            f"Overall, the patient's condition {overall_assessment} since the last visit.",
+            f"The patient's overall condition {overall_assessment} since the last visit.",
+            f"The patient's condition {overall_assessment} since their last visit."
+        ] 
+                    
+        fragments.append(self._choose("assessment_status"))
+        if improving_complaints:
+            fragments.append(f"{self._choose('assessment_starter')}{format_list(get_complaint_names(improving_complaints), has_period=False)} is determined to have improved.")
+        if unchanged_complaints:
+            fragments.append(f"{self._choose('assessment_starter')}{format_list(get_complaint_names(unchanged_complaints), has_period=False)} is determined to be unchanged.")
+        if worsening_complaints:
+            fragments.append(f"{self._choose('assessment_starter')}{format_list(get_complaint_names(worsening_complaints), has_period=False)} is determined to have worsened.")
+        
+        return "".join(fragments)
+    
+    
+    def _build_plan(self) -> str:
+        fragments = []
+        fragments.append(self._choose("plan_sentences"))
+        return "".join(fragments)
@@ -0,0 +1,184 @@
+"""
+NoteDocument.py
+
+DESC:
+    A format-neutral representation of a generated note, an ordered list of
+    (role, text) blocks plus a footer, and the backends that write it out as RTF,
+    plain text, HTML or Markdown. A note is built once and each backend serializes
+    it in a single pass, so no format has to be produced by converting another.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Build a NoteDocument with add() and add_section(), then write it with
+      write_note(document, directory, name, fmt). fmt is a key of BACKENDS, the
+      file extension is added for you.
+    - render(document, fmt) returns a text format as a string instead of writing it,
+      RTF can only be written to a file.
+    - Roles say what a block is, not how it looks. Each backend maps roles to its
+      own styling, i.e. RTF_STYLES.
+    - get_rtf_par_pattern(role) matches the start of an RTF paragraph of that role,
+      for parsers that read notes back.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Page layout only applies to RTF.
+    - RTF is written by simplertf, which builds the whole document before writing.
+
+DEPENDENCIES:
+    - enum
+    - html
+    - io
+    - os
+    - re
+    - simplertf
+"""
+
+import html, io, os, re
+from enum import Enum
+from simplertf import simplertf
+
+RTF_TITLE = "'AutoSOAP' by dkim03"
+RTF_STYLESHEET = "English"
+RTF_PAR_FORMAT = "\\ql\\f4\\fs22\\lang1033" # simplertf writes this after the style of every paragraph with RTF_STYLESHEET
+
+class Role(Enum):
+    CLINIC = "clinic" # practice name and address
+    PATIENT = "patient" # patient name, address, birthday
+    TITLE = "title"
+    HEADING = "heading" # section headings and the visit date
+    BODY = "body"
+
+
+RTF_STYLES = {
+    Role.CLINIC: "s26",
+    Role.PATIENT: "s27",
+    Role.TITLE: "s25",
+    Role.HEADING: "s28",
+    Role.BODY: "s21",
+}
+
+HTML_TAGS = {
+    Role.CLINIC: ('<p class="clinic">', "</p>"),
+    Role.PATIENT: ('<p class="patient">', "</p>"),
+    Role.TITLE: ("<h1>", "</h1>"),
+    Role.HEADING: ("<h2>", "</h2>"),
+    Role.BODY: ("<p>", "</p>"),
+}
+
+MARKDOWN_PREFIXES = {
+    Role.TITLE: "# ",
+    Role.HEADING: "## ",
+}
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]#<>|])")
+
+class NoteDocument:
+    __slots__ = ("blocks", "footer", "layout")
+
+    def __init__(self):
+        self.blocks: list[tuple[Role, str]] = []
+        self.footer: tuple[str, ...] = ()
+        self.layout: dict[str, str] = {} # RTF page setup, see simplertf.RTF.set_layout()
+
+    def add(self, role: Role, text: str) -> None:
+        self.blocks.append((role, text))
+
+    def add_section(self, heading: str, text: str) -> None:
+        self.blocks.append((Role.HEADING, heading))
+        self.blocks.append((Role.BODY, text))
+
+    def set_footer(self, *lines: str) -> None:
+        self.footer = lines
+
+    def get_section(self, heading: str) -> str | None:
+        # body text under heading, None if the document has no such section
+        for idx, (role, text) in enumerate(self.blocks[:-1]):
+            if role is Role.HEADING and text == heading and self.blocks[idx + 1][0] is Role.BODY:
+                return self.blocks[idx + 1][1]
+        return None
+
+
+def get_rtf_par_pattern(role: Role) -> str:
+    # regex source for '{\pard \s27\ql\f4\fs22\lang1033 ', whitespace collapsed or not
+    return r"\{\\pard\s+" + re.escape(f"\\{RTF_STYLES[role]}{RTF_PAR_FORMAT}") + r"\s+"
+
+
+def write_text(document: NoteDocument, out) -> None:
+    # one line per block, same layout rtf_to_text() gives for an RTF note
+    for _, text in document.blocks:
+        out.write(text)
+        out.write("\n")
+    if document.footer:
+        out.write("\n")
+        out.write("\n".join(document.footer))
+        out.write("\n")
+
+
+def write_markdown(document: NoteDocument, out) -> None:
+    for role, text in document.blocks:
+        out.write(MARKDOWN_PREFIXES.get(role, ""))
+        out.write(MARKDOWN_SPECIAL.sub(r"\\\1", text))
+        out.write("\n\n")
+    if document.footer:
+        out.write("---\n\n")
+        out.write("  \n".join(MARKDOWN_SPECIAL.sub(r"\\\1", line) for line in document.footer))
+        out.write("\n")
+
+
+def write_html(document: NoteDocument, out) -> None:
+    out.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>')
+    out.write(html.escape(document.footer[0] if document.footer else "SOAP Note"))
+    out.write("</title></head>\n<body>\n")
+    for role, text in document.blocks:
+        start, end = HTML_TAGS[role]
+        out.write(f"{start}{html.escape(text)}{end}\n")
+    if document.footer:
+        out.write(f"<footer>{'<br>'.join(html.escape(line) for line in document.footer)}</footer>\n")
+    out.write("</body>\n</html>\n")
+
+
+def write_rtf(document: NoteDocument, directory: str, name: str) -> None:
+    r = simplertf.RTF(RTF_TITLE)
+    r.stylesheet = RTF_STYLESHEET
+    if document.layout:
+        r.set_layout(**document.layout)
+    for role, text in document.blocks:
+        r.par(text, style=RTF_STYLES[role])
+    if document.footer:
+        r.set_footer(**{f"line{idx}": line for idx, line in enumerate(document.footer, 1)})
+    r.create(name, directory)
+
+
+# fmt -> (file extension, writer), writers take an open text file
+BACKENDS = {
+    "text": (".txt", write_text),
+    "md": (".md", write_markdown),
+    "html": (".html", write_html),
+}
+FORMATS = ["rtf", *BACKENDS]
+
+def render(document: NoteDocument, fmt: str) -> str:
+    if fmt not in BACKENDS:
+        raise ValueError(f"'{fmt}' can not be rendered to a string, expected one of {', '.join(BACKENDS)}")
+    out = io.StringIO()
+    BACKENDS[fmt][1](document, out)
+    return out.getvalue()
+
+
+def write_note(document: NoteDocument, directory: str, name: str, fmt: str = "rtf") -> str:
+    # returns the filename written
+    if fmt == "rtf":
+        write_rtf(document, directory, name)
+        return f"{name}.rtf"
+    if fmt not in BACKENDS:
+        raise ValueError(f"'{fmt}' is not a valid format, expected one of {', '.join(FORMATS)}")
+
+    extension, writer = BACKENDS[fmt]
+    with open(os.path.join(directory, f"{name}{extension}"), 'w', encoding='utf-8', newline='\n') as out:
+        writer(document, out)
+    return f"{name}{extension}"
@@ -0,0 +1,323 @@
+"""
+NoteIndex.py
+
+DESC:
+    A local SQLite store for everything AutoSOAP extracts from existing notes and
+    exams (patient header, complaint ratings, pain/health, tender regions, objective
+    sentences and treatment text), so the chart history can be queried without
+    re-parsing any .rtf files.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Instantiate with a path to the database file, the schema is created on first
+      use. Insert parsed notes with add_notes() and query them with the getter
+      methods.
+    - Each parsed note is a dict, see main.collect_note_record() for the structure.
+    - The files table is a snapshot of (path, size, mtime, content hash) for every
+      file seen by the last sync, used to only re-parse files that changed. Use
+      get_file_snapshot(), record_files() and retire_files() to maintain it.
+    - MinHash signatures of notes are cached by path with the file's size, mtime
+      and content hash, use get_signatures() and save_signatures().
+    - get_tender_history() returns a patient's tender levels per visit as
+      SpinalLevels bitmasks, ready for get_changes() or count_levels().
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Patients are identified by first name, last name and date of birth.
+      Their title, street and address are kept from their newest indexed note.
+    - Only one process should write to the index at a time.
+
+DEPENDENCIES:
+    - sqlite3
+    - Complaints
+    - SpinalLevels
+"""
+
+import sqlite3
+
+from Complaints import PAIN, HEALTH, intern_complaint, is_overall_rating
+from SpinalLevels import LEVELS, LEVEL_BITS, LEVEL_REGIONS
+
+DEFAULT_BATCH_SIZE = 500 # notes per transaction
+
+REGIONS = ["cervical", "thoracic", "lumbar"]
+
+# index 0 -> tone, 1 -> trigger, 2 -> rom, 3 -> pain, same as main.sorted_*_sentences
+SENTENCE_KINDS = ["tone", "trigger", "rom", "pain"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    id INTEGER PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    title TEXT,
+    street TEXT,
+    address TEXT,
+    dob TEXT,
+    UNIQUE (first_name, last_name, dob)
+);
+
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    patient_id INTEGER NOT NULL REFERENCES patients(id),
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    doc_number INTEGER,
+    visit_date TEXT,
+    pain INTEGER,
+    health INTEGER,
+    treatment TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ratings (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    complaint TEXT NOT NULL,
+    rating INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tender_levels (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    region TEXT NOT NULL,
+    level TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS objective_sentences (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    region TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    sentence TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    error TEXT
+);
+
+-- MinHash signatures of written notes, see NoteSimilarity.py
+CREATE TABLE IF NOT EXISTS note_signatures (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_patients_name ON patients (last_name COLLATE NOCASE, first_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_notes_patient_date ON notes (patient_id, visit_date, doc_number);
+CREATE INDEX IF NOT EXISTS idx_notes_date ON notes (visit_date);
+CREATE INDEX IF NOT EXISTS idx_ratings_complaint ON ratings (complaint, note_id);
+CREATE INDEX IF NOT EXISTS idx_ratings_note ON ratings (note_id);
+CREATE INDEX IF NOT EXISTS idx_tender_levels_note ON tender_levels (note_id);
+CREATE INDEX IF NOT EXISTS idx_tender_levels_level ON tender_levels (level);
+CREATE INDEX IF NOT EXISTS idx_objective_sentences_note ON objective_sentences (note_id);
+"""
+
+class NoteIndex:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+
+        # WAL lets readers query while a sync is writing, NORMAL is safe under WAL
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._drop_old_signatures()
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _drop_old_signatures(self) -> None:
+        # signatures cached before size and mtime were stored are rebuilt, they are only a cache
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(note_signatures)")}
+        if columns and "mtime_ns" not in columns:
+            with self.conn:
+                self.conn.execute("DROP TABLE note_signatures")
+
+    def add_notes(self, notes: list[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        # insert parsed notes, replacing any note previously indexed under the same path
+        added = 0
+        patient_ids: dict[tuple, int] = {} # avoid looking up the same patient per note
+
+        for batch_start in range(0, len(notes), batch_size):
+            batch = notes[batch_start:batch_start + batch_size]
+            with self.conn: # one transaction per batch
+                for note in batch:
+                    self._insert_note(note, patient_ids)
+                    added += 1
+
+        return added
+
+    def _insert_note(self, note: dict, patient_ids: dict[tuple, int]) -> None:
+        cursor = self.conn.cursor()
+
+        # title, street and address come from the patient's newest note, a note without a date is the oldest
+        patient_key = (note["first_name"], note["last_name"], note["dob"])
+        cursor.execute(
+            """
+            INSERT INTO patients (first_name, last_name, title, street, address, dob) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (first_name, last_name, dob) DO UPDATE SET
+                title = excluded.title, street = excluded.street, address = excluded.address
+            WHERE NOT EXISTS (SELECT 1 FROM notes n WHERE n.patient_id = patients.id AND n.visit_date > COALESCE(?, ''))
+            """,
+            (note["first_name"], note["last_name"], note["title"], note["street"], note["address"], note["dob"], note["visit_date"])
+        )
+        patient_id = patient_ids.get(patient_key)
+        if patient_id is None:
+            cursor.execute(
+                "SELECT id FROM patients WHERE first_name = ? AND last_name = ? AND dob = ?", patient_key
+            )
+            patient_id = cursor.fetchone()[0]
+            patient_ids[patient_key] = patient_id
+
+        # child rows are removed by the cascade
+        cursor.execute("DELETE FROM notes WHERE path = ?", (note["path"],))
+
+        ratings = note["ratings"]
+        cursor.execute(
+            "INSERT INTO notes (patient_id, path, kind, doc_number, visit_date, pain, health, treatment) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (patient_id, note["path"], note["kind"], note["doc_number"], note["visit_date"],
+             ratings.get(PAIN), ratings.get(HEALTH), note["treatment"])
+        )
+        note_id = cursor.lastrowid
+
+        cursor.executemany(
+            "INSERT INTO ratings (note_id, complaint, rating) VALUES (?, ?, ?)",
+            [(note_id, complaint, rating) for complaint, rating in ratings.items()
+             if not is_overall_rating(intern_complaint(complaint))]
+        )
+        cursor.executemany(
+            "INSERT INTO tender_levels (note_id, region, level) VALUES (?, ?, ?)",
+            [(note_id, LEVEL_REGIONS[bit], level) for bit, level in enumerate(LEVELS) if note["tender_levels"] >> bit & 1]
+        )
+        cursor.executemany(
+            "INSERT INTO objective_sentences (note_id, region, kind, sentence) VALUES (?, ?, ?, ?)",
+            [(note_id, region, SENTENCE_KINDS[i], sentence.strip())
+             for region in REGIONS for i, sentence in enumerate(note["objective_sentences"][region]) if sentence]
+        )
+
+    def get_file_snapshot(self) -> dict[str, tuple[int, int, str, str | None]]:
+        # path -> (size, mtime_ns, content_hash, error) as of the last sync
+        return {
+            path: (size, mtime_ns, content_hash, error)
+            for path, size, mtime_ns, content_hash, error in self.conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, error FROM files"
+            )
+        }
+
+    def record_files(self, entries: list[tuple[str, int, int, str, str | None]]) -> None:
+        # entries are (path, size, mtime_ns, content_hash, error), error is None if it parsed
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO files (path, size, mtime_ns, content_hash, error) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    size = excluded.size, mtime_ns = excluded.mtime_ns,
+                    content_hash = excluded.content_hash, error = excluded.error
+                """,
+                entries
+            )
+
+    def retire_files(self, paths: list[str]) -> None:
+        # forget files that no longer exist, along with everything parsed from them
+        with self.conn:
+            self.conn.executemany("DELETE FROM notes WHERE path = ?", [(path,) for path in paths])
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+            self.conn.executemany("DELETE FROM note_signatures WHERE path = ?", [(path,) for path in paths])
+
+    def get_signatures(self, paths: list[str]) -> dict[str, tuple[int, int, str, bytes]]:
+        # path -> (size, mtime_ns, content_hash, signature) for the given paths that have one cached
+        signatures = {}
+        for batch_start in range(0, len(paths), DEFAULT_BATCH_SIZE):
+            batch = paths[batch_start:batch_start + DEFAULT_BATCH_SIZE]
+            rows = self.conn.execute(
+                f"SELECT path, size, mtime_ns, content_hash, signature FROM note_signatures WHERE path IN ({', '.join('?' * len(batch))})",
+                batch
+            )
+            for path, size, mtime_ns, content_hash, signature in rows:
+                signatures[path] = (size, mtime_ns, content_hash, bytes(signature))
+        return signatures
+
+    def save_signatures(self, entries: list[tuple[str, int, int, str, bytes]]) -> None:
+        # entries are (path, size, mtime_ns, content_hash, signature)
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO note_signatures (path, size, mtime_ns, content_hash, signature) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    size = excluded.size, mtime_ns = excluded.mtime_ns,
+                    content_hash = excluded.content_hash, signature = excluded.signature
+                """,
+                entries
+            )
+
+    def get_patient_visits(self, first_name: str, last_name: str) -> list[tuple]:
+        # (visit_date, doc_number, kind, path, pain, health) ordered by visit
+        return self.conn.execute(
+            """
+            SELECT n.visit_date, n.doc_number, n.kind, n.path, n.pain, n.health
+            FROM notes n JOIN patients p ON p.id = n.patient_id
+            WHERE p.last_name = ? COLLATE NOCASE AND p.first_name = ? COLLATE NOCASE
+            ORDER BY n.visit_date, n.doc_number
+            """,
+            (last_name, first_name)
+        ).fetchall()
+
+    def get_patient_ratings(self, first_name: str, last_name: str, complaint: str) -> list[tuple]:
+        # (visit_date, rating) for a single complaint ordered by visit
+        return self.conn.execute(
+            """
+            SELECT n.visit_date, r.rating
+            FROM ratings r
+            JOIN notes n ON n.id = r.note_id
+            JOIN patients p ON p.id = n.patient_id
+            WHERE p.last_name = ? COLLATE NOCASE AND p.first_name = ? COLLATE NOCASE AND r.complaint = ?
+            ORDER BY n.visit_date, n.doc_number
+            """,
+            (last_name, first_name, complaint)
+        ).fetchall()
+
+    def get_tender_history(self, first_name: str, last_name: str) -> list[tuple[str | None, int]]:
+        # (visit_date, SpinalLevels bitmask) ordered by visit, 0 for a visit with no tender levels
+        history = {}
+        rows = self.conn.execute(
+            """
+            SELECT n.id, n.visit_date, t.level
+            FROM notes n JOIN patients p ON p.id = n.patient_id
+            LEFT JOIN tender_levels t ON t.note_id = n.id
+            WHERE p.last_name = ? COLLATE NOCASE AND p.first_name = ? COLLATE NOCASE
+            ORDER BY n.visit_date, n.doc_number
+            """,
+            (last_name, first_name)
+        )
+        for note_id, visit_date, level in rows:
+            _, mask = history.get(note_id, (visit_date, 0))
+            if level in LEVEL_BITS:
+                mask |= 1 << LEVEL_BITS[level]
+            history[note_id] = (visit_date, mask)
+        return list(history.values())
+
+    def get_rating_trend(self, complaint: str) -> list[tuple]:
+        # (visit_date, average rating, no. ratings) across every patient, ordered by date
+        return self.conn.execute(
+            """
+            SELECT n.visit_date, AVG(r.rating), COUNT(*)
+            FROM ratings r JOIN notes n ON n.id = r.note_id
+            WHERE r.complaint = ? AND n.visit_date IS NOT NULL
+            GROUP BY n.visit_date
+            ORDER BY n.visit_date
+            """,
+            (complaint,)
+        ).fetchall()
+
+    def get_note_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
@@ -0,0 +1,162 @@
+"""
+NoteSimilarity.py
+
+DESC:
+    Near-duplicate detection for SOAP notes. Each note's section paragraphs are
+    split into word shingles and summarised as a fixed-size MinHash signature, and
+    signatures are bucketed with locality-sensitive hashing (LSH) so a new note is
+    only compared against notes that are likely to be similar instead of the whole
+    chart.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - get_signature(sections) turns a note's paragraphs into a signature,
+      get_note_sections() pulls the paragraphs back out of a written note's plain
+      text.
+    - Add every known note to a SimilarityIndex, then use find_similar() to get the
+      most similar note above the threshold, if any.
+    - Signatures are plain bytes so they can be cached, see NoteIndex.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Similarity is estimated, with 64 hashes the estimate is usually within 0.1
+      of the true Jaccard similarity.
+    - Signatures are stored in native byte order, a cache is not portable between
+      machines with different byte orders.
+
+DEPENDENCIES:
+    - array
+    - hashlib
+    - numpy (optional)
+    - random
+"""
+
+import hashlib, random
+from array import array
+
+try:
+    import numpy as np
+except ImportError: # falls back to the pure Python version, same results
+    np = None
+
+NUM_HASHES = 64
+BANDS = 16 # NUM_HASHES / BANDS rows per band, notes ~0.5 similar or more usually share a bucket
+SHINGLE_SIZE = 5 # words
+DEFAULT_THRESHOLD = 0.8
+
+# order of the sections in a note, and the heading that ends the last one
+SECTION_HEADINGS = ["Subjective Complaint", "Objective", "Assessment", "Plan"]
+END_HEADING = "Today's Treatment"
+
+# fixed so signatures stay comparable between runs
+_rng = random.Random(20260119)
+_MULTIPLIERS = [_rng.getrandbits(64) | 1 for _ in range(NUM_HASHES)]
+_INCREMENTS = [_rng.getrandbits(64) for _ in range(NUM_HASHES)]
+_MASK = (1 << 64) - 1
+_EMPTY = (1 << 32) - 1
+
+if np is not None:
+    _np_multipliers = np.array(_MULTIPLIERS, dtype=np.uint64)
+    _np_increments = np.array(_INCREMENTS, dtype=np.uint64)
+
+def get_shingles(sections: list[str]) -> set[int]:
+    # 64-bit hashes of every run of SHINGLE_SIZE words, shingles never cross sections
+    shingles = set()
+    for idx, section in enumerate(sections):
+        words = section.lower().split()
+        size = min(SHINGLE_SIZE, len(words))
+        for i in range(len(words) - size + 1) if size else ():
+            shingle = f"{idx}|{' '.join(words[i:i + size])}".encode('utf-8')
+            shingles.add(int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'little'))
+    return shingles
+
+
+def get_signature(sections: list[str]) -> bytes:
+    # one 32-bit min hash per hash function (multiply-shift hashing)
+    shingles = get_shingles(sections)
+    if not shingles:
+        return array('I', [_EMPTY] * NUM_HASHES).tobytes()
+
+    if np is not None:
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        with np.errstate(over='ignore'):
+            hashed = (values[:, None] * _np_multipliers + _np_increments) >> np.uint64(32)
+        return hashed.min(axis=0).astype(np.uint32).tobytes()
+
+    return array('I', [
+        min(((value * multiplier + increment) & _MASK) >> 32 for value in shingles)
+        for multiplier, increment in zip(_MULTIPLIERS, _INCREMENTS)
+    ]).tobytes()
+
+
+def estimate_similarity(signature_a: bytes, signature_b: bytes) -> float:
+    # estimated Jaccard similarity of the two notes' shingles, 0.0 - 1.0
+    a = array('I', signature_a)
+    b = array('I', signature_b)
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+def get_note_sections(plain_text: str) -> list[str]:
+    # paragraphs under each of SECTION_HEADINGS in a written note, '' if a section is missing
+    sections = {}
+    current = None
+    for line in plain_text.splitlines():
+        line = line.strip()
+        if line in SECTION_HEADINGS:
+            current = line
+            sections[current] = []
+        elif line == END_HEADING:
+            current = None
+        elif current and line:
+            sections[current].append(line)
+    return [" ".join(sections.get(heading, [])) for heading in SECTION_HEADINGS]
+
+
+class SimilarityIndex:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._signatures: dict[str, bytes] = {}
+        self._buckets: dict[tuple[int, bytes], list[str]] = {} # (band, band bytes) -> keys
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: str, signature: bytes) -> None:
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for band in self._get_bands(signature):
+            self._buckets.setdefault(band, []).append(key)
+
+    def remove(self, key: str) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band in self._get_bands(signature):
+            self._buckets[band].remove(key)
+
+    def find_similar(self, signature: bytes) -> tuple[str | None, float]:
+        # most similar known note at or above the threshold, (None, best score) otherwise
+        candidates = set()
+        for band in self._get_bands(signature):
+            candidates.update(self._buckets.get(band, ()))
+
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            score = estimate_similarity(signature, self._signatures[key])
+            if score > best_score:
+                best_key, best_score = key, score
+        if best_score >= self.threshold:
+            return best_key, best_score
+        return None, best_score
+
+    def _get_bands(self, signature: bytes):
+        width = len(signature) // BANDS
+        for band in range(BANDS):
+            yield band, signature[band * width:(band + 1) * width]
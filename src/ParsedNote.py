@@ -0,0 +1,106 @@
+"""
+ParsedNote.py
+
+DESC:
+    A compact, picklable record of everything extracted from one note or exam. Used
+    to hand parse results back from worker processes without sending Patient objects
+    and nested dicts across the process boundary.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Build from a note record with from_record(), go back with to_record() to store
+      it in the NoteIndex.
+    - Ratings are kept as two parallel fields, complaint names and a bytes object of
+      the 0-10 values in the same order.
+    - Tender levels are a SpinalLevels bitmask, to_record() also lists them by region.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    Cannot set variables after instantiating, the dataclass is frozen. Complaints are
+    stored by name since complaint IDs are not shared between processes.
+
+DEPENDENCIES:
+    - dataclasses
+    - SpinalLevels
+"""
+
+from dataclasses import dataclass
+
+from SpinalLevels import get_region_levels
+
+REGIONS = ("cervical", "thoracic", "lumbar")
+
+@dataclass(frozen=True, slots=True)
+class ParsedNote:
+    path: str
+    kind: str
+    doc_number: int | None
+    visit_date: str | None # ISO format
+    first_name: str
+    last_name: str
+    title: str
+    street: str
+    address: str
+    dob: str # ISO format
+    complaints: tuple[str, ...]
+    ratings: bytes
+    tender_levels: int # SpinalLevels bitmask
+    objective_sentences: tuple[tuple[str, ...], ...] # cervical, thoracic, lumbar
+    treatment: str | None
+
+    @classmethod
+    def from_record(cls, record: dict) -> "ParsedNote":
+        ratings = record["ratings"]
+        return cls(
+            path=record["path"],
+            kind=record["kind"],
+            doc_number=record["doc_number"],
+            visit_date=record["visit_date"],
+            first_name=record["first_name"],
+            last_name=record["last_name"],
+            title=record["title"],
+            street=record["street"],
+            address=record["address"],
+            dob=record["dob"],
+            complaints=tuple(ratings),
+            ratings=bytes(ratings.values()),
+            tender_levels=record["tender_levels"],
+            objective_sentences=tuple(tuple(record["objective_sentences"][region]) for region in REGIONS),
+            treatment=record["treatment"],
+        )
+
+    def to_record(self) -> dict:
+        # same shape as main.collect_note_record()
+        return {
+            "path": self.path,
+            "kind": self.kind,
+            "doc_number": self.doc_number,
+            "visit_date": self.visit_date,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "title": self.title,
+            "street": self.street,
+            "address": self.address,
+            "dob": self.dob,
+            "ratings": dict(zip(self.complaints, self.ratings)),
+            "tender_levels": self.tender_levels,
+            "tender_regions": self.get_tender_regions(),
+            "objective_sentences": {region: list(sentences) for region, sentences in zip(REGIONS, self.objective_sentences)},
+            "treatment": self.treatment,
+        }
+
+    def get_full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    def get_ratings(self) -> dict[str, int]:
+        return dict(zip(self.complaints, self.ratings))
+
+    def get_tender_regions(self) -> dict[str, list[str]]:
+        # region -> tender level names, e.g. {"cervical": ["C3", "C4"], ...}
+        return {region: levels for region, levels in get_region_levels(self.tender_levels).items() if region in REGIONS}
@@ -6,7 +6,7 @@ DESC:
 
 Author: David J. Kim,
 Created: 01-16-2026,
-Modified: 01-16-2026,
+Modified: 10-19-2026,
 Version: 1.0.0
 
 USAGE:
@@ -20,27 +20,30 @@ PLANNED:
     - Add middle name variable.
     
 LIMITATIONS:
-    Cannot set variables after instantiating, at least, you shouldn't. No setters
-    exist yet. Values are not verified before setting, assumes that passed values are
-    valid.
+    Cannot set variables after instantiating, the dataclass is frozen. Values are not
+    verified before setting, assumes that passed values are valid.
 
 DEPENDENCIES:
+    - dataclasses
     - Date
+    - Ratings
 """
 
+from dataclasses import dataclass
+
 from Date import Date
 from Ratings import Ratings
 
+# frozen and slotted, a practice's whole chart history may be held in memory
+@dataclass(frozen=True, slots=True)
 class Patient:
-    def __init__(self, first_name: str, last_name: str, title: str, 
-                 street: str, address: str, birthday: Date, ratings: Ratings):
-        self.first_name = first_name
-        self.last_name = last_name
-        self.title = title
-        self.street = street
-        self.address = address
-        self.birthday = birthday
-        self.ratings = ratings
+    first_name: str
+    last_name: str
+    title: str
+    street: str
+    address: str
+    birthday: Date
+    ratings: Ratings
         
     def get_full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
@@ -0,0 +1,169 @@
+"""
+Profiler.py
+
+DESC:
+    Lightweight stage-level timing. Code is wrapped in named spans which, when
+    profiling is enabled, are collected into a per-run timing tree and optionally a
+    Chrome trace (chrome://tracing, Perfetto).
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Wrap a stage with 'with span("name"):', or a whole function with
+      '@timed("name")'. Spans can be nested, nested spans show up as children in the
+      timing tree.
+    - Call enable() once at startup to start collecting. While disabled, span()
+      returns a shared no-op object, so instrumented code pays for one function call.
+    - get_report() returns the timing tree as text, write_chrome_trace() saves the
+      recorded spans as Chrome trace JSON.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    Spans are only collected in the process that enabled profiling, worker
+    processes are not included.
+
+DEPENDENCIES:
+    - functools
+    - json
+    - os
+    - threading
+    - time
+"""
+
+import functools, json, os, threading, time
+
+enabled = False
+_record_events = False
+_events: list[dict] = []
+_lock = threading.Lock()
+_local = threading.local()
+
+class _Node:
+    __slots__ = ("name", "total", "count", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.total = 0.0
+        self.count = 0
+        self.children: dict[str, "_Node"] = {}
+
+    def get_child(self, name: str) -> "_Node":
+        child = self.children.get(name)
+        if child is None:
+            with _lock:
+                child = self.children.setdefault(name, _Node(name))
+        return child
+
+
+_root = _Node("run")
+
+class _Span:
+    __slots__ = ("node", "parent", "start")
+
+    def __init__(self, name: str):
+        self.parent = _get_current()
+        self.node = self.parent.get_child(name)
+
+    def __enter__(self):
+        _local.current = self.node
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        elapsed = end - self.start
+        with _lock:
+            self.node.total += elapsed
+            self.node.count += 1
+            if _record_events:
+                _events.append({
+                    "name": self.node.name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                    "ts": self.start * 1e6, "dur": elapsed * 1e6,
+                })
+        _local.current = self.parent
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+def span(name: str):
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: str):
+    # decorator version of span(), for timing a whole function
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable(record_events: bool = False) -> None:
+    # record_events keeps every span for write_chrome_trace(), otherwise only totals are kept
+    global enabled, _record_events
+    enabled = True
+    _record_events = record_events
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    global _root
+    with _lock:
+        _root = _Node("run")
+        _events.clear()
+    _local.current = _root
+
+
+def get_report() -> str:
+    lines = [f"{'stage':<48}{'calls':>8}{'total ms':>12}{'avg ms':>10}"]
+    _add_report_lines(_root, 0, lines)
+    return "\n".join(lines)
+
+
+def write_chrome_trace(path: str) -> None:
+    with _lock:
+        events = list(_events)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def _get_current() -> _Node:
+    current = getattr(_local, "current", None)
+    if current is None:
+        current = _local.current = _root
+    return current
+
+
+def _add_report_lines(node: _Node, depth: int, lines: list[str]) -> None:
+    # slowest stages first
+    for child in sorted(node.children.values(), key=lambda child: child.total, reverse=True):
+        name = f"{'  ' * depth}{child.name}"
+        avg = child.total / child.count if child.count else 0.0
+        lines.append(f"{name:<48}{child.count:>8}{child.total * 1000:>12.3f}{avg * 1000:>10.3f}")
+        _add_report_lines(child, depth + 1, lines)
@@ -3,11 +3,12 @@ Ratings.py
 
 DESC:
     A simple class to store a list of complaints and corresponding ratings. Uses
-    a dict to store and link these two categories.
+    an array of interned complaint IDs and a parallel array('b') of ratings to store
+    and link these two categories.
 
 Author: David J. Kim,
 Created: 01-21-2026,
-Modified: 01-23-2026,
+Modified: 10-19-2026,
 Version: 1.0.0
 
 USAGE:
@@ -18,12 +19,20 @@ PLANNED:
     - ...
     
 LIMITATIONS:
-    ...
+    Ratings must be whole numbers from 0 to 10, anything else raises ValueError.
+    main reads health 11, written by older versions, as 10.
 
 DEPENDENCIES:
-    - None
+    - array
+    - Complaints
 """
 
+from array import array
+from Complaints import intern_complaint, get_complaint_name
+
+MIN_RATING = 0
+MAX_RATING = 10
+
 # example dict structure where key is name of complaint and value is rating
 # ratings = {
 #   "Pain": 8,
@@ -41,10 +50,37 @@ DEPENDENCIES:
 # patient.update(new_data), where new_data is a dict
 
 class Ratings:
+    # complaints are stored as interned IDs with a parallel array of ratings,
+    # insertion order is kept the same as the dict it was built from
+    __slots__ = ("_complaint_ids", "_values")
+    
     def __init__(self, rating_dict: dict[str, int]):
         if rating_dict is None:
             rating_dict = {}
-        self.ratings = rating_dict
+        out_of_range = [f"{complaint} ({rating})" for complaint, rating in rating_dict.items() if not MIN_RATING <= rating <= MAX_RATING]
+        if out_of_range:
+            raise ValueError(f"Ratings must be from {MIN_RATING} to {MAX_RATING}, got {', '.join(out_of_range)}")
+        self._complaint_ids = array('H', [intern_complaint(complaint) for complaint in rating_dict])
+        self._values = array('b', rating_dict.values())
         
     def get_ratings(self) -> dict:
-        return self.ratings
\ No newline at end of file
+        # built on request, changes to the returned dict are not stored
+        return {get_complaint_name(complaint_id): value
+                for complaint_id, value in zip(self._complaint_ids, self._values)}
+    
+    @classmethod
+    def from_arrays(cls, complaint_ids: array, values: array) -> "Ratings":
+        # build directly from interned IDs, arrays are copied
+        new_ratings = cls.__new__(cls)
+        new_ratings._complaint_ids = array('H', complaint_ids)
+        new_ratings._values = array('b', values)
+        return new_ratings
+    
+    def get_rating(self, complaint_id: int) -> int:
+        return self._values[self._complaint_ids.index(complaint_id)]
+    
+    def get_complaint_ids(self) -> array:
+        return self._complaint_ids
+    
+    def get_values(self) -> array:
+        return self._values
@@ -0,0 +1,409 @@
+"""
+RenderService.py
+
+DESC:
+    A local HTTP service for AutoSOAP. Unlike the CLI, which starts cold for every
+    fill, the service keeps the parsed previous note of each chart, the keyword
+    matchers and the sentence picker history in memory between requests, so a note
+    preview only costs the generation itself.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    Run from the src directory:
+        python RenderService.py [--root DIR] [--host HOST] [--port N] [--workers N]
+                                [--cache-size N] [--preload DIR ...] [--log-json FILE]
+                                [--clinics FILE] [--clinic NAME]
+    Every endpoint takes and returns JSON, 'directory' is a patient chart directory
+    under --root:
+    - POST /parse    {"directory": ...}
+        the latest SD note of the chart, same shape as a NoteIndex record.
+    - POST /preview  {"directory": ..., "ratings": {"neck": 3}, "seed": 1}
+        the next note's sections as plain text, nothing is written. Complaints
+        left out of 'ratings' keep their current rating, pain and health are
+        derived like a MULTI FILL. 'ratings' and 'seed' are optional, the same
+        seed gives the same preview and previews don't change the phrasings
+        later fills avoid. Add
+        "format": "text" | "md" | "html" (and optionally "date": "2026-01-09") to
+        also get the whole note rendered in that format.
+    - POST /fill     {"directory": ..., "dates": [...] | "schedule": ...,
+                      "final_ratings": {...}, "seed": 1}
+        a MULTI FILL, same fields as a Backfill job. Returns the files written.
+    - GET /metrics   count, errors and p50/p99/max latency (ms) per endpoint.
+    - GET /health
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - main keeps the note being parsed or generated in module globals, so parsing,
+      previews and fills each take a lock. Cached charts, metrics and the HTTP side
+      are served concurrently.
+    - Only meant for localhost, there is no authentication.
+
+DEPENDENCIES:
+    - argparse
+    - collections
+    - concurrent.futures
+    - http.server
+    - json
+    - os
+    - random
+    - threading
+    - time
+    - Backfill
+    - Logger
+    - main
+    - Note
+    - NoteDocument
+    - ParsedNote
+    - Schedule
+    - SentencePicker
+"""
+
+import argparse, json, os, random, threading, time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import main
+import Logger
+from Backfill import render_job
+from Complaints import intern_complaint, is_overall_rating
+from Date import Date
+from Logger import log, job_context, count
+from Note import Note, Sections, reset_note_counter
+from NoteDocument import NoteDocument, render
+from ParsedNote import ParsedNote
+from Patient import Patient
+from Ratings import Ratings, MIN_RATING, MAX_RATING
+from Schedule import ScheduleRule, Scheduler, load_closures
+from SentencePicker import SentencePicker
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 8
+DEFAULT_CACHE_SIZE = 256 # charts kept parsed in memory
+METRIC_WINDOW = 1024 # latencies kept per endpoint for percentiles
+MAX_BODY_BYTES = 1 << 20
+
+PREVIEW_SECTIONS = [
+    ("subjective", Sections.SUBJECTIVE),
+    ("objective", Sections.OBJECTIVE),
+    ("assessment", Sections.ASSESSMENT),
+    ("plan", Sections.PLAN),
+]
+
+class ChartCache:
+    # LRU of the latest SD note per chart directory, an entry is reused while the note file is unchanged
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[tuple, ParsedNote]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, directory: str, stamp: tuple) -> ParsedNote | None:
+        with self._lock:
+            entry = self._entries.get(directory)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(directory)
+            return entry[1]
+
+    def put(self, directory: str, stamp: tuple, note: ParsedNote) -> None:
+        with self._lock:
+            self._entries[directory] = (stamp, note)
+            self._entries.move_to_end(directory)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def record(self, endpoint: str, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {"count": 0, "errors": 0, "latencies": deque(maxlen=METRIC_WINDOW)})
+            stats["count"] += 1
+            stats["errors"] += failed
+            stats["latencies"].append(elapsed * 1000)
+
+    def get_report(self) -> dict:
+        with self._lock:
+            report = {}
+            for endpoint, stats in self._stats.items():
+                latencies = sorted(stats["latencies"])
+                report[endpoint] = {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "p50_ms": round(latencies[len(latencies) // 2], 3),
+                    "p99_ms": round(latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)], 3),
+                    "max_ms": round(latencies[-1], 3),
+                }
+            return report
+
+
+class RenderService:
+    def __init__(self, root: str, cache_size: int = DEFAULT_CACHE_SIZE, scheduler: Scheduler | None = None):
+        self.root = os.path.realpath(root)
+        self.charts = ChartCache(cache_size)
+        self.metrics = EndpointMetrics()
+        self.scheduler = scheduler or Scheduler()
+        self._main_lock = threading.Lock() # main's parse and generate globals
+
+    def get_chart_dir(self, directory: str) -> str:
+        # keep requests inside root, returns the directory with a trailing separator like NOTES_PATH
+        path = os.path.realpath(os.path.join(self.root, directory))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"'{directory}' is outside of the service root")
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"'{directory}' does not exist")
+        return os.path.join(path, "")
+
+    def load_chart(self, directory: str) -> ParsedNote:
+        chart_dir = self.get_chart_dir(directory)
+        with os.scandir(chart_dir) as entries:
+            filenames = [entry.name for entry in entries if entry.is_file()]
+        filename = main.get_previous_note(filenames)
+        if not filename:
+            raise FileNotFoundError("SOAP document does not exist in directory. Must be '.rtf' and have 'SD' in filename")
+
+        path = os.path.join(chart_dir, filename)
+        stat = os.stat(path)
+        stamp = (filename, stat.st_mtime_ns, stat.st_size)
+        note = self.charts.get(chart_dir, stamp)
+        if note is not None:
+            count("cache_hits")
+            return note
+
+        with self._main_lock:
+            result = main.parse_note_chunk([path])[0]
+        if not isinstance(result, ParsedNote):
+            raise ValueError(result[1])
+        self.charts.put(chart_dir, stamp, result)
+        return result
+
+    def parse_chart(self, body: dict) -> dict:
+        return self.load_chart(get_field(body, "directory", str)).to_record()
+
+    def preview_note(self, body: dict) -> dict:
+        note = self.load_chart(get_field(body, "directory", str))
+        patient = get_patient(note)
+        ratings = get_ratings(body.get("ratings") or {}, "ratings")
+        targets = {intern_complaint(name): rating for name, rating in ratings.items()}
+        unknown = [name for name in ratings if intern_complaint(name) not in patient.ratings.get_complaint_ids()]
+        if unknown:
+            raise ValueError(f"{', '.join(unknown)} not in the patient's ratings")
+
+        sorted_sentences = {"tender_levels": note.tender_levels}
+        for region, sentences in zip(("cervical", "thoracic", "lumbar"), note.objective_sentences):
+            sorted_sentences[f"sorted_{region}"] = list(sentences)
+
+        sections = {}
+        with self._main_lock:
+            if "seed" in body:
+                random.seed(body["seed"])
+            for complaint_id, rating in zip(patient.ratings.get_complaint_ids(), patient.ratings.get_values()):
+                if not is_overall_rating(complaint_id):
+                    targets.setdefault(complaint_id, rating)
+            final = main.build_final_ratings(patient.ratings, targets)
+
+            # one step trajectories, the note is generated at the final ratings
+            reset_note_counter()
+            # a picker of its own, a preview neither reads nor changes the history later fills avoid
+            generated = Note(patient, sorted_sentences, [[start, end] for start, end in zip(patient.ratings.get_values(), final)],
+                             picker=SentencePicker(avoid_last=0))
+            for name, section in PREVIEW_SECTIONS:
+                sections[name] = generated.get_paragraph(section.value)
+        sections["treatment"] = note.treatment or ""
+        payload = {"path": note.path, "ratings": dict(zip(note.complaints, final)), "sections": sections}
+
+        if "format" in body:
+            visit = date.fromisoformat(body["date"]) if "date" in body else date.today()
+            document = NoteDocument()
+            main.build_header(document, patient, Date(visit.month, visit.day, visit.year))
+            main.build_sections(document, [sections[name] for name, _ in PREVIEW_SECTIONS], sections["treatment"])
+            document.set_footer(patient.get_full_name(), "Confidential")
+            payload["document"] = render(document, body["format"])
+        return payload
+
+    def fill_range(self, body: dict) -> dict:
+        chart_dir = self.get_chart_dir(get_field(body, "directory", str))
+        if "dates" in body:
+            dates = tuple(date.fromisoformat(day) for day in body["dates"])
+        else:
+            rule = ScheduleRule.parse(get_field(body, "schedule", str))
+            dates = tuple(date.fromordinal(visit.get_ordinal()) for visit in self.scheduler.expand(rule))
+        final_ratings = tuple(get_ratings(get_field(body, "final_ratings"), "final_ratings").items())
+
+        with self._main_lock:
+            written = render_job(chart_dir, dates, final_ratings, body.get("seed"))
+        return {"directory": chart_dir, "written": written}
+
+    def get_health(self, body: dict) -> dict:
+        return {"status": "ok", "charts_cached": len(self.charts)}
+
+    def get_metrics(self, body: dict) -> dict:
+        return {"endpoints": self.metrics.get_report(), "counters": Logger.get_counters()}
+
+
+def get_field(body: dict, name: str, kind: type | None = None):
+    if name not in body:
+        raise ValueError(f"Request is missing '{name}'")
+    if kind and not isinstance(body[name], kind):
+        raise ValueError(f"'{name}' must be a {kind.__name__}")
+    return body[name]
+
+
+def get_ratings(value, name: str) -> dict[str, int]:
+    # complaint name -> rating from a request, every rating a whole number from 0 to 10
+    if not isinstance(value, dict):
+        raise ValueError(f"'{name}' must be an object of complaint name -> rating")
+    ratings = {}
+    for complaint, rating in value.items():
+        # bool is an int, 3.7 and "7" are not truncated or converted
+        if type(rating) is not int or not MIN_RATING <= rating <= MAX_RATING:
+            raise ValueError(f"'{name}': {complaint} must be a whole number from {MIN_RATING} to {MAX_RATING}, got {rating!r}")
+        ratings[complaint] = rating
+    return ratings
+
+
+def get_patient(note: ParsedNote) -> Patient:
+    dob = date.fromisoformat(note.dob)
+    return Patient(note.first_name, note.last_name, note.title, note.street, note.address,
+                   Date(dob.month, dob.day, dob.year), Ratings(note.get_ratings()))
+
+
+# (method, path) -> RenderService method name
+ROUTES = {
+    ("POST", "/parse"): "parse_chart",
+    ("POST", "/preview"): "preview_note",
+    ("POST", "/fill"): "fill_range",
+    ("GET", "/metrics"): "get_metrics",
+    ("GET", "/health"): "get_health",
+}
+
+class RequestHandler(BaseHTTPRequestHandler):
+    server: "PooledHTTPServer"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def log_message(self, format: str, *args) -> None:
+        log.debug("%s - %s", self.address_string(), format % args)
+
+    def _dispatch(self, method: str) -> None:
+        started = time.perf_counter()
+        path = self.path.split("?", 1)[0]
+        name = ROUTES.get((method, path))
+        if name is None:
+            self._send(404, {"error": f"No endpoint {method} {path}"})
+            return
+
+        status = 200
+        with job_context():
+            try:
+                payload = getattr(self.server.service, name)(self._read_body())
+            except FileNotFoundError as e:
+                status, payload = 404, {"error": str(e)}
+            except (ValueError, KeyError, TypeError) as e:
+                status, payload = 400, {"error": str(e)}
+            except Exception as e:
+                log.exception("%s %s failed", method, path)
+                status, payload = 500, {"error": str(e)}
+
+        if status != 200:
+            count("failures")
+        self._send(status, payload)
+        self.server.service.metrics.record(path, time.perf_counter() - started, status != 200)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body is too large")
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class PooledHTTPServer(HTTPServer):
+    # requests are handled on a fixed size thread pool instead of a thread per connection
+    def __init__(self, address: tuple[str, int], service: RenderService, workers: int = DEFAULT_WORKERS):
+        super().__init__(address, RequestHandler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+
+    def process_request(self, request, client_address) -> None:
+        self.pool.submit(self._handle, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+    def _handle(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Serve AutoSOAP parsing, previews and fills over local HTTP.")
+    parser.add_argument("--root", default=main.NOTES_PATH, help="directory every chart directory must be under")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="threads handling requests")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="charts kept parsed in memory")
+    parser.add_argument("--preload", nargs="*", default=[], metavar="DIR", help="chart directories to parse at startup")
+    parser.add_argument("--closures", metavar="FILE", help="clinic closures to skip in /fill schedules")
+    parser.add_argument("--log-json", metavar="FILE", help="also write every log record as a JSON line to FILE")
+    parser.add_argument("--clinics", metavar="FILE", help="clinic profiles, see ClinicProfile.py")
+    parser.add_argument("--clinic", metavar="NAME", help="profile previews and fills are written with")
+    args = parser.parse_args()
+
+    Logger.setup(args.log_json)
+    main.load_clinic(args.clinics, args.clinic)
+    scheduler = Scheduler(load_closures(args.closures) if args.closures else frozenset())
+    service = RenderService(args.root, args.cache_size, scheduler)
+    for directory in args.preload:
+        try:
+            service.load_chart(directory)
+        except (ValueError, OSError) as e:
+            log.error("%s: %s", directory, e)
+
+    server = PooledHTTPServer((args.host, args.port), service, args.workers)
+    log.info("Serving on http://%s:%d/ with %d chart(s) preloaded.", args.host, server.server_port, len(service.charts))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,153 @@
+"""
+RunJournal.py
+
+DESC:
+    A durable journal for Backfill runs, kept in a local SQLite file. It records the
+    planned jobs, the seed each job renders with, the doc_ids reserved for each
+    job's notes and which notes have reached the share, so a run that dies partway
+    through can be resumed and finish with the same notes an uninterrupted run
+    would have written.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Instantiate with a path to the journal file, the schema is created on first
+      use. plan() records a new run, is_planned() tells if the file already holds
+      one and get_entries() returns its jobs for a resume.
+    - Jobs are stored as entries in the same format as a Backfill JOBS file, with
+      the schedule already expanded into dates and the seed always set.
+    - A job moves from 'pending' to 'staged' once reserve() records the previous
+      note it starts from and its first doc_id, then to 'done' or 'failed'.
+      mark_written() records each note as it reaches the share.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Only one process should write to a journal at a time.
+    - Reserved doc_ids are not locked on the share, nothing else should add notes
+      to a chart while its run is unfinished.
+
+DEPENDENCIES:
+    - json
+    - sqlite3
+"""
+
+import json, sqlite3
+
+PENDING = "pending"
+STAGED = "staged" # previous note and doc_ids reserved
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    seed INTEGER NOT NULL,
+    created TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    idx INTEGER PRIMARY KEY,
+    entry TEXT NOT NULL,
+    status TEXT NOT NULL,
+    previous_note TEXT,
+    first_doc_id INTEGER,
+    error TEXT
+);
+
+CREATE TABLE IF NOT EXISTS written (
+    job_idx INTEGER NOT NULL REFERENCES jobs(idx),
+    filename TEXT NOT NULL,
+    PRIMARY KEY (job_idx, filename)
+);
+"""
+
+class RunJournal:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_planned(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM run").fetchone() is not None
+
+    def plan(self, seed: int, entries: list[dict]) -> None:
+        if self.is_planned():
+            raise ValueError(f"{self.path} already holds a run, resume it or remove it first")
+        with self.conn:
+            self.conn.execute("INSERT INTO run (id, seed) VALUES (1, ?)", (seed,))
+            self.conn.executemany(
+                "INSERT INTO jobs (idx, entry, status) VALUES (?, ?, ?)",
+                [(idx, json.dumps(entry), PENDING) for idx, entry in enumerate(entries)]
+            )
+
+    def get_seed(self) -> int:
+        row = self.conn.execute("SELECT seed FROM run").fetchone()
+        if not row:
+            raise ValueError(f"{self.path} does not hold a run")
+        return row[0]
+
+    def get_entries(self) -> list[dict]:
+        return [json.loads(entry) for (entry,) in self.conn.execute("SELECT entry FROM jobs ORDER BY idx")]
+
+    def get_status(self, idx: int) -> str:
+        return self.conn.execute("SELECT status FROM jobs WHERE idx = ?", (idx,)).fetchone()[0]
+
+    def get_counts(self) -> dict[str, int]:
+        # status -> no. jobs
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def reserve(self, idx: int, previous_note: str, first_doc_id: int) -> None:
+        # the job's notes are numbered first_doc_id, first_doc_id + 1, ... on every attempt
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, previous_note = ?, first_doc_id = ?, error = NULL WHERE idx = ?",
+                (STAGED, previous_note, first_doc_id, idx)
+            )
+
+    def get_reservation(self, idx: int) -> tuple[str, int] | None:
+        # (previous note, first doc_id), None until reserve() is called for the job
+        row = self.conn.execute("SELECT previous_note, first_doc_id FROM jobs WHERE idx = ?", (idx,)).fetchone()
+        if not row or row[0] is None:
+            return None
+        return row
+
+    def mark_written(self, idx: int, filename: str) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO written (job_idx, filename) VALUES (?, ?)", (idx, filename))
+
+    def get_written(self, idx: int) -> list[str]:
+        # in doc_id order, the order they were written in
+        filenames = [filename for (filename,) in self.conn.execute("SELECT filename FROM written WHERE job_idx = ?", (idx,))]
+        return sorted(filenames, key=get_doc_id)
+
+    def finish(self, idx: int) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE jobs SET status = ?, error = NULL WHERE idx = ?", (DONE, idx))
+
+    def fail(self, idx: int, error: str) -> None:
+        # the reservation is kept, a resume numbers the job's notes the same way
+        with self.conn:
+            self.conn.execute("UPDATE jobs SET status = ?, error = ? WHERE idx = ?", (FAILED, error, idx))
+
+
+def get_doc_id(filename: str) -> int:
+    # SD_First_Last_12.rtf -> 12
+    stem = filename.rsplit(".", 1)[0]
+    number = stem.rsplit("_", 1)[-1]
+    if not number.isdigit():
+        raise ValueError(f"{filename}: filename is not numbered and/or formatted correctly. Make sure the filename looks like this -> SD_First_Last_2")
+    return int(number)
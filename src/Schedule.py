@@ -0,0 +1,210 @@
+"""
+Schedule.py
+
+DESC:
+    Expands visit schedules written as rules, i.e. 'Mon/Wed/Fri from 1/5 to 3/27,
+    skip clinic closures', into the list of visit dates a multi fill needs, so dates
+    no longer have to be clicked one at a time on a calendar.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - ScheduleRule.parse() reads a rule:
+        <days> from <start> to <end>
+        <days> from <start> for <N> visits
+      optionally followed by 'every <N> weeks' and ', skip closures'. Days are
+      names or 3 letter abbreviations separated by '/' or ',', ranges like Mon-Fri
+      and 'weekdays' also work. Dates are M/D or M/D/YYYY, a missing year is the
+      current one and an end before the start rolls over to the next year.
+    - load_closures() reads a closures file, one date or 'date to date' range per
+      line, '#' starts a comment:
+        12/25/2026 # Christmas
+        12/28/2026 to 1/1/2027
+    - Scheduler(closures).expand(rule) returns the visit Dates, closures are always
+      skipped. expand_many() does a whole batch, patients on the same rule share
+      one expansion.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - A schedule is capped at MAX_SCHEDULE_DAYS, rules that run past it raise
+      a ValueError.
+
+DEPENDENCIES:
+    - dataclasses
+    - datetime
+    - re
+    - Date
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+
+from Date import Date
+
+MAX_SCHEDULE_DAYS = 2 * 366
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+DAY_GROUPS = {
+    "weekdays": (0, 1, 2, 3, 4),
+    "daily": (0, 1, 2, 3, 4, 5, 6),
+}
+
+DATE_PATTERN = r"\d{1,2}/\d{1,2}(?:/\d{2,4})?|\d{4}-\d{2}-\d{2}"
+RULE_PATTERN = re.compile(
+    rf"^(?P<days>.+?)\s+from\s+(?P<start>{DATE_PATTERN})\s+"
+    rf"(?:to\s+(?P<end>{DATE_PATTERN})|for\s+(?P<visits>\d+)\s+visits?)"
+    r"(?:\s+every\s+(?P<weeks>\d+)\s+weeks?)?"
+    r"(?:\s*,?\s*skip\s+(?:clinic\s+)?closures)?\s*$",
+    re.IGNORECASE
+)
+
+@dataclass(frozen=True, slots=True)
+class ScheduleRule:
+    weekdays: tuple[int, ...] # 0 is Monday
+    start: int # date ordinals
+    end: int | None = None
+    visits: int | None = None
+    every_weeks: int = 1
+
+    @classmethod
+    def parse(cls, text: str, year: int | None = None) -> "ScheduleRule":
+        match = RULE_PATTERN.match(text.strip())
+        if not match:
+            raise ValueError(f"'{text}' is not a valid schedule, expected i.e. 'Mon/Wed/Fri from 1/5 to 3/27'")
+
+        year = year or date.today().year
+        start = parse_date(match.group("start"), year)
+        end = None
+        if match.group("end"):
+            # an end without a year is in the start's year, or the next one if that is before the start
+            start_year = date.fromordinal(start).year
+            end = parse_date(match.group("end"), start_year)
+            if end < start and not _has_year(match.group("end")):
+                end = parse_date(match.group("end"), start_year + 1)
+            if end < start:
+                raise ValueError(f"'{text}' ends before it starts")
+
+        visits = int(match.group("visits")) if match.group("visits") else None
+        every_weeks = int(match.group("weeks") or 1)
+        if visits == 0 or every_weeks == 0:
+            raise ValueError(f"'{text}' never has a visit")
+        return cls(parse_weekdays(match.group("days")), start, end, visits, every_weeks)
+
+
+def parse_weekdays(text: str) -> tuple[int, ...]:
+    weekdays = set()
+    for token in re.split(r"\s*[/,]\s*|\s+and\s+", text.strip().lower()):
+        if token in DAY_GROUPS:
+            weekdays.update(DAY_GROUPS[token])
+            continue
+        first, sep, last = token.partition("-")
+        first_idx = _get_weekday(first)
+        if sep:
+            last_idx = _get_weekday(last)
+            # Fri-Mon wraps around the weekend
+            weekdays.update((first_idx + i) % 7 for i in range((last_idx - first_idx) % 7 + 1))
+        else:
+            weekdays.add(first_idx)
+    return tuple(sorted(weekdays))
+
+
+def parse_date(text: str, year: int) -> int:
+    # M/D, M/D/YY, M/D/YYYY or YYYY-MM-DD to a date ordinal
+    text = text.strip()
+    try:
+        if "-" in text:
+            return date.fromisoformat(text).toordinal()
+        parts = [int(part) for part in text.split("/")]
+        if len(parts) == 3:
+            month, day, year = parts
+            if year < 100:
+                year += 2000
+        else:
+            month, day = parts
+    except ValueError:
+        raise ValueError(f"'{text}' is not a valid date")
+
+    ordinal = Date(month, day, year).get_ordinal()
+    if ordinal == -1:
+        raise ValueError(f"'{text}' is not a valid date")
+    return ordinal
+
+
+def load_closures(path: str) -> frozenset[int]:
+    # returns the ordinal of every closed day
+    closures = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            first, sep, last = line.partition(" to ")
+            try:
+                start = parse_date(first, date.today().year)
+                end = parse_date(last, date.today().year) if sep else start
+            except ValueError as e:
+                raise ValueError(f"{path}, line {line_no}: {e}")
+            if end < start:
+                raise ValueError(f"{path}, line {line_no}: range ends before it starts")
+            closures.update(range(start, end + 1))
+    return frozenset(closures)
+
+
+class Scheduler:
+    def __init__(self, closures: frozenset[int] = frozenset()):
+        self.closures = closures
+        self._cache: dict[ScheduleRule, tuple[int, ...]] = {}
+
+    def expand(self, rule: ScheduleRule) -> list[Date]:
+        ordinals = self._cache.get(rule)
+        if ordinals is None:
+            ordinals = self._cache[rule] = self._expand_ordinals(rule)
+        # Dates can be changed in place, every call gets its own
+        return [Date.from_ordinal(ordinal) for ordinal in ordinals]
+
+    def expand_many(self, rules: list[ScheduleRule]) -> list[list[Date]]:
+        return [self.expand(rule) for rule in rules]
+
+    def _expand_ordinals(self, rule: ScheduleRule) -> tuple[int, ...]:
+        # walk week by week from the Monday of the start week, ordinal 1 is a Monday
+        limit = rule.start + MAX_SCHEDULE_DAYS
+        if rule.end is not None and rule.end > limit:
+            raise ValueError(f"Schedules can be at most {MAX_SCHEDULE_DAYS} days long")
+        last = rule.end if rule.end is not None else limit
+
+        visits = []
+        week = rule.start - (rule.start - 1) % 7
+        while week <= last:
+            for weekday in rule.weekdays:
+                ordinal = week + weekday
+                if ordinal > last:
+                    break
+                if ordinal < rule.start or ordinal in self.closures:
+                    continue
+                visits.append(ordinal)
+                if len(visits) == rule.visits:
+                    return tuple(visits)
+            week += 7 * rule.every_weeks
+
+        if rule.visits is not None:
+            raise ValueError(f"Could not fit {rule.visits} visits in {MAX_SCHEDULE_DAYS} days")
+        return tuple(visits)
+
+
+def _get_weekday(token: str) -> int:
+    token = token.strip()
+    if len(token) >= 2:
+        for idx, name in enumerate(WEEKDAYS):
+            if name.startswith(token):
+                return idx
+    raise ValueError(f"'{token}' is not a day of the week")
+
+
+def _has_year(text: str) -> bool:
+    return text.count("/") == 2 or "-" in text
@@ -0,0 +1,226 @@
+"""
+SentencePicker.py
+
+DESC:
+    Picks sentences out of the sentence banks used to write notes. Each bank gets a
+    precomputed alias table so weighted picks cost the same as uniform ones, the
+    random bits for a whole note are drawn in one call, and the phrasings used in a
+    patient's last few notes are avoided so back-filled notes read less alike.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Call begin_note() once per note with the patient it is for, then choose() for
+      every pick, passing the bank's name and its sentences.
+    - Banks are uniform unless given weights with set_weights() (or BANK_WEIGHTS),
+      weights line up with the bank's sentences.
+    - avoid_last is how many of a patient's previous notes are remembered, a pick
+      skips what those notes and the current one already used from the bank. Banks
+      with too few sentences avoid as many as they can, the oldest picks are let go
+      first.
+    - Uniform banks pick from the sentences left in one draw, the allowed indices
+      for each (bank, avoided) are cached.
+    - Randomness comes from the random module, so random.seed() still makes notes
+      reproducible.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - History is kept in memory for the last max_patients patients, it is not
+      shared with worker processes.
+    - A note's picks join the history when the next note begins.
+    - Tables are cached by bank name, banks with the same name must have the same
+      layout.
+
+DEPENDENCIES:
+    - array
+    - collections
+    - random
+"""
+
+import random
+from array import array
+from collections import OrderedDict, deque
+
+DEFAULT_AVOID_LAST = 2 # notes
+DEFAULT_MAX_PATIENTS = 1024 # patients whose history is kept, least recently used are dropped first
+DRAWS_PER_NOTE = 32 # picks drawn up front per note, about what a note with every region makes
+MAX_REDRAWS = 8 # alias draws before falling back to a scan over the allowed sentences
+MAX_ALLOWED_CACHE = 4096 # cached (bank, avoided) -> allowed indices, cleared when full
+HALF_BITS = 32
+HALF_MASK = (1 << HALF_BITS) - 1
+
+# optional weights per bank name, i.e. {"plan_sentences": [2, 1, 1]}
+BANK_WEIGHTS: dict[str, list[float]] = {}
+
+class AliasTable:
+    # Vose's alias method, one random index and one coin flip per pick
+    __slots__ = ("size", "thresholds", "aliases", "weights", "uniform")
+
+    def __init__(self, weights: list[float]):
+        if not weights or min(weights) < 0 or sum(weights) <= 0:
+            raise ValueError("Weights must be non-negative and not all zero")
+
+        size = len(weights)
+        total = sum(weights)
+        scaled = [weight * size / total for weight in weights]
+        thresholds = [0] * size
+        aliases = list(range(size))
+
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            thresholds[less] = int(scaled[less] * (1 << HALF_BITS))
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        for i in small + large: # leftovers are 1.0 give or take rounding
+            thresholds[i] = 1 << HALF_BITS
+
+        self.size = size
+        self.thresholds = thresholds
+        self.aliases = aliases
+        self.weights = list(weights)
+        self.uniform = len(set(weights)) == 1 # plain scaling, no alias lookup needed
+
+    def pick(self, index_word: int, coin_word: int) -> int:
+        # both words are uniform HALF_BITS-bit ints, SentencePicker inlines this
+        idx = (index_word * self.size) >> HALF_BITS
+        return idx if coin_word < self.thresholds[idx] else self.aliases[idx]
+
+
+class SentencePicker:
+    def __init__(self, avoid_last: int = DEFAULT_AVOID_LAST, weights: dict[str, list[float]] | None = None,
+                 max_patients: int = DEFAULT_MAX_PATIENTS):
+        self.avoid_last = avoid_last
+        self.max_patients = max_patients
+        self.weights = dict(BANK_WEIGHTS if weights is None else weights)
+        self._tables: dict[str, AliasTable] = {}
+        self._history: OrderedDict[str, tuple[deque, dict[str, int]]] = OrderedDict() # patient -> (picks of their last notes, merged), least recently used first
+        self._recent: dict[str, int] = {} # bank -> bitmask of the indices picked in the current patient's last notes
+        self._patient_key: str | None = None
+        self._picks: dict[str, int] = {} # bank -> bitmask of the indices picked in the current note
+        self._allowed: dict[tuple[AliasTable, int, int], tuple[int, ...]] = {} # (table, recent, picks) -> indices of a uniform bank left to pick
+        self._words = array('Q')
+
+    def set_weights(self, bank_name: str, weights: list[float]) -> None:
+        self.weights[bank_name] = list(weights)
+        self._tables.pop(bank_name, None)
+
+    def begin_note(self, patient_key: str) -> None:
+        # the previous note's picks go into its patient's history, one RNG call covers every pick of a typical note
+        self._end_note()
+        self._patient_key = patient_key
+        entry = self._history.get(patient_key)
+        self._recent = entry[1] if entry else {}
+        self._refill()
+
+    def choose(self, bank_name: str, bank) -> str:
+        table = self._tables.get(bank_name)
+        if table is None or table.size != len(bank):
+            table = self._tables[bank_name] = self._make_table(bank_name, len(bank))
+        try:
+            word = self._words.pop()
+        except IndexError:
+            word = self._next_word()
+
+        # sentences picked earlier in this note or in the patient's last notes are avoided
+        picks = self._picks.get(bank_name, 0)
+        recent = self._recent.get(bank_name, 0)
+        if table.uniform:
+            # one draw over the sentences left, no redraws
+            allowed = self._allowed.get((table, recent, picks))
+            if allowed is None:
+                allowed = self._get_allowed(table, recent, picks)
+            idx = allowed[(word * len(allowed)) >> 64]
+        else:
+            idx = self._pick_weighted(table, word, self._get_avoided(table, recent, picks))
+        self._picks[bank_name] = picks | (1 << idx)
+        return bank[idx]
+
+    def choose_index(self, bank_name: str, size: int) -> int:
+        return self.choose(bank_name, range(size))
+
+    def reset_history(self) -> None:
+        self._history.clear()
+        self._recent = {}
+        self._patient_key = None
+        self._picks = {}
+
+    def _end_note(self) -> None:
+        picks, self._picks = self._picks, {}
+        if self._patient_key is None or not self.avoid_last or not picks:
+            return
+
+        # (picks of the last avoid_last notes, bank -> every index they picked)
+        entry = self._history.get(self._patient_key)
+        notes = entry[0] if entry and entry[0].maxlen == self.avoid_last else deque(maxlen=self.avoid_last)
+        notes.append(picks)
+        recent = dict(picks)
+        for idx in range(len(notes) - 1):
+            for bank_name, mask in notes[idx].items():
+                recent[bank_name] = recent.get(bank_name, 0) | mask
+        self._history[self._patient_key] = (notes, recent)
+        self._history.move_to_end(self._patient_key)
+        while len(self._history) > self.max_patients:
+            self._history.popitem(last=False)
+
+    def _make_table(self, bank_name: str, size: int) -> AliasTable:
+        weights = self.weights.get(bank_name)
+        if weights is None or len(weights) != size:
+            weights = [1.0] * size
+        return AliasTable(weights)
+
+    def _get_avoided(self, table: AliasTable, recent: int, picks: int) -> int:
+        # never avoid the whole bank, the last notes' picks are let go first, then this note's
+        if not self.avoid_last:
+            return 0
+        full = (1 << table.size) - 1
+        for avoided in (recent | picks, picks):
+            if avoided & full != full:
+                return avoided
+        return 0
+
+    def _get_allowed(self, table: AliasTable, recent: int, picks: int) -> tuple[int, ...]:
+        # indices of a uniform bank that can be picked, cached by (table, recent, picks)
+        if len(self._allowed) >= MAX_ALLOWED_CACHE:
+            self._allowed.clear()
+        avoided = self._get_avoided(table, recent, picks)
+        allowed = self._allowed[(table, recent, picks)] = tuple(i for i in range(table.size) if not avoided >> i & 1)
+        return allowed
+
+    def _pick_weighted(self, table: AliasTable, word: int, avoided: int) -> int:
+        # alias draws until one isn't avoided, then a weighted scan over the allowed sentences
+        for _ in range(MAX_REDRAWS):
+            idx = table.pick(word & HALF_MASK, word >> HALF_BITS)
+            if not avoided >> idx & 1:
+                return idx
+            word = self._words.pop() if self._words else self._next_word()
+        return self._pick_allowed(table, avoided)
+
+    def _pick_allowed(self, table: AliasTable, avoided: int) -> int:
+        # weighted pick over the sentences whose bit is not set in avoided
+        allowed = [(i, weight) for i, weight in enumerate(table.weights) if not avoided >> i & 1 and weight > 0]
+        if not allowed:
+            allowed = [(i, weight) for i, weight in enumerate(table.weights) if weight > 0]
+        word = self._words.pop() if self._words else self._next_word()
+        target = word / (1 << 64) * sum(weight for _, weight in allowed)
+        for i, weight in allowed:
+            target -= weight
+            if target < 0:
+                return i
+        return allowed[-1][0]
+
+    def _next_word(self) -> int:
+        self._refill()
+        return self._words.pop()
+
+    def _refill(self) -> None:
+        # split one big draw into 64-bit words
+        self._words = array('Q', random.getrandbits(DRAWS_PER_NOTE * 64).to_bytes(DRAWS_PER_NOTE * 8, 'little'))
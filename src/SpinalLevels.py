@@ -0,0 +1,182 @@
+"""
+SpinalLevels.py
+
+DESC:
+    Tender spinal levels as a bitmask, one bit per level from C1 to S5 in spinal
+    order. Levels are read from text in one regex pass, including ranges like
+    'C3-C6', compared with plain bit operations, and written back as prose with
+    runs collapsed into ranges.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - parse_levels("tenderness at C3-C5, T2 and T4") returns the mask of every level
+      mentioned. Masks combine with |, & and ~, REGION_MASKS has one per region.
+    - Levels outside the tables (i.e. 'C8') are logged and left out of the mask,
+      pass a list as parse_levels(text, unknown) to collect their names.
+      get_level_region() tells which region such a name belongs to.
+    - format_levels(mask) -> 'C3-C5, T2 and T4', runs of MIN_RANGE or more levels
+      in the same region are collapsed. Names in extra are listed after them, an
+      empty mask with no extra is ''.
+    - get_levels(mask) lists the level names, get_region_levels(mask) groups them
+      by region.
+    - get_changes(previous, current) returns the (added, removed) masks between two
+      visits. For a whole chart, to_matrix() and count_levels() work on an array of
+      masks at once with numpy.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Levels outside C1-C7, T1-T12, L1-L5 and S1-S5 have no bit, they are kept by
+      name only.
+    - to_matrix(), count_levels() and get_change_masks() need numpy.
+
+DEPENDENCIES:
+    - functools
+    - re
+    - numpy (optional, only for chart history queries)
+    - Logger
+    - TextFormat
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError: # checked when a history query is made
+    np = None
+
+from Logger import log
+from TextFormat import format_list
+
+# region -> (prefix, no. levels), in spinal order
+REGION_SIZES = {
+    "cervical": ("C", 7),
+    "thoracic": ("T", 12),
+    "lumbar": ("L", 5),
+    "sacral": ("S", 5),
+}
+REGIONS = list(REGION_SIZES)
+
+LEVELS = [f"{prefix}{number}" for prefix, size in REGION_SIZES.values() for number in range(1, size + 1)]
+LEVEL_BITS = {level: bit for bit, level in enumerate(LEVELS)}
+LEVEL_REGIONS = [region for region, (_, size) in REGION_SIZES.items() for _ in range(size)]
+PREFIX_REGIONS = {prefix: region for region, (prefix, _) in REGION_SIZES.items()}
+
+REGION_MASKS = {}
+_first = 0
+for _region, (_, _size) in REGION_SIZES.items():
+    REGION_MASKS[_region] = ((1 << _size) - 1) << _first
+    _first += _size
+
+CERVICAL = REGION_MASKS["cervical"]
+THORACIC = REGION_MASKS["thoracic"]
+LUMBAR = REGION_MASKS["lumbar"]
+SACRAL = REGION_MASKS["sacral"]
+ALL_LEVELS = (1 << len(LEVELS)) - 1
+
+MIN_RANGE = 3 # consecutive levels written as 'C3-C5' instead of 'C3, C4 and C5'
+
+# 'C3', 'c3', 'C3-C6', 'C3-6', 'C3 to C6', 'L5-S1'
+LEVEL_PATTERN = re.compile(
+    r"\b(?P<prefix>[CTLS])(?P<number>\d{1,2})"
+    r"(?:\s*(?:-|–|to|through)\s*(?P<end_prefix>[CTLS])?(?P<end_number>\d{1,2}))?\b",
+    re.IGNORECASE
+)
+
+def parse_levels(text: str, unknown: list[str] | None = None) -> int:
+    # levels outside the tables are logged and appended to unknown if given, a range is only filled between known ends
+    mask = 0
+    for match in LEVEL_PATTERN.finditer(text):
+        prefix = match.group("prefix").upper()
+        ends = [f"{prefix}{int(match.group('number'))}"]
+        if match.group("end_number"):
+            ends.append(f"{(match.group('end_prefix') or prefix).upper()}{int(match.group('end_number'))}")
+
+        bits = []
+        for level in ends:
+            if level in LEVEL_BITS:
+                bits.append(LEVEL_BITS[level])
+                continue
+            log.warning("Unknown spinal level %s in '%s', it has no bit.", level, match.group(0))
+            if unknown is not None and level not in unknown:
+                unknown.append(level)
+        if bits:
+            low, high = min(bits), max(bits)
+            mask |= ((1 << (high + 1)) - 1) ^ ((1 << low) - 1)
+    return mask
+
+
+def get_level_region(level: str) -> str:
+    # region of a level name by its prefix, known level or not
+    return PREFIX_REGIONS[level[0].upper()]
+
+
+def get_levels(mask: int) -> list[str]:
+    return [level for bit, level in enumerate(LEVELS) if mask >> bit & 1]
+
+
+def get_region_levels(mask: int) -> dict[str, list[str]]:
+    return {region: get_levels(mask & region_mask) for region, region_mask in REGION_MASKS.items()}
+
+
+def get_ranges(mask: int) -> list[str]:
+    # runs never cross into the next region
+    items = []
+    bit = 0
+    while bit < len(LEVELS):
+        if not mask >> bit & 1:
+            bit += 1
+            continue
+        end = bit
+        while end + 1 < len(LEVELS) and mask >> (end + 1) & 1 and LEVEL_REGIONS[end + 1] == LEVEL_REGIONS[bit]:
+            end += 1
+        if end - bit + 1 >= MIN_RANGE:
+            items.append(f"{LEVELS[bit]}-{LEVELS[end]}")
+        else:
+            items.extend(LEVELS[bit:end + 1])
+        bit = end + 1
+    return items
+
+
+@lru_cache(maxsize=1024)
+def format_levels(mask: int, has_period: bool = False, extra: tuple[str, ...] = ()) -> str:
+    # a chart repeats the same few masks, so each is only formatted once
+    if not mask and not extra:
+        return ""
+    return format_list(get_ranges(mask) + list(extra), has_period=has_period)
+
+
+def get_changes(previous: int, current: int) -> tuple[int, int]:
+    # (levels that became tender, levels that stopped being tender)
+    return current & ~previous, previous & ~current
+
+
+def _check_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for chart history queries")
+
+
+def to_matrix(masks: list[int]):
+    # (visits x levels) bool array, column i is LEVELS[i]
+    _check_numpy()
+    masks = np.asarray(masks, dtype=np.uint32)
+    return (masks[:, None] >> np.arange(len(LEVELS), dtype=np.uint32) & 1).astype(bool)
+
+
+def count_levels(masks: list[int]) -> dict[str, int]:
+    # level -> no. visits it was tender at, levels never tender are left out
+    counts = to_matrix(masks).sum(axis=0)
+    return {level: int(count) for level, count in zip(LEVELS, counts) if count}
+
+
+def get_change_masks(masks: list[int]):
+    # masks of the levels that changed between each visit and the one before it
+    _check_numpy()
+    masks = np.asarray(masks, dtype=np.uint32)
+    return masks[1:] ^ masks[:-1]
@@ -0,0 +1,179 @@
+"""
+SyntheticChart.py
+
+DESC:
+    Generates deterministic, fake SD notes in .rtf format for benchmarking and
+    testing the parser and note generator without real patient data.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Instantiate with a seed, then call write_chart() to write a numbered series of
+      notes for one patient, or get_variants() to get one note per combination of
+      complaint count (1-8) and spinal regions (every non-empty mix of cervical,
+      thoracic and lumbar).
+    - The same seed always produces the same files.
+
+PLANNED:
+    - Generate exams (EI, EN, EF) as well.
+
+LIMITATIONS:
+    Notes only use the wording that the current parser understands, they are not
+    meant to cover every legacy phrasing.
+
+DEPENDENCIES:
+    - itertools
+    - os
+    - random
+"""
+
+import os, random
+from itertools import product
+
+# complaint names are picked so that none contain 'his', 'her' or 'and', which the
+# rating sentence parser treats as separators
+COMPLAINTS = ["headache", "neck", "upper back", "mid back", "lower back", "left shoulder", "right knee", "jaw"]
+
+FIRST_NAMES = ["John", "Maria", "David", "Grace", "Tomas", "Ana", "Kevin", "Lucy"]
+LAST_NAMES = ["Doe", "Park", "Nguyen", "Silva", "Reed", "Olsen", "Costa", "Ito"]
+TITLES = ["Mr.", "Ms.", "Mrs."]
+STREETS = ["Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln"]
+CITIES = ["Seattle, WA 98101", "Lynnwood, WA 98037", "Everett, WA 98201", "Bothell, WA 98011"]
+
+# every non-empty combination of (cervical, thoracic, lumbar)
+REGION_COMBINATIONS = [combo for combo in product([False, True], repeat=3) if any(combo)]
+
+REGION_LEVELS = {
+    "cervical": ("C", 7),
+    "thoracic": ("T", 12),
+    "lumbar": ("L", 5),
+}
+
+REGION_MUSCLES = {
+    "cervical": ["suboccipitals", "upper trapezius", "levator scapulae", "scalenes"],
+    "thoracic": ["rhomboids", "middle trapezius", "thoracic paraspinals"],
+    "lumbar": ["quadratus lumborum", "lumbar paraspinals", "gluteus medius"],
+}
+
+RTF_PROLOGUE = (
+    "{\\rtf1\\ansi\\ansicpg1252\\deff0"
+    "{\\fonttbl{\\f0 Times New Roman;}{\\f4 Calibri;}}"
+    "{\\stylesheet{\\s21 Normal;}{\\s25 Title;}{\\s26 Clinic;}{\\s27 Patient;}{\\s28 Heading;}}"
+    "{\\info{\\title 'AutoSOAP' by dkim03}}\n"
+)
+
+class SyntheticChart:
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def get_variants(self) -> list[tuple[int, tuple[bool, bool, bool]]]:
+        # (no. complaints, (cervical, thoracic, lumbar)) for every supported combination
+        return [(count, combo) for count in range(1, len(COMPLAINTS) + 1) for combo in REGION_COMBINATIONS]
+
+    def get_patient_name(self, patient_idx: int) -> tuple[str, str]:
+        first = FIRST_NAMES[patient_idx % len(FIRST_NAMES)]
+        last = LAST_NAMES[(patient_idx // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        if patient_idx >= len(FIRST_NAMES) * len(LAST_NAMES):
+            last = f"{last}{patient_idx}" # keep names unique for big practices
+        return first, last
+
+    def make_note(self, note_idx: int, complaint_count: int, regions: tuple[bool, bool, bool], patient_idx: int = 0) -> str:
+        # returns the .rtf text of a single note, fully determined by the seed and args
+        rng = random.Random(f"{self.seed}:{patient_idx}:{note_idx}:{complaint_count}:{regions}")
+        patient_rng = random.Random(f"{self.seed}:{patient_idx}")
+
+        first, last = self.get_patient_name(patient_idx)
+        title = TITLES[patient_idx % len(TITLES)]
+        pronoun = "he" if title == "Mr." else "she"
+        possessive = "his" if title == "Mr." else "her"
+        street = f"{patient_rng.randint(100, 9999)} {patient_rng.choice(STREETS)}"
+        address = patient_rng.choice(CITIES)
+        dob = f"{patient_rng.randint(1, 12)}/{patient_rng.randint(1, 28)}/{patient_rng.randint(1940, 2005)}"
+        visit = f"{1 + note_idx // 28 % 12}/{1 + note_idx % 28}/2026"
+
+        complaints = COMPLAINTS[:complaint_count]
+        ratings = [rng.randint(1, 9) for _ in complaints]
+        pain = rng.randint(1, 9)
+        health = rng.randint(1, 9)
+
+        rating_pairs = [f"{complaint} as a {rating}" for complaint, rating in zip(complaints, ratings)]
+        if len(rating_pairs) > 1:
+            rating_list = ", ".join(rating_pairs[:-1]) + " and " + rating_pairs[-1]
+        else:
+            rating_list = rating_pairs[0]
+
+        subjective = (
+            f"{title} {last} was evaluated today for progress and response to treatment. "
+            f"The patient's subjective response to a question regarding pain levels: "
+            f"Overall pain level today on a scale of 0 (no pain) to 10 (excruciating pain) is considered a {pain}. "
+            f"Overall health on a scale of 1 to 10 is rated as {health}. "
+            f"On a scale of 0 to 10 with 10 being the worst, {pronoun} rated {possessive} {rating_list}."
+        )
+
+        objective_sentences = []
+        for region, present in zip(["cervical", "thoracic", "lumbar"], regions):
+            if not present:
+                continue
+            prefix, count = REGION_LEVELS[region]
+            first_level = rng.randint(1, count)
+            last_level = rng.randint(first_level, min(count, first_level + 3))
+            levels = [f"{prefix}{level}" for level in range(first_level, last_level + 1)]
+            if len(levels) > 1:
+                level_list = ", ".join(levels[:-1]) + " and " + levels[-1]
+            else:
+                level_list = levels[0]
+            muscles = rng.sample(REGION_MUSCLES[region], 2)
+
+            objective_sentences.append(f"Palpation of the {region} spine displayed tenderness in the spinous process at: {level_list}.")
+            objective_sentences.append(f"Palpation of the {region} musculature demonstrates hypertonicity in the {muscles[0]}.")
+            objective_sentences.append(f"Myofascial trigger points are present in the {muscles[1]}.")
+            if rng.random() < 0.8:
+                objective_sentences.append(f"The {region} range of motion has decreased.")
+            if rng.random() < 0.5:
+                objective_sentences.append("The patient complained of pain during testing.")
+
+        paragraphs = [
+            ("s26", "Back to Wellness"),
+            ("s26", "4629 168th St SW Ste B"),
+            ("s26", "Lynnwood, WA 98037"),
+            ("s26", "425-741-0600"),
+            ("s26", "Doctor: Sungjun Jung"),
+            ("s27", f"{first} {last}"),
+            ("s27", street),
+            ("s27", address),
+            ("s27", f"Date of Birth: {dob}"),
+            ("s25", "AutoSOAP Notes"),
+            ("s28", visit),
+            ("s28", "Subjective Complaint"),
+            ("s21", subjective),
+            ("s28", "Objective"),
+            ("s21", " ".join(objective_sentences)),
+            ("s28", "Assessment"),
+            ("s21", "The patient's overall status has mildly improved since the last visit."),
+            ("s28", "Plan"),
+            ("s21", "Proceed with therapies as directed."),
+            ("s28", "Today's Treatment"),
+            ("s21", "Spinal manipulation. Electrical muscle stimulation for 15 minutes."),
+        ]
+
+        body = "".join(f"{{\\pard \\{style}\\ql\\f4\\fs22\\lang1033 {text}\\par}}\n" for style, text in paragraphs)
+        return f"{RTF_PROLOGUE}{body}}}"
+
+    def write_chart(self, directory: str, note_count: int, patient_idx: int = 0) -> list[str]:
+        # writes SD_First_Last_1 ... SD_First_Last_N, cycling through every variant, returns filenames
+        variants = self.get_variants()
+        first, last = self.get_patient_name(patient_idx)
+        filenames = []
+        for note_idx in range(note_count):
+            complaint_count, regions = variants[note_idx % len(variants)]
+            text = self.make_note(note_idx, complaint_count, regions, patient_idx)
+
+            filename = f"SD_{first}_{last}_{note_idx + 1}.rtf"
+            with open(os.path.join(directory, filename), 'w', encoding='cp1252') as f:
+                f.write(text)
+            filenames.append(filename)
+
+        return filenames
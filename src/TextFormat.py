@@ -0,0 +1,36 @@
+"""
+TextFormat.py
+
+DESC:
+    Small text helpers shared by the note generators, i.e. turning a list of items
+    into plain English ('a, b and c').
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - format_list(["neck", "upper back", "lower back"]) -> 'neck, upper back and lower back'
+    - Pass has_period=True to end the list with a period.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    No Oxford comma.
+
+DEPENDENCIES:
+    - None
+"""
+
+def format_list(items: list[str], has_period: bool = False, conjunction: str = "and") -> str:
+    # 'a' -> 'a', 'a, b' -> 'a and b', 'a, b, c' -> 'a, b and c'
+    if not items:
+        raise ValueError("input_list is None")
+
+    if len(items) == 1:
+        text = str(items[0])
+    else:
+        text = f"{', '.join(map(str, items[:-1]))} {conjunction} {items[-1]}"
+    return f"{text}." if has_period else text
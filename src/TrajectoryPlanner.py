@@ -0,0 +1,189 @@
+"""
+TrajectoryPlanner.py
+
+DESC:
+    Plans the rating trajectories for a whole batch of patients at once. Every
+    patient's ratings, targets and visit counts are packed into padded numpy arrays
+    and the staircase walk of main.get_guaranteed_staircase_path() is run one step
+    at a time across every patient and complaint together, with overall pain and
+    health derived the same way as main.build_final_ratings().
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    - Build one PlanRequest per patient with their current Ratings, a final target
+      per complaint (complaint ID -> rating, pain and health are left out) and the
+      no. visits to fill, then call TrajectoryPlanner(seed).plan(requests).
+    - TrajectoryPlan.get_patient(i) returns patient i's trajectories as a
+      (complaints x visits + 1) view into the batch array, one row per rating in the
+      same order as their Ratings, starting with the current rating. Pass it to
+      main.run_multi_fill(..., trajectories=view).
+    - Padding past a patient's complaints or visits is PAD.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Uses numpy's random generator, the same seed gives different trajectories
+      than get_guaranteed_staircase_path() under random.seed(), the walk follows the
+      same rules.
+    - Views share memory with the batch, copy one before changing it.
+
+DEPENDENCIES:
+    - dataclasses
+    - numpy
+    - Complaints
+    - Ratings
+"""
+
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError: # checked when a planner is made
+    np = None
+
+from Complaints import PAIN_ID, HEALTH_ID, get_complaint_name, is_overall_rating
+from Ratings import Ratings
+
+RATING_CEILING = 10
+PAD = -1
+
+# same walk as main.get_guaranteed_staircase_path()
+UP_CHANCE = 0.1
+DOWN_CHANCE = 0.9
+DOWN_DECAY = 0.90 # down chance shrinks every step
+STEP_FRACTION = 0.75 # of the ideal step taken before noise
+
+@dataclass(frozen=True, slots=True)
+class PlanRequest:
+    ratings: Ratings
+    targets: dict[int, int] # complaint ID -> final rating, pain and health are derived
+    visits: int
+
+
+class TrajectoryPlan:
+    __slots__ = ("paths", "final_ratings", "complaint_ids", "counts", "visits")
+
+    def __init__(self, paths, final_ratings, complaint_ids, counts, visits):
+        self.paths = paths # (patients, complaints, visits + 1) int8
+        self.final_ratings = final_ratings # (patients, complaints) int8
+        self.complaint_ids = complaint_ids # (patients, complaints) int32, PAD past each patient's complaints
+        self.counts = counts # (patients,) no. ratings per patient, pain and health included
+        self.visits = visits # (patients,)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def get_patient(self, idx: int):
+        # a view, not a copy
+        return self.paths[idx, :self.counts[idx], :self.visits[idx] + 1]
+
+    def get_final_ratings(self, idx: int):
+        return self.final_ratings[idx, :self.counts[idx]]
+
+    def get_complaint_ids(self, idx: int):
+        return self.complaint_ids[idx, :self.counts[idx]]
+
+
+def pack_requests(requests: list[PlanRequest]) -> tuple:
+    # ragged requests -> padded (patients x complaints) arrays
+    if not requests:
+        raise ValueError("Recieved requests is None")
+
+    size = len(requests)
+    width = max(len(request.ratings.get_values()) for request in requests)
+    complaint_ids = np.full((size, width), PAD, dtype=np.int32)
+    starts = np.full((size, width), PAD, dtype=np.int16)
+    targets = np.full((size, width), PAD, dtype=np.int16)
+    counts = np.empty(size, dtype=np.int32)
+    visits = np.empty(size, dtype=np.int32)
+
+    for i, request in enumerate(requests):
+        ids = request.ratings.get_complaint_ids()
+        count = len(ids)
+        if PAIN_ID not in ids or HEALTH_ID not in ids or count < 3:
+            raise ValueError(f"Request {i} needs pain, health and at least one complaint")
+        if request.visits < 1:
+            raise ValueError(f"Request {i} has no visits to plan")
+
+        row_targets = []
+        for complaint_id, rating in zip(ids, request.ratings.get_values()):
+            if is_overall_rating(complaint_id):
+                row_targets.append(rating) # replaced once derived
+            elif complaint_id in request.targets:
+                row_targets.append(request.targets[complaint_id])
+            else:
+                raise ValueError(f"No final target rating for {get_complaint_name(complaint_id)}")
+
+        complaint_ids[i, :count] = ids
+        starts[i, :count] = request.ratings.get_values()
+        targets[i, :count] = row_targets
+        counts[i] = count
+        visits[i] = request.visits
+
+    return complaint_ids, starts, targets, counts, visits
+
+
+class TrajectoryPlanner:
+    def __init__(self, seed: int | None = None):
+        if np is None:
+            raise ImportError("numpy is required for TrajectoryPlanner")
+        self.rng = np.random.default_rng(seed)
+
+    def plan(self, requests: list[PlanRequest]) -> TrajectoryPlan:
+        complaint_ids, starts, targets, counts, visits = pack_requests(requests)
+        used = complaint_ids != PAD
+        self._derive_overall(complaint_ids, targets, used, counts)
+        paths = self._walk(starts, targets, visits)
+        paths[~used] = PAD
+        return TrajectoryPlan(paths, targets.astype(np.int8), complaint_ids, counts, visits)
+
+    def _derive_overall(self, complaint_ids, targets, used, counts) -> None:
+        # main.build_final_ratings() for every patient, fills in the pain and health targets
+        size = len(counts)
+        is_pain = complaint_ids == PAIN_ID
+        is_health = complaint_ids == HEALTH_ID
+        complaints = used & ~is_pain & ~is_health
+
+        # higher pain ratings contribute more to the overall pain value
+        over = (counts - 4)[:, None]
+        bonus = np.where((targets > 4) & (over > 0), over, 0)
+        total_pain = np.where(complaints, targets + bonus, 0).sum(axis=1)
+
+        # np.rint rounds half to even, same as round()
+        avg_pain = np.minimum(np.rint(total_pain / (counts - 2)) + self.rng.integers(0, 2, size), RATING_CEILING)
+        health = np.maximum(RATING_CEILING - avg_pain + self.rng.integers(-3, 1, size), 0)
+
+        rows = np.arange(size)
+        targets[rows, is_pain.argmax(axis=1)] = avg_pain
+        targets[rows, is_health.argmax(axis=1)] = health
+
+    def _walk(self, starts, targets, visits):
+        # one staircase step for every patient and complaint at a time
+        size, width = starts.shape
+        steps = int(visits.max())
+        paths = np.full((size, width, steps + 1), PAD, dtype=np.int8)
+        paths[:, :, 0] = starts
+
+        runs = visits[:, None]
+        floor = np.where(targets > starts, starts, targets) # rising paths never drop below the start
+        current = starts.astype(np.int16)
+        for i in range(1, steps + 1):
+            remaining = np.maximum(runs - i, 1)
+            ideal = np.rint((targets - current) / remaining * STEP_FRACTION)
+
+            up = self.rng.random((size, width)) < UP_CHANCE
+            down = ~up & (targets < current) & (self.rng.random((size, width)) < DOWN_CHANCE * DOWN_DECAY ** i)
+            noise = np.where(up, self.rng.integers(1, 4, (size, width)), 0)
+            noise = np.where(down, -self.rng.integers(0, 2, (size, width)), noise)
+
+            step = np.minimum(np.maximum(current + noise + ideal, floor), RATING_CEILING)
+            # on the last step force the target to guarantee the hit
+            current = np.where(runs == i, targets, step).astype(np.int16)
+            paths[:, :, i] = np.where(runs >= i, current, PAD)
+
+        return paths
@@ -0,0 +1,346 @@
+"""
+benchmark.py
+
+DESC:
+    Benchmark suite for AutoSOAP. Times the parse, generate and render stages
+    separately over a deterministic synthetic chart and saves the results as JSON so
+    runs can be compared across commits.
+
+Author: David J. Kim,
+Created: 10-19-2026,
+Modified: 10-19-2026,
+Version: 1.0.0
+
+USAGE:
+    Run from the src directory:
+        python benchmark.py [--notes N] [--repeat N] [--seed N] [--output FILE]
+                            [--compare FILE]
+    Each stage reports ops/sec, p50/p99 latency and the peak RSS after the stage.
+    Memory allocated while generating each note (all 4 sections) is measured
+    separately with tracemalloc.
+    TrajectoryPlanner.plan times one batch of PLAN_PATIENTS patients, it is skipped
+    when numpy is not installed.
+    Use --compare with a previous results file to print the change per stage.
+
+PLANNED:
+    - ...
+
+LIMITATIONS:
+    - Peak RSS is the high-water mark of the whole process, so it only ever grows
+      from one stage to the next. Not available on Windows.
+    - Logging is never set up here, so INFO and DEBUG records are dropped cheaply
+      and not timed as output.
+
+DEPENDENCIES:
+    - argparse
+    - contextlib
+    - json
+    - resource (optional)
+    - tempfile
+    - tracemalloc
+    - main
+    - Note
+    - NoteDocument
+    - Ratings
+    - SyntheticChart
+    - TrajectoryPlanner (needs numpy)
+"""
+
+import argparse, contextlib, io, json, os, platform, random, subprocess, sys, tempfile, time, tracemalloc
+from array import array
+from datetime import datetime
+
+try:
+    import resource
+except ImportError: # not available on Windows
+    resource = None
+
+import main
+import Note as note_module
+from Date import Date
+from Note import Note, Sections
+from NoteDocument import FORMATS, write_note
+from Ratings import Ratings
+from SyntheticChart import SyntheticChart, COMPLAINTS
+from TrajectoryPlanner import TrajectoryPlanner, PlanRequest, np
+
+DEFAULT_NOTES = 56 # one full cycle of complaint count x region combinations
+DEFAULT_REPEAT = 5
+DEFAULT_SEED = 0
+DEFAULT_OUTPUT = "benchmark_results.json"
+STAIRCASE_RUNS = 12 # visits per trajectory
+PLAN_PATIENTS = 10_000 # patients per TrajectoryPlanner batch
+
+def get_peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024 # bytes on macOS, KB everywhere else
+    return peak
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(sorted_samples: list[float], fraction: float) -> float:
+    # nearest-rank percentile
+    idx = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[idx]
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "ops": len(ordered),
+        "ops_per_sec": len(ordered) / total if total else None,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "peak_rss_kb": get_peak_rss_kb(),
+    }
+
+
+def load_chart(directory: str, filename: str) -> None:
+    main.NOTES_PATH = directory
+    main.clear_globals()
+    main.retrieve_info_from_SD(filename, directory)
+
+
+def get_trajectories(note_count: int) -> list[array]:
+    # fixed trajectories so generation never prompts for input
+    trajectories = []
+    for rating in main.patient.ratings.get_values():
+        trajectories.append(array('b', main.get_guaranteed_staircase_path(start=rating, target=max(rating - 3, 0), total_runs=note_count)))
+    return trajectories
+
+
+def reset_note_counter() -> None:
+    note_module.note_counter = 1
+
+
+def bench_find_previous_note(directory: str, repeat: int) -> list[float]:
+    main.NOTES_PATH = directory
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        main.find_previous_note()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_retrieve_info(directory: str, filenames: list[str], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        for filename in filenames:
+            main.clear_globals()
+            start = time.perf_counter()
+            main.retrieve_info_from_SD(filename, directory)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_paragraphs(directory: str, filenames: list[str], repeat: int) -> dict[str, list[float]]:
+    # a new Note per sample, sections are cached per Note
+    samples = {section.name: [] for section in Sections}
+    for filename in filenames:
+        load_chart(directory, filename)
+        trajectories = get_trajectories(repeat + 1)
+        reset_note_counter()
+        for _ in range(repeat):
+            note = Note(main.patient, get_sorted_sentences(), trajectories)
+            for section in Sections:
+                start = time.perf_counter()
+                note.get_paragraph(section.value)
+                samples[section.name].append(time.perf_counter() - start)
+    return samples
+
+
+def bench_note_allocations(directory: str, filenames: list[str], repeat: int) -> dict:
+    # tracemalloc slows everything down, so this is kept out of the timed stages
+    # - peak: most memory held at once while generating a note, over what was held before
+    # - retained: memory still held once the note is done, i.e. the cached sections
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for filename in filenames:
+            load_chart(directory, filename)
+            trajectories = get_trajectories(repeat + 1)
+            reset_note_counter()
+            for _ in range(repeat):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                note = Note(main.patient, get_sorted_sentences(), trajectories)
+                for section in Sections:
+                    note.get_paragraph(section.value)
+                current, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+                retained.append(current - before)
+                del note
+    finally:
+        tracemalloc.stop()
+    
+    peaks.sort()
+    retained.sort()
+    return {
+        "notes": len(peaks),
+        "peak_kb_p50": percentile(peaks, 0.50) / 1024,
+        "peak_kb_p99": percentile(peaks, 0.99) / 1024,
+        "retained_kb_p50": percentile(retained, 0.50) / 1024,
+    }
+
+
+def bench_staircase(repeat: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(repeat * 100):
+        start_rating = rng.randint(0, 10)
+        target = rng.randint(0, 10)
+        start = time.perf_counter()
+        main.get_guaranteed_staircase_path(start_rating, target, STAIRCASE_RUNS)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_trajectory_planner(repeat: int, seed: int) -> list[float]:
+    # one month-end batch per sample, every patient with 1-8 complaints
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(PLAN_PATIENTS):
+        complaints = COMPLAINTS[:rng.randint(1, len(COMPLAINTS))]
+        ratings = Ratings({"pain": rng.randint(0, 10), "health": rng.randint(0, 10)} | {name: rng.randint(0, 10) for name in complaints})
+        targets = {complaint_id: rng.randint(0, 10) for complaint_id in ratings.get_complaint_ids()[2:]}
+        requests.append(PlanRequest(ratings, targets, rng.randint(1, STAIRCASE_RUNS)))
+
+    planner = TrajectoryPlanner(seed)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        planner.plan(requests)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_rtf_output(directory: str, filenames: list[str], output_dir: str, repeat: int) -> list[float]:
+    samples = []
+    for filename in filenames:
+        load_chart(directory, filename)
+        trajectories = get_trajectories(repeat + 1)
+        reset_note_counter()
+        for i in range(repeat):
+            start = time.perf_counter()
+            main.add_header_section(Date(1, 1, 2026))
+            main.generate_content(trajectories)
+            main.document.set_footer(main.patient.get_full_name(), "Confidential")
+            write_note(main.document, output_dir, f"BENCH_{i}")
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_exports(directory: str, filenames: list[str], output_dir: str, repeat: int) -> dict[str, list[float]]:
+    # writing an already generated note in every format, RTF included for comparison
+    samples = {fmt: [] for fmt in FORMATS}
+    for filename in filenames:
+        load_chart(directory, filename)
+        reset_note_counter()
+        main.add_header_section(Date(1, 1, 2026))
+        main.generate_content(get_trajectories(2))
+        main.document.set_footer(main.patient.get_full_name(), "Confidential")
+        for i in range(repeat):
+            for fmt in FORMATS:
+                start = time.perf_counter()
+                write_note(main.document, output_dir, f"BENCH_{i}", fmt)
+                samples[fmt].append(time.perf_counter() - start)
+    return samples
+
+
+def get_sorted_sentences() -> dict:
+    return {
+        "tender_levels": main.tender_levels,
+        "unknown_levels": tuple(main.unknown_levels),
+        "sorted_cervical": main.sorted_cervical_sentences,
+        "sorted_thoracic": main.sorted_thoracic_sentences,
+        "sorted_lumbar": main.sorted_lumbar_sentences,
+    }
+
+
+def run_benchmarks(note_count: int, repeat: int, seed: int) -> dict:
+    random.seed(seed) # sentence choice and rating noise
+    results = {}
+
+    with tempfile.TemporaryDirectory() as chart_dir, tempfile.TemporaryDirectory() as output_dir:
+        chart_dir = os.path.join(chart_dir, "") # the parser joins paths, the scan expects a trailing separator
+        filenames = SyntheticChart(seed).write_chart(chart_dir, note_count)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["find_previous_note"] = summarize(bench_find_previous_note(chart_dir, repeat * 10))
+            results["retrieve_info_from_SD"] = summarize(bench_retrieve_info(chart_dir, filenames, repeat))
+            for section, samples in bench_paragraphs(chart_dir, filenames, repeat).items():
+                results[f"get_paragraph.{section}"] = summarize(samples)
+            results["get_guaranteed_staircase_path"] = summarize(bench_staircase(repeat, seed))
+            if np is not None:
+                results["TrajectoryPlanner.plan"] = summarize(bench_trajectory_planner(repeat, seed))
+            results["rtf_output"] = summarize(bench_rtf_output(chart_dir, filenames, output_dir, repeat))
+            for fmt, samples in bench_exports(chart_dir, filenames, output_dir, repeat).items():
+                results[f"write_note.{fmt}"] = summarize(samples)
+            allocations = bench_note_allocations(chart_dir, filenames, repeat)
+
+    return {
+        "commit": get_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "notes": note_count,
+        "repeat": repeat,
+        "seed": seed,
+        "stages": results,
+        "note_allocations": allocations,
+    }
+
+
+def print_results(report: dict, baseline: dict | None) -> None:
+    print(f"{'stage':<32}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak RSS KB':>14}{'vs base':>10}")
+    for stage, stats in report["stages"].items():
+        change = ""
+        if baseline and stage in baseline["stages"] and baseline["stages"][stage]["ops_per_sec"] and stats["ops_per_sec"]:
+            change = f"{stats['ops_per_sec'] / baseline['stages'][stage]['ops_per_sec']:.2f}x"
+        peak = stats["peak_rss_kb"] if stats["peak_rss_kb"] is not None else "-"
+        print(f"{stage:<32}{stats['ops_per_sec']:>12.1f}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}{peak:>14}{change:>10}")
+    
+    allocations = report["note_allocations"]
+    change = ""
+    if baseline and "note_allocations" in baseline and baseline["note_allocations"]["peak_kb_p50"]:
+        change = f"{allocations['peak_kb_p50'] / baseline['note_allocations']['peak_kb_p50']:.2f}x"
+    print(f"\nPer-note allocations over {allocations['notes']} note(s): peak p50 {allocations['peak_kb_p50']:.1f} KB, "
+          f"p99 {allocations['peak_kb_p99']:.1f} KB, retained p50 {allocations['retained_kb_p50']:.1f} KB {change}")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the AutoSOAP parse, generate and render stages.")
+    parser.add_argument("--notes", type=int, default=DEFAULT_NOTES, help="no. synthetic notes in the chart")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="no. times each note is processed per stage")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to save the JSON results")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(args.notes, args.repeat, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print_results(report, baseline)
+    print(f"\nResults saved to <{args.output}>")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -7,7 +7,7 @@ DESC:
 
 Author: David J. Kim,
 Created: 01-16-2026,
-Modified: 02-13-2026,
+Modified: 10-19-2026,
 Version: 1.0.0
 
 USAGE:
@@ -31,39 +31,86 @@ LIMITATIONS:
       final exam.
 
 DEPENDENCIES:
+    - argparse
+    - array
     - collections
+    - concurrent.futures
+    - cProfile
     - enum
+    - GenerationJob
+    - functools
+    - hashlib
+    - logging
+    - multiprocessing
     - os    
     - re
-    - simplertf
+    - sqlite3
+    - tempfile
     - striprtf
+    - ClinicProfile
+    - Complaints
     - Date
+    - FillPlan
+    - KeywordMatcher
+    - Logger
+    - NoteDocument
+    - NoteIndex
+    - NoteSimilarity
+    - ParsedNote
     - Patient
+    - Profiler
     - Ratings
+    - Schedule
+    - SpinalLevels
+    - tkinter, tkcalendar (optional, only for picking dates on a calendar)
 """
 
-import os, re, random
-import tkinter as tk
-from simplertf import simplertf
+import argparse, cProfile, hashlib, multiprocessing, os, re, random, tempfile, time
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date
 from enum import Enum
+from functools import lru_cache
 from striprtf.striprtf import rtf_to_text
-from tkcalendar import Calendar
+
+try:
+    import tkinter as tk
+    from tkcalendar import Calendar
+except ImportError: # schedules don't need a display, see Schedule.py
+    tk = None
 
 # custom classes
-from Date import Date
-from Note import Note
+from ClinicProfile import ClinicProfile, DEFAULT_CLINIC, load_clinics, get_header_blocks, get_patient_pattern
+from Complaints import PAIN, HEALTH, PAIN_ID, HEALTH_ID, intern_complaint, get_complaint_name, is_overall_rating
+from Date import Date, UNSET
+from FillPlan import FillPlan, PlannedNote, PLAN_FORMATS, format_plans
+from GenerationJob import GenerationJob, JobState, ProgressEvent
+from KeywordMatcher import KeywordMatcher
+from Logger import log, job_context, set_patient, count
+import Logger
+from Note import Note, reset_note_counter
+from NoteDocument import NoteDocument, Role, FORMATS, write_note, get_rtf_par_pattern
+from NoteIndex import NoteIndex
+from NoteSimilarity import SimilarityIndex, SECTION_HEADINGS, END_HEADING, get_signature, get_note_sections
+from ParsedNote import ParsedNote
 from Patient import Patient
-from Ratings import Ratings
+from Profiler import span, timed
+import Profiler
+from Ratings import Ratings, MAX_RATING
+from Schedule import ScheduleRule, Scheduler, load_closures
+from SpinalLevels import CERVICAL, THORACIC, LUMBAR, REGION_MASKS, parse_levels, get_levels, get_level_region
 
-r = simplertf.RTF("'AutoSOAP' by dkim03")
-r.stylesheet = "English"
+document = NoteDocument() # the note being generated, written out by NoteDocument.write_note()
+clinic = DEFAULT_CLINIC # profile written into new notes, see load_clinic()
+clinics = {DEFAULT_CLINIC.key: DEFAULT_CLINIC} # every profile notes are parsed with
+note_layouts = {} # path -> ((size, mtime), layout of the note), see get_note_layout()
 
 class Operations(Enum):
     SINGLE_FILL = 1
     MULTI_FILL = 2
     FULL_FILL = 3
+    INDEX_NOTES = 4
     
 class Sections(Enum):
     SUBJECTIVE = 0
@@ -72,25 +119,58 @@ class Sections(Enum):
     PLAN = 3
     
 NOTES_PATH = '../' # directory to check for existing soap notes
+INDEX_FILENAME = "autosoap_index.db"
+CLOSURES_FILENAME = "closures.txt" # used when no --closures file is given, if it exists
+CLINICS_FILENAME = "clinics.json" # used when no --clinics file is given, if it exists, see ClinicProfile.py
+INDEX_PATH = f"{NOTES_PATH}{INDEX_FILENAME}" # sqlite store for parsed notes and exams
+SIMILARITY_THRESHOLD = 0.8 # generated notes at least this similar to another note in the chart are regenerated
+MAX_REGENERATE = 3 # attempts before a near-duplicate is written anyway
+NOTE_KIND_PATTERN = r"^(SD|EI|EN|EF)_" # prefixes of files that can be indexed
+OVERALL_PAIN_PATTERN = r"to 10 \(\w+ pain\),? is\D*?(\d+)" # '... to 10 (unbearable pain) is reported to be 3'
+OVERALL_HEALTH_PATTERN = r"scale of 1 to 10\D*?(\d+)"
+# street and address are the 2 paragraphs after the patient name, the name is checked against the last name found
+PATIENT_PAR = get_rtf_par_pattern(Role.PATIENT)
+STREET_ADDRESS_PATTERN = re.compile(
+    r"(?P<name>[^\\{}]*?)\\par}\s+"
+    rf"{PATIENT_PAR}(?P<street>.*?)\\par}}\s+"
+    rf"{PATIENT_PAR}(?P<address>.*?)\\par}}\s+"
+    r".*?Date of Birth",
+    re.IGNORECASE | re.DOTALL
+)
+# notes written before paragraphs had styles
+LEGACY_STREET_ADDRESS_PATTERN = re.compile(
+    r"(?P<name>[^\\]+?)\s*\\par\s*"
+    r"(?P<street>[^\\]+?)\s*\\par\s*"
+    r"(?P<address>[^\\]+?)\s*\\par\s*"
+    r"Date",
+    re.IGNORECASE | re.DOTALL
+)
+
+# layout versions, told apart by get_note_layout() from the start of the file
+LAYOUT_STYLED = "styled" # patient paragraphs carry Role.PATIENT's style, what NoteDocument writes
+LAYOUT_LEGACY = "legacy" # plain paragraphs, other generators and fonts
+STREET_ADDRESS_PATTERNS = {
+    LAYOUT_STYLED: STREET_ADDRESS_PATTERN,
+    LAYOUT_LEGACY: LEGACY_STREET_ADDRESS_PATTERN,
+}
+FINGERPRINT_SIZE = 4096 # characters of a note read to tell its layout, the header is always near the top
+STYLED_FINGERPRINT = re.compile(PATIENT_PAR)
+PARSE_CHUNK_SIZE = 64 # max notes sent to a parse worker at once
 PAGE_HEIGHT = "11in"
 PAGE_WIDTH = "8.5in"
 MARGIN_TOP = MARGIN_BOTTOM = MARGIN_LEFT = MARGIN_RIGHT = "1in"
 
-# # do initial page set up
-# r.set_layout(ph="11in", pw="8.5in", mt="1in", mb="1in", ml="1in", mr="1in")
-
-# prefixes to denote different terminal msgs
+# prefixes to denote different terminal msgs, logged msgs get theirs from Logger
 ERROR_MSG_PREFIX = "[ERROR]: "
-DEBUG_MSG_PREFIX = "[DEBUG]: "
 INFO_MSG_PREFIX = "[INFO]: "
     
-debug_enabled = False # used to enable/disable debug prints msgs
 patient = None # Patient obj to store all demographic info
+note_date = None # Date of the visit the parsed note was written for, if found
 
-# spinous regions related to tenderness
-tender_cervical_regions = []
-tender_thoracic_regions = []
-tender_lumbar_regions = []
+# spinous levels related to tenderness, a SpinalLevels bitmask
+tender_levels = 0
+unknown_levels = [] # levels without a bit, i.e. 'C8', kept by name so new notes still list them
+NOTE_LEVELS = CERVICAL | THORACIC | LUMBAR # the regions a note has a section for
 
 # various sentences to help reconstruct the new note document
 
@@ -103,6 +183,12 @@ sorted_lumbar_sentences = []
 # store TODAY'S TREATMENT section verbatim
 treatment_content = ""
 
+# ratings written into the note being generated, checked by verify_note()
+note_ratings = None
+
+# fields a written note must parse back to unchanged
+VERIFY_FIELDS = ["first_name", "last_name", "title", "street", "address", "dob", "ratings", "tender_levels", "treatment"]
+
 # ------------------------------------------------------------------------------------------------------------------------
 #                                             AutoSOAP EXECUTION FLOW outline
 # ------------------------------------------------------------------------------------------------------------------------
@@ -206,7 +292,6 @@ def natural_sort_key(s):
     
 
 def ask_for_debug() -> None:
-    global debug_enabled # need to declare the global var explicitly
     while True:
         user_input = input("Enable debug messages? (Y/N) ")
         try:
@@ -218,7 +303,7 @@ def ask_for_debug() -> None:
                 raise ValueError("Input must be a 'Y' or 'N'")
             
             if 'Y' in user_input or 'y' in user_input:
-                debug_enabled = True
+                Logger.set_debug(True)
             return
 
         except ValueError as e:
@@ -233,16 +318,17 @@ def select_function_prompt() -> int:
     # 1 -> single
     # 2 -> multi
     # 3 -> full
+    # 4 -> index notes
     while True:
         user_input = input("""Please select a fill function:\n  Enter '1' for SINGLE FILL
-  Enter '2' for MULTI FILL\n  Enter '3' for FULL FILL\n""")
+  Enter '2' for MULTI FILL\n  Enter '3' for FULL FILL\n  Enter '4' to INDEX NOTES\n""")
         try:
             # input checks
             if not len(user_input) == 1:
                 raise ValueError("Input must be 1 character in length")
             
-            if '1' not in user_input and '2' not in user_input and '3' not in user_input:
-                raise ValueError("Input must be a '1', '2', or '3'")
+            if '1' not in user_input and '2' not in user_input and '3' not in user_input and '4' not in user_input:
+                raise ValueError("Input must be a '1', '2', '3', or '4'")
 
             return int(user_input)
 
@@ -250,14 +336,16 @@ def select_function_prompt() -> int:
             print(f"{ERROR_MSG_PREFIX}{e}. Please try again.\n")
             
             
-def find_previous_note() -> str:
+@timed("scan.find_previous_note")
+def find_previous_note(directory: str | None = None) -> str:
+    directory = directory or NOTES_PATH
+    
     # check whether soap docs exist
     # this is required for retrieval to succeed
     doc_exists = False
-    for filename in os.listdir(NOTES_PATH): # search parent directory
+    for filename in os.listdir(directory): # search parent directory
         if filename.endswith('.rtf') and 'SD' in filename:
-            if debug_enabled:
-                print(f"{DEBUG_MSG_PREFIX}found {filename}")
+            log.debug("found %s", filename)
             doc_exists = True
             break
         
@@ -265,385 +353,477 @@ def find_previous_note() -> str:
         raise ValueError("SOAP document does not exist in directory. Must be '.rtf' and have 'SD' in filename")
     
     # if notes exist in parent dir, find the most recent file by filtering the filename
-    files = os.listdir(NOTES_PATH)
+    # - no folders
+    files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
     
+    prev_note = get_previous_note(files)
+    if prev_note:
+        log.debug("Previous note found -> %s.", prev_note)
+        return prev_note
+            
+    # in case files are moved/deleted during runtime
+    raise ValueError("No matching files found")    
+
+
+def get_previous_note(filenames: list[str]) -> str | None:
     # filter the file list to only include the ones we're searching for
-    # - no folders
     # - is .rtf
     # - has 'SD' in filename
-    files = [
-        f for f in os.listdir(NOTES_PATH)
-        if os.path.isfile(os.path.join(NOTES_PATH, f)) and f.endswith('.rtf') and 'SD' in f
-    ]
+    files = [f for f in filenames if f.endswith('.rtf') and 'SD' in f]
     
     # find the previous note by finding the file with the biggest number postfix
     # - note name must follow this format: SD_Patient_Name_100
     if files:
-        prev_note = max(files, key=natural_sort_key)
-        if debug_enabled:
-            print(f"{DEBUG_MSG_PREFIX}Previous note found -> {prev_note}.")
-        return prev_note
-            
-    # in case files are moved/deleted during runtime
-    raise ValueError("No matching files found")    
+        return max(files, key=natural_sort_key)
+    return None
 
 
-def retrieve_info_from_SD(filename: str) -> None:
+@timed("parse")
+def retrieve_info_from_SD(filename: str, directory: str | None = None) -> None:
     # retrieve information from prev_note that was found
-    global patient, tender_cervical_regions, tender_thoracic_regions, tender_lumbar_regions, sorted_cervical_sentences, sorted_thoracic_sentences, sorted_lumbar_sentences
+    global patient, note_date, tender_levels, sorted_cervical_sentences, sorted_thoracic_sentences, sorted_lumbar_sentences
 
     # read the file
-    with open(f"{NOTES_PATH}{filename}", 'r', encoding='cp1252') as f:
-        raw_rtf = f.read()
+    path = os.path.join(directory or NOTES_PATH, filename)
+    with span("parse.read"):
+        with open(path, 'r', encoding='cp1252') as f:
+            raw_rtf = f.read()
+            stat = os.fstat(f.fileno())
+    
+    # the layout picks the street/address extractor, only the first FINGERPRINT_SIZE characters are looked at
+    with span("parse.fingerprint"):
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        layout = get_note_layout(path, stamp, raw_rtf)
     
     # convert to plain text, removing rtf junk and space elements out evenly
-    plain_text = str(rtf_to_text(raw_rtf))
-    normalized = " ".join(plain_text.split())
+    with span("parse.rtf_to_text"):
+        plain_text = str(rtf_to_text(raw_rtf))
+        normalized = " ".join(plain_text.split())
     
-    # used to space elements out evenly to keep it consistent to ensure
-    # patterns can be used for street, address retrieval
-    raw_rtf_normalized = " ".join(raw_rtf.split())
+        # used to space elements out evenly to keep it consistent to ensure
+        # patterns can be used for street, address retrieval
+        raw_rtf_normalized = " ".join(raw_rtf.split())
     
-    if debug_enabled:
-        print(plain_text)
+    log.debug("plain_text -> %s", plain_text)
         
     # find ratings
-    ratings = {}
-    rating_pattern = r"On a scale of 0 to 10 with 10 being the worst,.*?\."
-    rating_match = re.search(rating_pattern, normalized, re.IGNORECASE | re.DOTALL)
-    if rating_match:
-        rating_sentence = rating_match.group(0)
-        
-        # within found sentence, find pairs
-        pair_pattern = r"(?P<complaint>.*?) as a (?P<rating>\d+)"
-        pair_matches = re.findall(pair_pattern, rating_sentence)
-        if not pair_matches:
-            raise ValueError("Failed to find complaint-rating pairs, check syntax")
-        
-        # clean up pronouns, extract complaint & rating then store in dict
-        for complaint, rating in pair_matches:
-            clean_complaint = re.sub(r".*?(his|her|and)", "", complaint, flags=re.IGNORECASE).strip()
-            clean_complaint = clean_complaint.lstrip(',').strip() # remove comma and any whitespace
-            ratings[clean_complaint] = int(rating)
+    with span("parse.ratings"):
+        ratings = {}
+        rating_pattern = r"On a scale of 0 to 10 with 10 being the worst,.*?\."
+        rating_match = re.search(rating_pattern, normalized, re.IGNORECASE | re.DOTALL)
+        if rating_match:
+            rating_sentence = rating_match.group(0)
+        
+            # within found sentence, find pairs
+            pair_pattern = r"(?P<complaint>.*?) as a (?P<rating>\d+)"
+            pair_matches = re.findall(pair_pattern, rating_sentence)
+            if not pair_matches:
+                raise ValueError("Failed to find complaint-rating pairs, check syntax")
+        
+            # clean up pronouns, extract complaint & rating then store in dict
+            for complaint, rating in pair_matches:
+                clean_complaint = re.sub(r".*?(his|her|and)", "", complaint, flags=re.IGNORECASE).strip()
+                clean_complaint = clean_complaint.lstrip(',').strip() # remove comma and any whitespace
             
-        # add overall pain and health ratings
-        after_title = normalized.split("Complaint", 1)[-1] # get all words after 'Complaint'
-        all_numbers = re.findall(r"\d+", after_title) # get all numbers
-        pain_health_ratings = {
-            "pain": int(all_numbers[2]), # get pain rating
-            "health": int(all_numbers[5]) # get health rating
-        }
-        ratings.update(pain_health_ratings) # add to ratings dict
-        
-        if debug_enabled:
-            print(f"{DEBUG_MSG_PREFIX}rating_sentence -> {rating_sentence}")   
+                # intern once here, everything downstream compares IDs
+                ratings[get_complaint_name(intern_complaint(clean_complaint))] = int(rating)
+            
+            # add overall pain and health ratings
+            # - read after the scale each is given on, a pain intro can mention the pain scale by itself
+            # - falls back to the 3rd and 6th number after 'Complaint' for notes written by hand
+            after_title = normalized.split("Complaint", 1)[-1] # get all words after 'Complaint'
+            pain_match = re.search(OVERALL_PAIN_PATTERN, after_title, re.IGNORECASE)
+            health_match = re.search(OVERALL_HEALTH_PATTERN, after_title, re.IGNORECASE)
+            all_numbers = re.findall(r"\d+", after_title) # get all numbers
+            if len(all_numbers) < (6 if not health_match else 3 if not pain_match else 0):
+                raise ValueError("Failed to find overall pain and health ratings in note document, check syntax")
+            pain_health_ratings = {
+                PAIN: int(pain_match.group(1) if pain_match else all_numbers[2]), # get pain rating
+                HEALTH: int(health_match.group(1) if health_match else all_numbers[5]) # get health rating
+            }
+            # older versions could write health 11 when pain was 0, read it as the most it can be
+            if pain_health_ratings[HEALTH] == MAX_RATING + 1:
+                log.warning("%s: health is %d, read as %d.", filename, pain_health_ratings[HEALTH], MAX_RATING)
+                pain_health_ratings[HEALTH] = MAX_RATING
+            ratings.update(pain_health_ratings) # add to ratings dict
+        
+            log.debug("rating_sentence -> %s", rating_sentence)
 
-    else:
-        raise ValueError("Failed to find ratings in note document, check syntax")
+        else:
+            raise ValueError("Failed to find ratings in note document, check syntax")
     
     # find title
-    title = ""
-    title_pattern = r"(Mr\.|Mrs\.|Ms\.|Dr\.)"
-    title_match = re.search(title_pattern, normalized, re.IGNORECASE)
-    if title_match:
-        title = title_match.group(1)
-        if debug_enabled:
-            print(f"{DEBUG_MSG_PREFIX}title -> {title}")
-    else:
-        raise ValueError("Failed to find title in note document, check syntax")
+    with span("parse.title"):
+        title = ""
+        title_pattern = r"(Mr\.|Mrs\.|Ms\.|Dr\.)"
+        title_match = re.search(title_pattern, normalized, re.IGNORECASE)
+        if title_match:
+            title = title_match.group(1)
+            log.debug("title -> %s", title)
+        else:
+            raise ValueError("Failed to find title in note document, check syntax")
     
     # find patient info and store in Patient obj
-    name_date_pattern = (
-        r"Doctor:\s*Sungjun\s*Jung\s+"                         # anchor
-        r"(?P<name>.*?)\s+"                                    # match name until we see numbers
-        r"(?P<street>\d+[\s\w]+?)\s+"                          # ignore
-        r"(?P<address>.+?)\s+"                                 # ignore
-        r"Date\s+of\s+Birth:\s+(?P<dob>\d{1,2}/\d{1,2}/\d{4})" # match strictly the date format
-    )    
-    name_date_match = re.search(name_date_pattern, normalized, re.IGNORECASE)
-    if name_date_match:
-        # extract data from groups
-        name = name_date_match.group('name').strip()
-        dob = name_date_match.group('dob').strip()
-        
-        if debug_enabled:
-            print(f"{DEBUG_MSG_PREFIX}name -> {name}")
-            print(f"{DEBUG_MSG_PREFIX}dob -> {dob}")
-        
-        name_parts = name.strip().split(" ")
-        if len(name_parts) != 2:
-            raise ValueError("Incorrect number of parts in patient name. Only 2 parts supported")
-        first, last = map(str, name_parts)
-        
-        date_parts = dob.strip().split("/")
-        month, day, year = map(int, date_parts)
-        
-        # if the font ever changes, this needs to be changed
-        # can probably replace the rtf keywords with variables
-        new_pattern = (
-            rf"{last}\\par}}\s+"
-            r"{\\pard\s+\\s27\\ql\\f4\\fs22\\lang1033\s+(?P<street>.*?)\\par}\s+"
-            r"{\\pard\s+\\s27\\ql\\f4\\fs22\\lang1033\s+(?P<address>.*?)\\par}\s+"
-            r".*?Date of Birth"
-        )
-        
-        old_pattern = (
-            rf"{last}\s*\\par\s*"
-            r"(?P<street>[^\\]+?)\s*\\par\s*"
-            r"(?P<address>[^\\]+?)\s*\\par\s*"
-            r"Date"
-        )
-
-        street_address_match = re.search(new_pattern, raw_rtf_normalized, re.IGNORECASE | re.DOTALL)
-        if not street_address_match:
-            street_address_match = re.search(old_pattern, raw_rtf_normalized, re.IGNORECASE | re.DOTALL)
-        
-        street = ""
-        address = ""
-        if street_address_match:
-            street = street_address_match.group('street').strip()
-            address = street_address_match.group('address').strip()
+    with span("parse.patient"):
+        name_date_match = match_patient_header(normalized)
+        if name_date_match:
+            # extract data from groups
+            name = name_date_match.group('name').strip()
+            dob = name_date_match.group('dob').strip()
+        
+            log.debug("name -> %s", name)
+            log.debug("dob -> %s", dob)
+        
+            name_parts = name.strip().split(" ")
+            if len(name_parts) != 2:
+                raise ValueError("Incorrect number of parts in patient name. Only 2 parts supported")
+            first, last = map(str, name_parts)
+        
+            date_parts = dob.strip().split("/")
+            month, day, year = map(int, date_parts)
+        
+            # visit date follows the patient header, not every note has one
+            note_date = None
+            visit_date_match = re.search(
+                r"Date\s+of\s+Birth:\s+\d{1,2}/\d{1,2}/\d{4}.{0,100}?\b(?P<date>\d{1,2}/\d{1,2}/\d{4})", normalized
+            )
+            if visit_date_match:
+                visit_month, visit_day, visit_year = map(int, visit_date_match.group('date').split("/"))
+                note_date = Date(visit_month, visit_day, visit_year)
+                log.debug("note_date -> %s", note_date.get_date_standard())
+        
+            with span("parse.street_address"):
+                street_address_match = match_street_address(STREET_ADDRESS_PATTERNS[layout], raw_rtf_normalized, last)
+                if not street_address_match:
+                    # fingerprint was wrong, the other extractor is only tried now and the file remembers the one that worked
+                    for other, pattern in STREET_ADDRESS_PATTERNS.items():
+                        if other != layout:
+                            street_address_match = match_street_address(pattern, raw_rtf_normalized, last)
+                            if street_address_match:
+                                log.debug("layout -> %s, fingerprint said %s", other, layout)
+                                count("layout_misses")
+                                note_layouts[path] = (stamp, other)
+                                break
+        
+            street = ""
+            address = ""
+            if street_address_match:
+                street = street_address_match.group('street').strip()
+                address = street_address_match.group('address').strip()
             
-            if debug_enabled:
-                print(f"{DEBUG_MSG_PREFIX}street -> {street}")
-                print(f"{DEBUG_MSG_PREFIX}address -> {address}")
+                log.debug("street -> %s", street)
+                log.debug("address -> %s", address)
+            else:
+                raise ValueError("Failed to find street or address in note document, check syntax")
+        
+            # create Patient obj and consolidate necessary information
+            patient = Patient(first, last, title, street, address, Date(month, day, year), Ratings(ratings))
+            log.debug("%s %s", patient.get_title(), patient.get_full_name())
+            log.debug("%s", patient.get_street())
+            log.debug("%s", patient.get_address())
+            log.debug("%s", patient.get_birthday().get_date_readable())
+            log.debug("%s", patient.get_ratings())
         else:
-            raise ValueError("Failed to find street or address in note document, check syntax")
-        
-        # create Patient obj and consolidate necessary information
-        patient = Patient(first, last, title, street, address, Date(month, day, year), Ratings(ratings))
-        if debug_enabled:
-            print(f"{DEBUG_MSG_PREFIX}{patient.get_title()} {patient.get_full_name()}")
-            print(f"{DEBUG_MSG_PREFIX}{patient.get_street()}")
-            print(f"{DEBUG_MSG_PREFIX}{patient.get_address()}")
-            print(f"{DEBUG_MSG_PREFIX}{patient.get_birthday().get_date_readable()}")
-            print(f"{DEBUG_MSG_PREFIX}{patient.get_ratings()}")   
-    else:
-        raise ValueError("Failed to extract patient data. Check whether read note has correct formatting for name, street, address, and dob")     
+            raise ValueError("Failed to extract patient data. Check whether read note has correct formatting for name, street, address, and dob")     
     
     # find regions in regards to tenderness/palpation
     # problem with this is that it gets ALL cervical regions, this is not correct
     # one way to do this is to get all sentences that mention a spinous process then scan for C#, T#, or L# since
     # those sentences are always related to tenderness/palpation
     
-    tenderness_targets = ["spinous process", "spinous levels", "following levels"]
-    tenderness_region_sentences = []
-    find_sentences(tenderness_targets, tenderness_region_sentences, normalized, re.IGNORECASE)
+    with span("parse.tender_regions"):
+        tenderness_targets = ["spinous process", "spinous levels", "following levels"]
+        tenderness_region_sentences = []
+        find_sentences(tenderness_targets, tenderness_region_sentences, normalized, re.IGNORECASE)
     
-    for sentence in tenderness_region_sentences:
-        # for every sentence found, scan for these patterns within them, then add to list  if found
-        tender_cervical_regions.extend(re.findall(r"\bC\d+", sentence, re.IGNORECASE))
-        tender_thoracic_regions.extend(re.findall(r"\bT\d+", sentence, re.IGNORECASE))
-        tender_lumbar_regions.extend(re.findall(r"\bL\d+", sentence, re.IGNORECASE))
-    
-    if not tender_cervical_regions:
-        print(f"{INFO_MSG_PREFIX}No cervical regions found, continuing...")
+        for sentence in tenderness_region_sentences:
+            # one pass per sentence picks up every level and range ('C3-C6') it lists
+            tender_levels |= parse_levels(sentence, unknown_levels)
+        tender_levels &= NOTE_LEVELS
+        
+        # a level without a bit (i.e. 'C8') still shows its region has a section
+        regions = tender_levels
+        for level in unknown_levels:
+            regions |= REGION_MASKS[get_level_region(level)]
+        regions &= NOTE_LEVELS
+    
+        if not regions & CERVICAL:
+            log.info("No cervical regions found, continuing...")
         
-    if not tender_thoracic_regions:
-        print(f"{INFO_MSG_PREFIX}No thoracic regions found, continuing...")    
+        if not regions & THORACIC:
+            log.info("No thoracic regions found, continuing...")
         
-    if not tender_lumbar_regions:
-        print(f"{INFO_MSG_PREFIX}No lumbar regions found, continuing...")
+        if not regions & LUMBAR:
+            log.info("No lumbar regions found, continuing...")
     
-    if debug_enabled:
-        print(f"{DEBUG_MSG_PREFIX}tender_cervical_regions -> {tender_cervical_regions}")
-        print(f"{DEBUG_MSG_PREFIX}tender_thoracic_regions -> {tender_thoracic_regions}")
-        print(f"{DEBUG_MSG_PREFIX}tender_lumbar_regions -> {tender_lumbar_regions}")
+        log.debug("tender_levels -> %s, unknown -> %s", get_levels(tender_levels), unknown_levels)
 
 
     # extract OBJECTIVE paragraph content
-    objective_paragraph = re.search(r"Objective\s+(.*?)\s+Assessment", normalized, re.DOTALL)
+    with span("parse.objective"):
+        objective_paragraph = re.search(r"Objective\s+(.*?)\s+Assessment", normalized, re.DOTALL)
     
-    # check null
-    if not objective_paragraph:
-        raise ValueError("No objective paragraph found")
+        # check null
+        if not objective_paragraph:
+            raise ValueError("No objective paragraph found")
         
-    # break up the paragraph into individual sentences, remove last element as it's blank
-    objective_sentences = objective_paragraph.group(1).strip().split(".")[:-1]
+        # break up the paragraph into individual sentences, remove last element as it's blank
+        objective_sentences = objective_paragraph.group(1).strip().split(".")[:-1]
     
-    # each sentence now has an index associated with it
+        # each sentence now has an index associated with it
     
-    # handle each case:
-    # - there are 2^3 cases. there are 3 distinct sections and each of them may or may not be present in the paragraph.
-    # - the hardest part is categorizing each sentence correctly to each section since this is not explicitly denoted and the wording varies.
-    # - having the index can be useful in SOME cases
+        # handle each case:
+        # - there are 2^3 cases. there are 3 distinct sections and each of them may or may not be present in the paragraph.
+        # - the hardest part is categorizing each sentence correctly to each section since this is not explicitly denoted and the wording varies.
+        # - having the index can be useful in SOME cases
     
     
-    # we can go through the individual sentences found in the objective section and easily find indices that are part of one section or the other.
-    # the most obvious pattern is the list of spinous levels which do split the paragraph into their distinct sections
-    # the only exception is lumbar as it mentions tender regions before listing its spinous process
+        # we can go through the individual sentences found in the objective section and easily find indices that are part of one section or the other.
+        # the most obvious pattern is the list of spinous levels which do split the paragraph into their distinct sections
+        # the only exception is lumbar as it mentions tender regions before listing its spinous process
     
-    # get the indices where the sections start
-    section_end_indices = []
-    for i, sentence in enumerate(objective_sentences):
-        if re.search(r"[A-Z]\d+", sentence):
-            section_end_indices.append(i)
+        # get the indices where the sections start
+        section_end_indices = []
+        for i, sentence in enumerate(objective_sentences):
+            if re.search(r"[A-Z]\d+", sentence):
+                section_end_indices.append(i)
             
-    # store sentences inside distinct regions within the objective paragraph
-    cervical_sentences = []
-    thoracic_sentences = []
-    lumbar_sentences = []
+        # store sentences inside distinct regions within the objective paragraph
+        cervical_sentences = []
+        thoracic_sentences = []
+        lumbar_sentences = []
             
-    # we can identify which section is which by referring to the regions we found in the previous paragraph
-    # handle each unique case by categorizing accordingly
-    if not tender_cervical_regions:
-        if not tender_thoracic_regions:
-            if not tender_lumbar_regions:
-                raise ValueError("No regions found. Check document syntax")
+        # we can identify which section is which by referring to the regions we found in the previous paragraph
+        # handle each unique case by categorizing accordingly
+        if not regions & CERVICAL:
+            if not regions & THORACIC:
+                if not regions & LUMBAR:
+                    raise ValueError("No regions found. Check document syntax")
+                else:
+                    # only lumbar region
+                    lumbar_sentences.extend(objective_sentences)
+                
             else:
-                # only lumbar region
-                lumbar_sentences.extend(objective_sentences)
+                if not regions & LUMBAR:
+                    # only thoracic region
+                    thoracic_sentences.extend(objective_sentences)
                 
+                else:            
+                    # thoracic, lumbar
+                    for i, sentence in enumerate(objective_sentences):
+                        if (i < section_end_indices[1]):
+                            thoracic_sentences.append(sentence)
+                        else:
+                            lumbar_sentences.append(sentence)
+            
         else:
-            if not tender_lumbar_regions:
-                # only thoracic region
-                thoracic_sentences.extend(objective_sentences)
+            if not regions & THORACIC:
+                if not regions & LUMBAR:
+                    # only cervical region
+                    cervical_sentences.extend(objective_sentences)
                 
-            else:            
-                # thoracic, lumbar
-                for i, sentence in enumerate(objective_sentences):
-                    if (i < section_end_indices[1]):
-                        thoracic_sentences.append(sentence)
-                    else:
-                        lumbar_sentences.append(sentence)
-            
-    else:
-        if not tender_thoracic_regions:
-            if not tender_lumbar_regions:
-                # only cervical region
-                cervical_sentences.extend(objective_sentences)
+                else:
+                    # cervical, lumbar
+                    for i, sentence in enumerate(objective_sentences):
+                        if (i < section_end_indices[1]):
+                            cervical_sentences.append(sentence)
+                        else:
+                            lumbar_sentences.append(sentence)
                 
             else:
-                # cervical, lumbar
-                for i, sentence in enumerate(objective_sentences):
-                    if (i < section_end_indices[1]):
-                        cervical_sentences.append(sentence)
-                    else:
-                        lumbar_sentences.append(sentence)
-                
-        else:
-            if not tender_lumbar_regions:
-                # cervical, thoracic
-                for i, sentence in enumerate(objective_sentences):
-                    if (i < section_end_indices[1]):
-                        cervical_sentences.append(sentence)
-                    else:
-                        thoracic_sentences.append(sentence)
-                
-            else:               
-                # all regions present 
-                for i, sentence in enumerate(objective_sentences):
-                    if (i < section_end_indices[1]):
-                        cervical_sentences.append(sentence)
-                    elif (i < section_end_indices[2]):
-                        thoracic_sentences.append(sentence)
-                    else:
-                        lumbar_sentences.append(sentence)
-        
-    # find and categorize sentences within each region
-    cervical_tone = ""
-    thoracic_tone = ""
-    lumbar_tone = ""
-    cervical_trigger = ""
-    thoracic_trigger = ""
-    lumbar_trigger = ""   
-    cervical_rom = ""
-    thoracic_rom = ""
-    lumbar_rom = ""  
-    cervical_pain = ""
-    thoracic_pain = ""
-    lumbar_pain = ""
-    if cervical_sentences:
-        for sentence in cervical_sentences:
-            if re.search(r"hypertonicity|increased tonus|muscle tone", sentence, re.IGNORECASE):
-                cervical_tone = sentence
-            if "trigger points" in sentence:
-                cervical_trigger = sentence
-            if re.search(r"ROM|range of motion|ranges of motion", sentence):
-                cervical_rom = sentence            
-            if re.search(r"experienced discomfort|experienced pain|complained|reported pain|pain was elicited|there is pain|there was pain|increased pain|felt discomfort", sentence):
-                cervical_pain = sentence                    
+                if not regions & LUMBAR:
+                    # cervical, thoracic
+                    for i, sentence in enumerate(objective_sentences):
+                        if (i < section_end_indices[1]):
+                            cervical_sentences.append(sentence)
+                        else:
+                            thoracic_sentences.append(sentence)
                 
-    if thoracic_sentences:
-        for sentence in thoracic_sentences:   
-            if re.search(r"hypertonicity|increased tonus|muscle tone", sentence, re.IGNORECASE):
-                thoracic_tone = sentence
-            if "trigger points" in sentence:
-                thoracic_trigger = sentence   
-            if re.search(r"ROM|range of motion|ranges of motion", sentence):
-                thoracic_rom = sentence                       
-            if re.search(r"experienced discomfort|experienced pain|complained|reported pain|pain was elicited|there is pain|there was pain|increased pain|felt discomfort", sentence):
-                thoracic_pain = sentence                       
+                else:               
+                    # all regions present 
+                    for i, sentence in enumerate(objective_sentences):
+                        if (i < section_end_indices[1]):
+                            cervical_sentences.append(sentence)
+                        elif (i < section_end_indices[2]):
+                            thoracic_sentences.append(sentence)
+                        else:
+                            lumbar_sentences.append(sentence)
+        
+        # find and categorize sentences within each region
+        cervical_tone = ""
+        thoracic_tone = ""
+        lumbar_tone = ""
+        cervical_trigger = ""
+        thoracic_trigger = ""
+        lumbar_trigger = ""   
+        cervical_rom = ""
+        thoracic_rom = ""
+        lumbar_rom = ""  
+        cervical_pain = ""
+        thoracic_pain = ""
+        lumbar_pain = ""
+        if cervical_sentences:
+            for sentence in cervical_sentences:
+                if re.search(r"hypertonicity|increased tonus|muscle tone", sentence, re.IGNORECASE):
+                    cervical_tone = sentence
+                if "trigger points" in sentence:
+                    cervical_trigger = sentence
+                if re.search(r"ROM|range of motion|ranges of motion", sentence):
+                    cervical_rom = sentence            
+                if re.search(r"experienced discomfort|experienced pain|complained|reported pain|pain was elicited|there is pain|there was pain|increased pain|felt discomfort", sentence):
+                    cervical_pain = sentence                    
                 
-    if lumbar_sentences:
-        for sentence in lumbar_sentences:    
-            if re.search(r"hypertonicity|increased tonus|muscle tone", sentence, re.IGNORECASE):
-                lumbar_tone = sentence
-            if "trigger points" in sentence:
-                lumbar_trigger = sentence    
-            if re.search(r"ROM|range of motion|ranges of motion", sentence):
-                lumbar_rom = sentence
-            if re.search(r"experienced discomfort|experienced pain|complained|reported pain|pain was elicited|there is pain|there was pain|increased pain|felt discomfort", sentence):
-                lumbar_pain = sentence                         
-    
-    sorted_cervical_sentences = [cervical_tone, cervical_trigger, cervical_rom, cervical_pain]
-    sorted_thoracic_sentences = [thoracic_tone, thoracic_trigger, thoracic_rom, thoracic_pain]
-    sorted_lumbar_sentences = [lumbar_tone, lumbar_trigger, lumbar_rom, lumbar_pain]
-    
-    treatment_match = re.search(r"Today\'s\s+Treatment*[:\-]*\s*(.*)", normalized, re.IGNORECASE | re.DOTALL)
-    if treatment_match:    
-        global treatment_content
-        treatment_content = treatment_match.group(1).strip()
-    
-    if debug_enabled:
-        print(f"{DEBUG_MSG_PREFIX}cervical_sentences -> {cervical_sentences}")
-        print(f"{DEBUG_MSG_PREFIX}cervical_tone -> {cervical_tone}")
-        print(f"{DEBUG_MSG_PREFIX}cervical_trigger -> {cervical_trigger}")
-        print(f"{DEBUG_MSG_PREFIX}cervical_rom -> {cervical_rom}")
-        print(f"{DEBUG_MSG_PREFIX}cervical_pain -> {cervical_pain}")
-
-        print(f"{DEBUG_MSG_PREFIX}thoracic_sentences -> {thoracic_sentences}")
-        print(f"{DEBUG_MSG_PREFIX}thoracic_tone -> {thoracic_tone}")
-        print(f"{DEBUG_MSG_PREFIX}thoracic_trigger -> {thoracic_trigger}")
-        print(f"{DEBUG_MSG_PREFIX}thoracic_rom -> {thoracic_rom}")        
-        print(f"{DEBUG_MSG_PREFIX}thoracic_pain -> {thoracic_pain}")
+        if thoracic_sentences:
+            for sentence in thoracic_sentences:   
+                if re.search(r"hypertonicity|increased tonus|muscle tone", sentence, re.IGNORECASE):
+                    thoracic_tone = sentence
+                if "trigger points" in sentence:
+                    thoracic_trigger = sentence   
+                if re.search(r"ROM|range of motion|ranges of motion", sentence):
+                    thoracic_rom = sentence                       
+                if re.search(r"experienced discomfort|experienced pain|complained|reported pain|pain was elicited|there is pain|there was pain|increased pain|felt discomfort", sentence):
+                    thoracic_pain = sentence                       
                 
-        print(f"{DEBUG_MSG_PREFIX}lumbar_sentences -> {lumbar_sentences}")
-        print(f"{DEBUG_MSG_PREFIX}lumbar_tone -> {lumbar_tone}")
-        print(f"{DEBUG_MSG_PREFIX}lumbar_trigger -> {lumbar_trigger}")
-        print(f"{DEBUG_MSG_PREFIX}lumbar_rom -> {lumbar_rom}")   
-        print(f"{DEBUG_MSG_PREFIX}lumbar_pain -> {lumbar_pain}")                 
-        
-        print(f"{DEBUG_MSG_PREFIX}sorted_cervical_sentences -> {sorted_cervical_sentences}")  
-        print(f"{DEBUG_MSG_PREFIX}sorted_thoracic_sentences -> {sorted_thoracic_sentences}")  
-        print(f"{DEBUG_MSG_PREFIX}sorted_lumbar_sentences -> {sorted_lumbar_sentences}")  
-        print(f"{DEBUG_MSG_PREFIX}section_end_indices -> {section_end_indices}")
-
+        if lumbar_sentences:
+            for sentence in lumbar_sentences:    
+                if re.search(r"hypertonicity|increased tonus|muscle tone", sentence, re.IGNORECASE):
+                    lumbar_tone = sentence
+                if "trigger points" in sentence:
+                    lumbar_trigger = sentence    
+                if re.search(r"ROM|range of motion|ranges of motion", sentence):
+                    lumbar_rom = sentence
+                if re.search(r"experienced discomfort|experienced pain|complained|reported pain|pain was elicited|there is pain|there was pain|increased pain|felt discomfort", sentence):
+                    lumbar_pain = sentence                         
+    
+        sorted_cervical_sentences = [cervical_tone, cervical_trigger, cervical_rom, cervical_pain]
+        sorted_thoracic_sentences = [thoracic_tone, thoracic_trigger, thoracic_rom, thoracic_pain]
+        sorted_lumbar_sentences = [lumbar_tone, lumbar_trigger, lumbar_rom, lumbar_pain]
+    
+    with span("parse.treatment"):
+        treatment_match = re.search(r"Today\'s\s+Treatment*[:\-]*\s*(.*)", normalized, re.IGNORECASE | re.DOTALL)
+        if treatment_match:    
+            global treatment_content
+            treatment_content = treatment_match.group(1).strip()
+    
+    log.debug("cervical_sentences -> %s", cervical_sentences)
+    log.debug("cervical_tone -> %s", cervical_tone)
+    log.debug("cervical_trigger -> %s", cervical_trigger)
+    log.debug("cervical_rom -> %s", cervical_rom)
+    log.debug("cervical_pain -> %s", cervical_pain)
+
+    log.debug("thoracic_sentences -> %s", thoracic_sentences)
+    log.debug("thoracic_tone -> %s", thoracic_tone)
+    log.debug("thoracic_trigger -> %s", thoracic_trigger)
+    log.debug("thoracic_rom -> %s", thoracic_rom)
+    log.debug("thoracic_pain -> %s", thoracic_pain)
+
+    log.debug("lumbar_sentences -> %s", lumbar_sentences)
+    log.debug("lumbar_tone -> %s", lumbar_tone)
+    log.debug("lumbar_trigger -> %s", lumbar_trigger)
+    log.debug("lumbar_rom -> %s", lumbar_rom)
+    log.debug("lumbar_pain -> %s", lumbar_pain)
+
+    log.debug("sorted_cervical_sentences -> %s", sorted_cervical_sentences)
+    log.debug("sorted_thoracic_sentences -> %s", sorted_thoracic_sentences)
+    log.debug("sorted_lumbar_sentences -> %s", sorted_lumbar_sentences)
+    log.debug("section_end_indices -> %s", section_end_indices)
+    count("notes_parsed")
+
+    
+def get_note_layout(path: str, stamp: tuple[int, int], raw_rtf: str) -> str:
+    # stamp is (size, mtime), a file is only fingerprinted again once it changes
+    # one entry per path, an edited file replaces its old entry instead of leaving it behind
+    entry = note_layouts.get(path)
+    if entry and entry[0] == stamp:
+        layout = entry[1]
+    else:
+        head = raw_rtf[:FINGERPRINT_SIZE]
+        layout = LAYOUT_STYLED if STYLED_FINGERPRINT.search(head) else LAYOUT_LEGACY
+        note_layouts[path] = (stamp, layout)
+    log.debug("layout -> %s", layout)
+    return layout
+
+
+def match_patient_header(text: str) -> re.Match | None:
+    # the active clinic first, the others only for notes written at another location
+    for profile in (clinic, *(profile for profile in clinics.values() if profile is not clinic)):
+        match = get_patient_pattern(profile).search(text)
+        if match:
+            return match
+    return None
+
+
+def match_street_address(pattern: re.Pattern, raw_rtf: str, last: str) -> re.Match | None:
+    # first match whose name paragraph ends with the patient's last name, matches can overlap
+    pos = 0
+    while match := pattern.search(raw_rtf, pos):
+        if match.group('name').strip().lower().endswith(last.lower()):
+            return match
+        pos = match.start() + 1
+    return None
+
+
+def load_clinic(path: str | None = None, key: str | None = None) -> ClinicProfile:
+    # sets the profile new notes are written with, path defaults to CLINICS_FILENAME in the notes directory
+    global clinic, clinics
+    if not path and os.path.isfile(os.path.join(NOTES_PATH, CLINICS_FILENAME)):
+        path = os.path.join(NOTES_PATH, CLINICS_FILENAME)
+    
+    if path:
+        clinics, default = load_clinics(path)
+    else:
+        clinics, default = {DEFAULT_CLINIC.key: DEFAULT_CLINIC}, DEFAULT_CLINIC.key
+    key = key or default
+    if key not in clinics:
+        raise ValueError(f"'{key}' is not a clinic, expected one of {', '.join(clinics)}")
     
+    clinic = clinics[key]
+    log.debug("clinic -> %s (%s)", clinic.key, clinic.name)
+    return clinic
+
+
+def set_clinic(profile: ClinicProfile, profiles: dict[str, ClinicProfile] | None = None) -> None:
+    # for worker processes, see Backfill.py
+    global clinic, clinics
+    clinic = profile
+    clinics = profiles or {profile.key: profile}
+
+
 def find_sentences(targets: list[str], destination: list[str], content: str, search_flag) -> bool:
-    # do search of target strings
-    group = rf"\b({'|'.join(map(re.escape, targets))})\b"
-    matches = re.findall(rf"([^.]*?{group}[^.]*\.)", content, search_flag)
-    
-    # clean then append matches to passed-in list
-    if matches:
-        for sentences in matches:
-            sentence = sentences[0]
-            destination.append(str(sentence).strip())
+    # one pass over the content no matter how many targets there are
+    matcher = get_keyword_matcher(tuple(targets), bool(search_flag & re.IGNORECASE))
+    spans = matcher.find_sentence_spans(content)
+    
+    # append matches to passed-in list
+    if spans:
+        for start, end in spans:
+            destination.append(content[start:end])
         return True
     
     # no matches found
-    print(f"{INFO_MSG_PREFIX}no sentences found, continuing...")
+    log.info("no sentences found, continuing...")
     return False
 
 
+@lru_cache(maxsize=None)
+def get_keyword_matcher(targets: tuple[str, ...], ignore_case: bool = True) -> KeywordMatcher:
+    # automatons are built once per set of targets and reused for every note
+    return KeywordMatcher(list(targets), ignore_case)
+
+
 def print_success_msg() -> None:
     print("\n=============")
     print("|  SUCCESS  |")
     print("=============\n")
     
     
+def check_calendar() -> None:
+    if tk is None:
+        raise ValueError("Picking dates on a calendar needs tkinter and tkcalendar, enter a visit schedule instead")
+
+
 def get_date_from_calendar() -> date | None:
+    check_calendar()
     selected_date: date | None = None
 
     root = tk.Tk()
@@ -674,6 +854,7 @@ def get_date_from_calendar() -> date | None:
     
     
 def get_multiple_dates_from_calendar() -> list:
+    check_calendar()
     selected_dates = set()
     
     root = tk.Tk()
@@ -730,70 +911,166 @@ def get_multiple_dates_from_calendar() -> list:
     return ordered_dates
 
     
+@timed("render.header")
 def add_header_section(date: Date) -> None:
+    # the header always comes first, so this starts a new document
+    global document
     if not patient:
         raise ValueError("Patient is None")
     
+    document = NoteDocument()
+    build_header(document, patient, date)
+
+
+def build_header(document: NoteDocument, patient: Patient, date: Date, profile: ClinicProfile | None = None) -> None:
     # do initial page set up
-    r.set_layout(ph=PAGE_HEIGHT, pw=PAGE_WIDTH, mt=MARGIN_TOP, mb=MARGIN_BOTTOM, ml=MARGIN_LEFT, mr=MARGIN_RIGHT)
+    document.layout = dict(ph=PAGE_HEIGHT, pw=PAGE_WIDTH, mt=MARGIN_TOP, mb=MARGIN_BOTTOM, ml=MARGIN_LEFT, mr=MARGIN_RIGHT)
     
-    # add page content
-    r.par("Back to Wellness", style="s26")
-    r.par("4629 168th St SW Ste B", style="s26")
-    r.par("Lynnwood, WA 98037", style="s26")
-    r.par("425-741-0600", style="s26")
-    r.par("Doctor: Sungjun Jung", style="s26")
+    # add page content, the clinic's blocks are cached per profile
+    document.blocks.extend(get_header_blocks(profile or clinic))
     
     # add patient info
-    r.par(f"{patient.get_full_name()}", style="s27")
-    r.par(f"{patient.get_street()}", style="s27")
-    r.par(f"{patient.get_address()}", style="s27")
-    r.par(f"Date of Birth: {patient.get_birthday().get_date_standard()}", style="s27")
+    document.add(Role.PATIENT, f"{patient.get_full_name()}")
+    document.add(Role.PATIENT, f"{patient.get_street()}")
+    document.add(Role.PATIENT, f"{patient.get_address()}")
+    document.add(Role.PATIENT, f"Date of Birth: {patient.get_birthday().get_date_standard()}")
 
     # add title
-    r.par("AutoSOAP Notes", style="s25") # title
+    document.add(Role.TITLE, "AutoSOAP Notes")
 
     # add date
-    r.par(f"{date.get_date_standard()}", style="s28")
+    document.add(Role.HEADING, f"{date.get_date_standard()}")
+
+
+def build_sections(document: NoteDocument, sections: list[str], treatment: str) -> None:
+    # sections are the subjective, objective, assessment and plan paragraphs in order
+    for heading, text in zip(SECTION_HEADINGS, sections):
+        document.add_section(heading, text)
+    document.add_section(END_HEADING, treatment)
+
+
+def write_document(directory: str, name: str, exports: list[str] = (), verify: bool = True) -> None:
+    # the .rtf is always written, later notes are generated from it
+    # - with verify, it is written to a staging directory first and only moved into place once it parses back
+    #   to the same patient, ratings, regions and treatment, see verify_note()
+    # - verifying re-parses the note, the globals describe the written note afterwards
+    with span("render.write"):
+        if verify:
+            expected = get_expected_record()
+            with tempfile.TemporaryDirectory(dir=directory) as staging:
+                write_note(document, staging, name, "rtf")
+                verify_note(staging, f"{name}.rtf", expected)
+                os.replace(os.path.join(staging, f"{name}.rtf"), os.path.join(directory, f"{name}.rtf"))
+        else:
+            write_note(document, directory, name, "rtf")
+        
+        for fmt in exports:
+            if fmt != "rtf":
+                write_note(document, directory, name, fmt)
+
+
+def get_expected_record() -> dict:
+    # the VERIFY_FIELDS of the note being generated, taken from its inputs
+    if not patient or note_ratings is None:
+        raise ValueError("Patient is None")
+    
+    birthday = patient.get_birthday()
+    return {
+        "first_name": patient.get_first_name(),
+        "last_name": patient.get_last_name(),
+        "title": patient.get_title(),
+        "street": patient.get_street(),
+        "address": patient.get_address(),
+        "dob": f"{birthday.get_year():04d}-{birthday.get_month():02d}-{birthday.get_day():02d}",
+        "ratings": note_ratings.get_ratings(),
+        "tender_levels": tender_levels,
+        "treatment": treatment_content,
+    }
 
 
-def generate_content(complaint_ratings=None) -> None:
-    global patient, tender_cervical_regions, tender_thoracic_regions, tender_lumbar_regions, sorted_cervical_sentences, sorted_thoracic_sentences, sorted_lumbar_sentences, treatment_content
+@timed("verify")
+def verify_note(directory: str, filename: str, expected: dict) -> None:
+    # parse the rendered note back like the next fill would, raises ValueError if anything came back different
+    try:
+        parsed = collect_note_record(directory, filename)
+    except ValueError as e:
+        count("verify_failures")
+        raise ValueError(f"{filename} was not written, it can not be parsed back: {e}")
+    
+    mismatched = [field for field in VERIFY_FIELDS if parsed[field] != expected[field]]
+    if mismatched:
+        count("verify_failures")
+        for field in mismatched:
+            log.debug("%s -> expected %s, parsed %s", field, expected[field], parsed[field])
+        raise ValueError(f"{filename} was not written, {', '.join(mismatched)} did not parse back the same")
+    count("notes_verified")
+
+
+def generate_content(complaint_ratings=None, similarity: SimilarityIndex | None = None) -> bytes | None:
+    # returns the note's MinHash signature if similarity is given, see NoteSimilarity.py
+    global patient, tender_levels, sorted_cervical_sentences, sorted_thoracic_sentences, sorted_lumbar_sentences, treatment_content
     if not patient:
         raise ValueError("Patient is None")
     
     sorted_sentences = {
-        "tender_cervical": tender_cervical_regions,
-        "tender_thoracic": tender_thoracic_regions,
-        "tender_lumbar": tender_lumbar_regions,
+        "tender_levels": tender_levels,
+        "unknown_levels": tuple(unknown_levels),
         "sorted_cervical": sorted_cervical_sentences,
         "sorted_thoracic": sorted_thoracic_sentences,
         "sorted_lumbar": sorted_lumbar_sentences,
     }
     
-    note = Note(patient, sorted_sentences, complaint_ratings)
+    global note_ratings
+    with span("generate.note_init"):
+        note = Note(patient, sorted_sentences, complaint_ratings)
+    note_ratings = note.target_ratings
+
+    # generate sections, again if they come out too close to a note already in the chart
+    signature = None
+    for attempt in range(MAX_REGENERATE + 1):
+        if attempt:
+            note.regenerate()
+        with span("generate.subjective"):
+            subjective = note.get_paragraph(Sections.SUBJECTIVE.value)
+        with span("generate.objective"):
+            objective = note.get_paragraph(Sections.OBJECTIVE.value)
+        with span("generate.assessment"):
+            assessment = note.get_paragraph(Sections.ASSESSMENT.value)
+        with span("generate.plan"):
+            plan = note.get_paragraph(Sections.PLAN.value)
+        
+        if similarity is None:
+            break
+        with span("generate.similarity"):
+            signature = get_signature([subjective, objective, assessment, plan])
+            match, score = similarity.find_similar(signature)
+        if match is None:
+            break
+        if attempt < MAX_REGENERATE:
+            log.info("Generated note is %.2f similar to <%s>, regenerating...", score, os.path.basename(match))
+        else:
+            count("near_duplicates")
+            log.warning("Generated note is still %.2f similar to <%s> after %d attempts, writing it anyway.",
+                        score, os.path.basename(match), MAX_REGENERATE + 1, extra={"fields": {"event": "near_duplicate", "match": match, "similarity": score}})
 
     # add sections
-    r.par(f"Subjective Complaint", style="s28")
-    r.par(note.get_paragraph(Sections.SUBJECTIVE.value), style="s21")
-    r.par(f"Objective", style="s28")
-    r.par(note.get_paragraph(Sections.OBJECTIVE.value), style="s21")
-    r.par(f"Assessment", style="s28")
-    r.par(note.get_paragraph(Sections.ASSESSMENT.value), style="s21")
-    r.par(f"Plan", style="s28")
-    r.par(note.get_paragraph(Sections.PLAN.value), style="s21")
-    r.par(f"Today\'s Treatment", style="s28")
-    r.par(treatment_content, style="s21")
-
-
-def do_single_fill() -> None:
+    with span("render.sections"):
+        build_sections(document, [subjective, objective, assessment, plan], treatment_content)
+    
+    return signature
+
+
+@timed("single_fill")
+def do_single_fill(exports: list[str] = (), verify: bool = True) -> None:
     # get patient info from notes
-    print(f"Retieving patient info...")
+    log.info("Retieving patient info...")
     filename = find_previous_note()
     
     # ensure filename follows this syntax:
     # i.e. -> SD_First_Last_1 ... SD_First_Last_10
     retrieve_info_from_SD(filename)
+    if patient:
+        set_patient(patient.get_full_name())
     
     match = re.search(r"_\d+", filename)
     if not match:
@@ -811,29 +1088,70 @@ def do_single_fill() -> None:
     else:
         raise ValueError("Recieved date is None")
 
-    add_header_section(temp)
-    generate_content()
-    
-    # add footer text
-    if patient:
-        r.set_footer(line1=patient.get_full_name(), line2="Confidential")
-        new_filename = f"SD_{patient.get_first_name()}_{patient.get_last_name()}_{doc_id}"
-        r.create(new_filename, NOTES_PATH) # output .rtf file to parent directory
-        print(f"\n{INFO_MSG_PREFIX}Document successfully saved as <{new_filename}.rtf>!")
+    index = NoteIndex(os.path.join(NOTES_PATH, INDEX_FILENAME))
+    try:
+        similarity = load_chart_similarity(NOTES_PATH, index)
+        
+        add_header_section(temp)
+        signature = generate_content(similarity=similarity)
+        
+        # add footer text
+        if patient:
+            document.set_footer(patient.get_full_name(), "Confidential")
+            new_filename = f"SD_{patient.get_first_name()}_{patient.get_last_name()}_{doc_id}"
+            write_document(NOTES_PATH, new_filename, exports, verify) # output .rtf file to parent directory
+            remember_note_signature(similarity, index, os.path.join(NOTES_PATH, f"{new_filename}.rtf"), signature)
+            count("notes_written")
+            log.info("Document successfully saved as <%s.rtf>!", new_filename)
+    finally:
+        index.close()
         
     print_success_msg()
     
 
-def do_multi_fill() -> None:
+def get_visit_dates(schedule: str | None = None, closures_path: str | None = None, pick_dates: bool = False) -> list[Date]:
+    # dates come from a schedule rule, the calendar is only used when asked for
+    if pick_dates:
+        return get_multiple_dates_from_calendar()
+    
+    closures = frozenset()
+    if not closures_path and os.path.isfile(os.path.join(NOTES_PATH, CLOSURES_FILENAME)):
+        closures_path = os.path.join(NOTES_PATH, CLOSURES_FILENAME)
+    if closures_path:
+        closures = load_closures(closures_path)
+        log.debug("closures -> %d day(s) from %s", len(closures), closures_path)
+    scheduler = Scheduler(closures)
+    
+    if schedule:
+        return scheduler.expand(ScheduleRule.parse(schedule))
+    
+    while True:
+        user_input = input("Please enter the visit schedule (i.e. 'Mon/Wed/Fri from 1/5 to 3/27'): ")
+        try:
+            dates = scheduler.expand(ScheduleRule.parse(user_input))
+        except ValueError as e:
+            print(f"{e}. Try again.")
+            continue
+        if not dates:
+            print("The schedule has no visits. Try again.")
+            continue
+        log.info("Scheduled %d visit(s), %s to %s.", len(dates), dates[0].get_date_standard(), dates[-1].get_date_standard())
+        return dates
+
+
+@timed("multi_fill")
+def do_multi_fill(schedule: str | None = None, closures_path: str | None = None, pick_dates: bool = False,
+                  exports: list[str] = (), verify: bool = True, dry_run: str | None = None, seed: int | None = None) -> None:
     global patient
     
-    print(f"{INFO_MSG_PREFIX}Retieving patient info...")
+    log.info("Retieving patient info...")
     filename = find_previous_note()
     retrieve_info_from_SD(filename)    
     
     # check if null    
     if not patient:
         raise ValueError("Patient is None")    
+    set_patient(patient.get_full_name())
     
     # starts from a prev note
     # prompt the user to get the number of notes to generate
@@ -843,53 +1161,416 @@ def do_multi_fill() -> None:
     # ensure naming convention is followed by all notes created
     # get patient info from notes
     
-    dates = get_multiple_dates_from_calendar()
+    # final pain/health, trajectories and sentences are drawn from the seed, a dry run and a real run with the same seed match
+    if seed is None:
+        seed = random.randrange(2**32)
+    random.seed(seed)
+    log.info("Run seed %d, pass --seed %d to repeat this run.", seed, seed)
+    
+    dates = get_visit_dates(schedule, closures_path, pick_dates)
     final_ratings = get_final_ratings()
     
+    # dry_run is a plan format, the plan is printed and nothing is rendered or written
+    if dry_run:
+        print(format_plans([plan_multi_fill(dates, final_ratings)], dry_run))
+        return
+    
+    # notes are written on a worker thread, Ctrl+C stops after the note being written
+    job = GenerationJob(run_multi_fill, dates, final_ratings, exports=exports, verify=verify)
+    job.start()
+    try:
+        event = job.wait(log_progress_event)
+    except KeyboardInterrupt:
+        log.info("Cancelling, the current note will be finished first...")
+        job.cancel()
+        event = job.wait(log_progress_event)
+    
+    if event.state is JobState.FAILED:
+        raise ValueError(event.error)
+    
+
+def log_progress_event(event: ProgressEvent) -> None:
+    if event.state is JobState.RUNNING and event.current_file:
+        eta = f", about {max(event.eta, 1):.0f}s left" if event.done < event.total else ""
+        log.info("%d of %d note(s) written%s.", event.done, event.total, eta)
+    elif event.state is JobState.CANCELLED:
+        log.info("Stopped with %d of %d note(s) written.", event.done, event.total)
+    
+
+def run_multi_fill(dates: list, final_ratings: array | None, directory: str | None = None, trajectories=None,
+                   exports: list[str] = (), verify: bool = True, progress=None, cancel=None,
+                   similarity: SimilarityIndex | None = None) -> list[str]:
+    # non-interactive part of do_multi_fill(), writes one note per date into directory and returns the filenames
+    # - final_ratings is aligned with the ratings of the previous note in directory
+    # - trajectories replaces final_ratings with paths planned ahead, see TrajectoryPlan.get_patient()
+    # - each new note is generated from the one written before it, exports are extra formats written next to it
+    # - with verify, each note is parsed back before it is written, see write_document()
+    # - progress(done, total, filename) is called after each note, filename is None before the first and for a date with no note
+    # - no new note is started once cancel (a threading.Event) is set, see GenerationJob.py
+    # - similarity is the chart's notes to check against, loaded from directory when not given
+    directory = directory or NOTES_PATH
+    _, complaint_ratings = prepare_multi_fill(dates, final_ratings, directory, trajectories)
+    
+    # new notes are checked against the chart and against each other
+    index = NoteIndex(os.path.join(directory, INDEX_FILENAME))
+    try:
+        return write_multi_fill_notes(dates, complaint_ratings, directory, index, exports, verify, progress, cancel, similarity)
+    finally:
+        index.close()
+
+
+@timed("multi_fill.prepare")
+def prepare_multi_fill(dates: list, final_ratings: array | None, directory: str, trajectories=None) -> tuple[str, list[array]]:
+    # parses the previous note in directory and returns its filename with one rating trajectory per complaint
+    # - trajectory[i] is the rating of the i-th new note, trajectory[0] is the previous note's
+    if not dates:
+        raise ValueError("Recieved dates is None")
+    if final_ratings is None and trajectories is None:
+        raise ValueError("Recieved final_ratings is None")
+    
+    clear_globals()
+    filename = find_previous_note(directory)
+    retrieve_info_from_SD(filename, directory)
+    if not patient:
+        raise ValueError("Patient is None")
+    
     # for each complaint, generate a list of numbers using the algo
     # we only need to generate this ONCE per fill
-    complaint_ratings = []
-    for i, (complaint, rating) in enumerate(patient.get_ratings().items()):
-        complaint_ratings.append(get_guaranteed_staircase_path(start=rating, target=final_ratings[i], total_runs=len(dates)))
+    if trajectories is not None:
+        if len(trajectories) != len(patient.ratings.get_values()) or len(trajectories[0]) != len(dates) + 1:
+            raise ValueError(f"Trajectories do not match {len(patient.ratings.get_values())} ratings over {len(dates)} dates")
+        complaint_ratings = list(trajectories) # rows are views, nothing is copied
+    else:
+        complaint_ratings = []
+        for rating, final_rating in zip(patient.ratings.get_values(), final_ratings):
+            complaint_ratings.append(array('b', get_guaranteed_staircase_path(start=rating, target=final_rating, total_runs=len(dates))))
     
     for ratings in complaint_ratings:
-        print(ratings)
-    
-    if dates:
-        global r
-        for date in dates:
-            clear_globals()
-            print(f"{INFO_MSG_PREFIX}Retieving patient info...")
-            filename = find_previous_note()
-            retrieve_info_from_SD(filename)
-            
-            match = re.search(r"_\d+", filename)
-            if not match:
-                raise ValueError(f"{filename}: filename is not numbered and/or formatted correctly. Make sure the filename looks like this -> SD_First_Last_2")
-            
-            doc_id = int(re.sub(r"[^\d]", "", match.group(0).strip()))
-            doc_id += 1
-            
-            temp = Date(date.month, date.day, date.year)
-            add_header_section(temp)
-            
-            # the target ratings are already generated, pass this in
-            generate_content(complaint_ratings)
-            
-            # add footer text
-            if patient:
-                r.set_footer(line1=patient.get_full_name(), line2="Confidential")
-                new_filename = f"SD_{patient.get_first_name()}_{patient.get_last_name()}_{doc_id}"
-                r.create(new_filename, NOTES_PATH) # output .rtf file to parent directory
-                print(f"\n{INFO_MSG_PREFIX}Document successfully saved as <{new_filename}.rtf>!")
-            
-            # reset rtf obj
-            r = simplertf.RTF("'AutoSOAP' by dkim03")
-            r.stylesheet = "English"
-            
+        log.debug("trajectory -> %s", ratings.tolist())
+    reset_note_counter()
+    return filename, complaint_ratings
+
+
+@timed("multi_fill.plan")
+def plan_multi_fill(dates: list, final_ratings: array | None, directory: str | None = None, trajectories=None) -> FillPlan:
+    # what run_multi_fill() would write with the same arguments and random state, without rendering anything
+    directory = directory or NOTES_PATH
+    previous_note, complaint_ratings = prepare_multi_fill(dates, final_ratings, directory, trajectories)
+    
+    match = re.search(r"_\d+", previous_note)
+    if not match:
+        raise ValueError(f"{previous_note}: filename is not numbered and/or formatted correctly. Make sure the filename looks like this -> SD_First_Last_2")
+    doc_id = int(re.sub(r"[^\d]", "", match.group(0).strip()))
+    
+    complaint_ids = patient.ratings.get_complaint_ids()
+    notes = []
+    for idx, date in enumerate(dates, 1):
+        values = {complaint_id: trajectory[idx] for complaint_id, trajectory in zip(complaint_ids, complaint_ratings)}
+        notes.append(PlannedNote(
+            filename=f"SD_{patient.get_first_name()}_{patient.get_last_name()}_{doc_id + idx}.rtf",
+            date=f"{date.year:04d}-{date.month:02d}-{date.day:02d}",
+            ratings={get_complaint_name(complaint_id): int(value) for complaint_id, value in values.items() if not is_overall_rating(complaint_id)},
+            pain=int(values[PAIN_ID]),
+            health=int(values[HEALTH_ID]),
+        ))
+    return FillPlan(directory, previous_note, tuple(notes))
+
+
+def write_multi_fill_notes(dates: list, complaint_ratings: list[array], directory: str, index: NoteIndex,
+                           exports: list[str] = (), verify: bool = True, progress=None, cancel=None,
+                           similarity: SimilarityIndex | None = None) -> list[str]:
+    if similarity is None:
+        similarity = load_chart_similarity(directory, index)
+    
+    written = []
+    if progress:
+        progress(0, len(dates), None)
+    for date in dates:
+        current = None # the note written for this date, if any
+        if cancel is not None and cancel.is_set():
+            log.info("Cancelled after %d of %d note(s).", len(written), len(dates))
+            break
+        clear_globals()
+        log.info("Retieving patient info...")
+        filename = find_previous_note(directory)
+        retrieve_info_from_SD(filename, directory)
+        
+        match = re.search(r"_\d+", filename)
+        if not match:
+            raise ValueError(f"{filename}: filename is not numbered and/or formatted correctly. Make sure the filename looks like this -> SD_First_Last_2")
+        
+        doc_id = int(re.sub(r"[^\d]", "", match.group(0).strip()))
+        doc_id += 1
+        
+        temp = Date(date.month, date.day, date.year)
+        add_header_section(temp)
+        
+        # the target ratings are already generated, pass this in
+        signature = generate_content(complaint_ratings, similarity)
+        
+        # add footer text
+        if patient:
+            document.set_footer(patient.get_full_name(), "Confidential")
+            new_filename = f"SD_{patient.get_first_name()}_{patient.get_last_name()}_{doc_id}"
+            write_document(directory, new_filename, exports, verify) # output .rtf file to parent directory
+            remember_note_signature(similarity, index, os.path.join(directory, f"{new_filename}.rtf"), signature)
+            count("notes_written")
+            log.info("Document successfully saved as <%s.rtf>!", new_filename)
+            current = f"{new_filename}.rtf"
+            written.append(current)
+        
+        # None when this date wrote no note, the last file is not reported twice
+        if progress:
+            progress(len(written), len(dates), current)
+    
+    return written
+    
+
+@timed("scan.find_indexable_notes")
+def find_indexable_notes(root: str | None = None) -> list[tuple[str, str]]:
+    # walk the whole notes tree, returns (directory, filename) for every SD, EI, EN, EF .rtf file
+    found = []
+    for directory, _, filenames in os.walk(root or NOTES_PATH):
+        for filename in filenames:
+            if filename.endswith('.rtf') and re.match(NOTE_KIND_PATTERN, filename):
+                found.append((directory, filename))
+    
+    found.sort(key=lambda entry: (entry[0], natural_sort_key(entry[1])))
+    return found
+
+
+def collect_note_record(directory: str, filename: str) -> dict:
+    # run the usual extraction, then copy the parsed globals into a standalone record
+    clear_globals()
+    retrieve_info_from_SD(filename, directory)
+    
+    if not patient:
+        raise ValueError("Patient is None")
+    
+    doc_number = None
+    match = re.search(r"_(\d+)\.rtf$", filename)
+    if match:
+        doc_number = int(match.group(1))
+    
+    visit_date = None
+    if note_date and note_date.get_year() != UNSET:
+        visit_date = f"{note_date.get_year():04d}-{note_date.get_month():02d}-{note_date.get_day():02d}"
+        
+    birthday = patient.get_birthday()
+    return {
+        "path": os.path.join(directory, filename),
+        "kind": re.match(NOTE_KIND_PATTERN, filename).group(1),
+        "doc_number": doc_number,
+        "visit_date": visit_date,
+        "first_name": patient.get_first_name(),
+        "last_name": patient.get_last_name(),
+        "title": patient.get_title(),
+        "street": patient.get_street(),
+        "address": patient.get_address(),
+        "dob": f"{birthday.get_year():04d}-{birthday.get_month():02d}-{birthday.get_day():02d}",
+        "ratings": dict(patient.get_ratings()),
+        "tender_levels": tender_levels,
+        "objective_sentences": {
+            "cervical": list(sorted_cervical_sentences),
+            "thoracic": list(sorted_thoracic_sentences),
+            "lumbar": list(sorted_lumbar_sentences),
+        },
+        "treatment": treatment_content,
+    }
+
+
+def read_note_text(path: str) -> str:
+    with open(path, 'r', encoding='cp1252') as f:
+        return str(rtf_to_text(f.read()))
+
+
+@timed("similarity.load")
+def load_chart_similarity(directory: str, index: NoteIndex) -> SimilarityIndex:
+    # signatures of every SD note in directory, only files whose content changed since they were cached are read
+    # - size and mtime are checked first, files are only hashed if either changed, like sync_notes_index()
+    paths = [
+        os.path.join(directory, f) for f in os.listdir(directory)
+        if f.endswith('.rtf') and 'SD' in f and os.path.isfile(os.path.join(directory, f))
+    ]
+    cached = index.get_signatures(paths)
+    
+    similarity = SimilarityIndex(SIMILARITY_THRESHOLD)
+    new_entries = []
+    for path in paths:
+        stat = os.stat(path)
+        entry = cached.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            similarity.add(path, entry[3])
+            count("cache_hits")
+            continue
+        
+        # a file that was touched but has the same content keeps its signature, with the new stamp
+        content_hash = hash_file(path)
+        if entry and entry[2] == content_hash:
+            signature = entry[3]
+            count("cache_hits")
+        else:
+            signature = get_signature(get_note_sections(read_note_text(path)))
+        new_entries.append((path, stat.st_size, stat.st_mtime_ns, content_hash, signature))
+        similarity.add(path, signature)
+    
+    index.save_signatures(new_entries)
+    return similarity
+
+
+def remember_note_signature(similarity: SimilarityIndex, index: NoteIndex, path: str, signature: bytes | None) -> None:
+    # so the next note generated in this run, and later runs, are compared against it
+    if signature is None:
+        return
+    similarity.add(path, signature)
+    stat = os.stat(path)
+    index.save_signatures([(path, stat.st_size, stat.st_mtime_ns, hash_file(path), signature)])
+
+
+def parse_note_chunk(paths: list[str]) -> list[ParsedNote | tuple[str, str]]:
+    # worker side of parse_notes(), every process parses into its own globals so nothing is shared
+    results = []
+    for path in paths:
+        directory, filename = os.path.split(path)
+        try:
+            results.append(ParsedNote.from_record(collect_note_record(directory, filename)))
+        except Exception as e: # a mangled note can fail in ways the parser doesn't check for
+            results.append((path, str(e)))
+    return results
+
+
+@timed("parse_notes")
+def parse_notes(paths: list[str], workers: int | None = None, chunk_size: int | None = None,
+                progress=None) -> tuple[list[ParsedNote], list[tuple[str, str]]]:
+    # parse many notes across a process pool, returns (parsed notes, [(path, error)]) in input order
+    # - a note that fails to parse is reported as a failure, the rest keep going
+    # - progress(done, total) is called as each chunk finishes
+    # - small batches, or workers=1, are parsed in this process to skip the pool start up
+    total = len(paths)
+    workers = workers or os.cpu_count() or 1
+    if not chunk_size:
+        # a few chunks per worker so a slow chunk doesn't leave the others idle
+        chunk_size = max(1, min(PARSE_CHUNK_SIZE, -(-total // (workers * 4))))
+    chunks = [paths[i:i + chunk_size] for i in range(0, total, chunk_size)]
+    workers = min(workers, len(chunks))
+    
+    chunk_results = [None] * len(chunks)
+    done = 0
+    if workers <= 1:
+        for i, chunk in enumerate(chunks):
+            chunk_results[i] = parse_note_chunk(chunk)
+            done += len(chunk)
+            if progress:
+                progress(done, total)
     else:
-        raise ValueError("Recieved dates is None")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(parse_note_chunk, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                i = futures[future]
+                chunk_results[i] = future.result()
+                done += len(chunks[i])
+                if progress:
+                    progress(done, total)
+        # counters are per process, count what the workers parsed here
+        count("notes_parsed", sum(isinstance(result, ParsedNote) for results in chunk_results for result in results))
+    
+    notes = []
+    failures = []
+    for results in chunk_results:
+        for result in results:
+            if isinstance(result, ParsedNote):
+                notes.append(result)
+            else:
+                failures.append(result)
+    count("failures", len(failures))
+    return notes, failures
+
+
+def hash_file(path: str) -> str:
+    # hash in blocks so large files don't have to be held in memory
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sync_notes_index(index: NoteIndex, root: str | None = None) -> dict[str, int]:
+    # only parse files that were added or changed since the last sync, and retire the deleted ones
+    # - size and mtime are checked first, files are only hashed if either changed
+    # - a file that was touched but has the same content is not parsed again
+    snapshot = index.get_file_snapshot()
+    seen = set()
+    
+    pending = []
+    file_entries = []
+    unchanged = 0
+    for directory, filename in find_indexable_notes(root):
+        path = os.path.join(directory, filename)
+        seen.add(path)
+        
+        stat = os.stat(path)
+        previous = snapshot.get(path)
+        if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+            unchanged += 1
+            count("cache_hits")
+            continue
+        
+        content_hash = hash_file(path)
+        if previous and previous[2] == content_hash:
+            unchanged += 1
+            count("cache_hits")
+            file_entries.append((path, stat.st_size, stat.st_mtime_ns, content_hash, previous[3]))
+            continue
+        
+        pending.append((path, stat.st_size, stat.st_mtime_ns, content_hash))
+    
+    # keep going past badly formatted notes, one should not stop the whole sync
+    notes, failures = parse_notes([entry[0] for entry in pending], progress=log_parse_progress)
+    errors = dict(failures)
+    for path, error in failures:
+        log.error("%s: %s", os.path.basename(path), error, extra={"fields": {"path": path}})
+    file_entries.extend((path, size, mtime_ns, content_hash, errors.get(path)) for path, size, mtime_ns, content_hash in pending)
+    failed_paths = list(errors)
+    
+    deleted_paths = [path for path in snapshot if path not in seen]
+    
+    # stale data from a file that no longer parses is retired too
+    index.retire_files(deleted_paths + failed_paths)
+    index.add_notes([note.to_record() for note in notes])
+    index.record_files(file_entries)
+    
+    return {
+        "parsed": len(notes),
+        "failed": len(failed_paths),
+        "unchanged": unchanged,
+        "deleted": len(deleted_paths),
+    }
+
+
+def log_parse_progress(done: int, total: int) -> None:
+    # roughly every 10%, plus the last file
+    step = max(1, total // 10)
+    if done == total or done // step != (done - 1) // step:
+        log.info("Parsed %d/%d file(s)...", done, total, extra={"fields": {"event": "parse_progress", "done": done, "total": total}})
+
+
+@timed("index_notes")
+def do_index_notes() -> None:
+    log.info("Syncing notes and exams under <%s>...", NOTES_PATH)
     
+    index = NoteIndex(INDEX_PATH)
+    try:
+        counts = sync_notes_index(index, NOTES_PATH)
+        total = index.get_note_count()
+    finally:
+        index.close()
+    
+    log.info("Parsed %d new or changed file(s), %d failed, %d unchanged, %d removed. Index now holds %d file(s) <%s>.",
+             counts['parsed'], counts['failed'], counts['unchanged'], counts['deleted'], total, INDEX_PATH,
+             extra={"fields": {"event": "index_sync", **counts, "total": total}})
+    print_success_msg()
+
 
 # TODO
 def do_full_fill() -> None:
@@ -900,54 +1581,70 @@ def do_full_fill() -> None:
     pass
 
 
-def get_final_ratings() -> list[int]:
+def get_final_ratings() -> array:
+    # returns one final rating per entry in the patient's ratings, in the same order
     global patient
     
     # check if null
     if not patient:
         raise ValueError("Patient is None")   
     
-    final_ratings = []
+    targets = {}
+    for complaint_id, rating in zip(patient.ratings.get_complaint_ids(), patient.ratings.get_values()):
+        if is_overall_rating(complaint_id):
+            continue
+        while True:
+            user_input = input(f"Please enter a final target rating for {get_complaint_name(complaint_id)}, starting at {rating}: ")
+            if not re.fullmatch(r'[0-9]', user_input):
+                print("Invalid input, please enter a number in the range 0-9. Try again.")
+            else:
+                targets[complaint_id] = int(user_input)
+                break
+    
+    return build_final_ratings(patient.ratings, targets)
+
+
+def build_final_ratings(ratings: Ratings, targets: dict[int, int]) -> array:
+    # targets maps complaint ID -> final rating for every complaint, overall pain and health are derived from them
     rating_ceiling = 10
     total_pain = 0
-    ratings = patient.get_ratings()
-    for complaint, rating in ratings.items():
-        getting_input = True
-        if complaint != "pain" and complaint != "health":
-            while getting_input:
-                user_input = input(f"Please enter a final target rating for {complaint}, starting at {rating}: ")
-                if not re.fullmatch(r'[0-9]', user_input):
-                    print("Invalid input, please enter a number in the range 0-9. Try again.")
-                else:
-                    final_ratings.append(int(user_input))
-                    getting_input = False
-                
-                    # higher pain ratings contribute more to the overall pain value
-                    # can tweak this so that age/gender affects perceived pain values
-                    bonus_pain_value = 0
-                    if int(user_input) > 4 and len(ratings) > 4:
-                        bonus_pain_value += (len(ratings)-4)
-                    
-                    total_pain += int(user_input) + bonus_pain_value # add up pain
-                    getting_input = False
+    complaint_ids = ratings.get_complaint_ids()
+    final_ratings = array('b', ratings.get_values())
+    for i, complaint_id in enumerate(complaint_ids):
+        if is_overall_rating(complaint_id):
+            continue
+        if complaint_id not in targets:
+            raise ValueError(f"No final target rating for {get_complaint_name(complaint_id)}")
+        final_ratings[i] = targets[complaint_id]
+        
+        # higher pain ratings contribute more to the overall pain value
+        # can tweak this so that age/gender affects perceived pain values
+        bonus_pain_value = 0
+        if targets[complaint_id] > 4 and len(complaint_ids) > 4:
+            bonus_pain_value += (len(complaint_ids)-4)
+        
+        total_pain += targets[complaint_id] + bonus_pain_value # add up pain
             
     # calculate pain and health and
-    avg_pain = min(round(total_pain / (len(ratings)-2)) + random.randint(0, 1), 10)
+    avg_pain = min(round(total_pain / (len(complaint_ids)-2)) + random.randint(0, 1), 10)
     health = max((rating_ceiling - avg_pain) + random.randint(-3, 0), 0)             
     
-    final_ratings.append(avg_pain)
-    final_ratings.append(health)   
+    final_ratings[complaint_ids.index(PAIN_ID)] = avg_pain
+    final_ratings[complaint_ids.index(HEALTH_ID)] = health
 
     return final_ratings
 
 
 def clear_globals() -> None:
-    tender_cervical_regions.clear()
-    tender_thoracic_regions.clear()
-    tender_lumbar_regions.clear()
+    global note_date, tender_levels, treatment_content, note_ratings
+    tender_levels = 0
+    unknown_levels.clear()
     sorted_cervical_sentences.clear()
-    sorted_thoracic_sentences.clear
+    sorted_thoracic_sentences.clear()
     sorted_lumbar_sentences.clear()
+    note_date = None
+    treatment_content = ""
+    note_ratings = None
 
 
 def get_guaranteed_staircase_path(start, target, total_runs) -> list[int]:
@@ -989,24 +1686,99 @@ def get_guaranteed_staircase_path(start, target, total_runs) -> list[int]:
     return path
 
         
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="AutoSOAP: generate SOAP notes in-between existing exams.")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a timing tree of every stage when the run ends")
+    parser.add_argument("--profile-stats", metavar="FILE",
+                        help="with --profile, also save a cProfile/pstats dump to FILE")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="with --profile, also save a Chrome trace (chrome://tracing) to FILE")
+    parser.add_argument("--log-json", metavar="FILE",
+                        help="also write every log record as a JSON line to FILE")
+    parser.add_argument("--schedule", metavar="RULE",
+                        help="MULTI FILL visit schedule, i.e. 'Mon/Wed/Fri from 1/5 to 3/27', asked for when not given")
+    parser.add_argument("--closures", metavar="FILE",
+                        help=f"clinic closures to skip, defaults to {CLOSURES_FILENAME} in the notes directory if it exists")
+    parser.add_argument("--clinics", metavar="FILE",
+                        help=f"clinic profiles, defaults to {CLINICS_FILENAME} in the notes directory if it exists")
+    parser.add_argument("--clinic", metavar="NAME",
+                        help="profile new notes are written with, defaults to the config's default")
+    parser.add_argument("--export", action="append", default=[], choices=FORMATS[1:], metavar="FORMAT",
+                        help=f"also write each note as {', '.join(FORMATS[1:])}, can be repeated. The .rtf is always written")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="skip parsing each note back before it is written, for trusted batches")
+    parser.add_argument("--dry-run", nargs="?", const="table", choices=PLAN_FORMATS, metavar="FORMAT",
+                        help=f"MULTI FILL only prints the notes it would write, as {' or '.join(PLAN_FORMATS)} (default table)")
+    parser.add_argument("--seed", type=int,
+                        help="MULTI FILL random seed, give a dry run and the real run the same seed to write the notes it planned")
+    parser.add_argument("--pick-dates", action="store_true",
+                        help="pick MULTI FILL dates on a calendar instead of using a schedule")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    Logger.setup(args.log_json)
+    
+    # profiling is off unless asked for, spans are no-ops while disabled
+    profiler = None
+    if args.profile:
+        Profiler.enable(record_events=bool(args.profile_trace))
+        Profiler.reset()
+        if args.profile_stats:
+            profiler = cProfile.Profile()
+    
     ask_for_debug()
     
     # first thing to do is to prompt the user whether they want to proceed w/
     # single, multi, or full fill for SOAP generation
-    try:
-        match select_function_prompt():
-            case Operations.SINGLE_FILL.value:
-                do_single_fill()
+    operation = select_function_prompt()
+    started = time.perf_counter()
+    
+    # every record logged during the run carries the same job ID
+    with job_context():
+        try:
+            load_clinic(args.clinics, args.clinic)
+            if profiler:
+                profiler.enable()
                 
-            case Operations.MULTI_FILL.value:
-                do_multi_fill()
+            match operation:
+                case Operations.SINGLE_FILL.value:
+                    do_single_fill(args.export, not args.no_verify)
+                    
+                case Operations.MULTI_FILL.value:
+                    do_multi_fill(args.schedule, args.closures, args.pick_dates, args.export, not args.no_verify, args.dry_run, args.seed)
+                    
+                case Operations.FULL_FILL.value:
+                    do_full_fill()
+                    
+                case Operations.INDEX_NOTES.value:
+                    do_index_notes()
                 
-            case Operations.FULL_FILL.value:
-                do_full_fill()
+        except ValueError as e:
+            count("failures")
+            log.error("%s. Please try again.\n", e)
             
-    except ValueError as e:
-        print(f"{ERROR_MSG_PREFIX}{e}. Please try again.\n")
+        finally:
+            Logger.log_counters(started)
+            if args.profile:
+                print_profile(args, profiler)
+            
+
+def print_profile(args: argparse.Namespace, profiler: cProfile.Profile | None) -> None:
+    print(f"\n{INFO_MSG_PREFIX}Timing tree:")
+    print(Profiler.get_report())
+    
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile_stats)
+        print(f"{INFO_MSG_PREFIX}cProfile stats saved to <{args.profile_stats}>")
+        
+    if args.profile_trace:
+        Profiler.write_chrome_trace(args.profile_trace)
+        print(f"{INFO_MSG_PREFIX}Chrome trace saved to <{args.profile_trace}>")
     
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # parse workers in the bundled .exe
     main()
\ No newline at end of file
@@ -0,0 +1,4 @@
+import os, sys
+
+# modules in src/ import each other by name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
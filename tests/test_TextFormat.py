@@ -0,0 +1,34 @@
+import pytest
+
+from TextFormat import format_list
+
+def test_empty_list_raises():
+    with pytest.raises(ValueError):
+        format_list([])
+    with pytest.raises(ValueError):
+        format_list(None)
+
+
+@pytest.mark.parametrize("items, expected", [
+    (["neck"], "neck"),
+    (["neck", "upper back"], "neck and upper back"),
+    (["neck", "upper back", "lower back"], "neck, upper back and lower back"),
+    (["a", "b", "c", "d"], "a, b, c and d"),
+])
+def test_format_list(items, expected):
+    assert format_list(items) == expected
+    assert format_list(items, has_period=True) == f"{expected}."
+
+
+@pytest.mark.parametrize("items, expected", [
+    (["neck"], "neck"),
+    (["neck", "upper back"], "neck or upper back"),
+    (["neck", "upper back", "lower back"], "neck, upper back or lower back"),
+])
+def test_conjunction(items, expected):
+    assert format_list(items, conjunction="or") == expected
+    assert format_list(items, has_period=True, conjunction="or") == f"{expected}."
+
+
+def test_items_are_strings():
+    assert format_list([3, 4, 5], has_period=True) == "3, 4 and 5."